@@ -0,0 +1,156 @@
+# your_trading_dashboard/backtest.py
+
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from timeframes import interval_seconds
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Typical binary option payout on a winning trade, as a fraction of the stake.
+DEFAULT_PAYOUT = 0.8
+
+SignalRule = Callable[[pd.DataFrame], np.ndarray]
+
+
+def rsi_reversal_signals(indicators: pd.DataFrame, lower: float = 30.0, upper: float = 70.0,
+                         trend_filter: bool = False) -> np.ndarray:
+    """
+    +1 (call) when RSI is below `lower`, -1 (put) when above `upper`, 0 otherwise.
+    With trend_filter, calls are only taken while EMA_20 > EMA_50 and puts while EMA_20 < EMA_50.
+    """
+    rsi = indicators['RSI'].to_numpy()
+    signals = np.where(rsi < lower, 1, np.where(rsi > upper, -1, 0)).astype(np.int8)
+    if trend_filter:
+        uptrend = indicators['EMA_20'].to_numpy() > indicators['EMA_50'].to_numpy()
+        signals[(signals == 1) & ~uptrend] = 0
+        signals[(signals == -1) & uptrend] = 0
+    return signals
+
+
+@dataclass
+class BacktestResult:
+    expiry: str
+    payout: float
+    trades: int
+    wins: int
+    losses: int
+    ties: int
+    win_rate: float
+    breakeven_win_rate: float
+    expectancy: float
+    total_return: float
+    max_drawdown: float
+    pnl: np.ndarray = field(repr=False)
+    equity: np.ndarray = field(repr=False)
+    entry_times: np.ndarray = field(repr=False)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'expiry': self.expiry,
+            'payout': self.payout,
+            'trades': self.trades,
+            'wins': self.wins,
+            'losses': self.losses,
+            'ties': self.ties,
+            'win_rate': self.win_rate,
+            'breakeven_win_rate': self.breakeven_win_rate,
+            'expectancy': self.expectancy,
+            'total_return': self.total_return,
+            'max_drawdown': self.max_drawdown,
+        }
+
+
+def resolve_outcomes(timestamps: np.ndarray, closes: np.ndarray, signals: np.ndarray,
+                     expiry_seconds: int) -> tuple:
+    """
+    Resolves fixed-expiry trades entered at each signalling bar's close.
+
+    A trade entered on the bar starting at t expires at the close of the bar starting at
+    t + expiry_seconds; trades whose expiry bar is missing (gaps, end of data) are skipped.
+    Returns (entry indices, outcome) with outcome +1 win, -1 loss, 0 tie (stake refunded).
+    """
+    entries = np.flatnonzero(signals)
+    if not entries.size:
+        return entries, np.zeros(0, dtype=np.int8)
+
+    targets = timestamps[entries] + expiry_seconds
+    exits = np.searchsorted(timestamps, targets)
+    in_range = exits < timestamps.size
+    entries, exits, targets = entries[in_range], exits[in_range], targets[in_range]
+    matched = timestamps[exits] == targets
+    entries, exits = entries[matched], exits[matched]
+
+    moves = np.sign(closes[exits] - closes[entries])
+    outcomes = (moves * signals[entries]).astype(np.int8)
+    return entries, outcomes
+
+
+def score_outcomes(outcomes: np.ndarray, payout: float = DEFAULT_PAYOUT) -> Dict[str, float]:
+    """
+    Win/loss statistics and payout-adjusted P&L for an array of +1/-1/0 trade outcomes (1 unit stake each).
+    """
+    pnl = np.where(outcomes > 0, payout, np.where(outcomes < 0, -1.0, 0.0))
+    equity = np.cumsum(pnl)
+    peaks = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+    trades = int(outcomes.size)
+    wins = int(np.count_nonzero(outcomes > 0))
+    losses = int(np.count_nonzero(outcomes < 0))
+    decided = wins + losses
+    return {
+        'trades': trades,
+        'wins': wins,
+        'losses': losses,
+        'ties': trades - decided,
+        'win_rate': wins / decided if decided else 0.0,
+        'breakeven_win_rate': 1.0 / (1.0 + payout),
+        'expectancy': float(pnl.mean()) if trades else 0.0,
+        'total_return': float(equity[-1]) if trades else 0.0,
+        'max_drawdown': float((peaks - equity).max()) if trades else 0.0,
+        'pnl': pnl,
+        'equity': equity,
+    }
+
+
+def run_backtest(bars: pd.DataFrame, indicators: pd.DataFrame, expiry: str = '2min', interval: str = '1min',
+                 payout: float = DEFAULT_PAYOUT, rule: Optional[SignalRule] = None) -> BacktestResult:
+    """
+    Backtests an entry rule against fixed-expiry binary option outcomes, fully vectorized.
+
+    `bars` is the OHLCV frame indexed by timestamp (MarketStream.get_ohlcv_dataframe) and
+    `indicators` the output of calculate_technical_indicators for it. `rule` maps the indicator
+    frame (aligned to `bars`) to an array of +1/-1/0 signals; defaults to rsi_reversal_signals.
+    Trades may overlap: every signalling bar opens its own trade.
+    """
+    expiry_seconds = interval_seconds(expiry)
+    if expiry_seconds % interval_seconds(interval):
+        raise ValueError(f"Expiry {expiry} is not a whole number of {interval} bars")
+
+    rule = rule or rsi_reversal_signals
+    aligned = indicators.reindex(bars.index)
+    signals = np.nan_to_num(np.asarray(rule(aligned), dtype=np.float64)).astype(np.int8)
+
+    timestamps = bars.index.to_numpy(dtype='datetime64[s]').astype(np.int64)
+    closes = bars['close'].to_numpy(dtype=np.float64)
+    entries, outcomes = resolve_outcomes(timestamps, closes, signals, expiry_seconds)
+
+    return BacktestResult(
+        expiry=expiry,
+        payout=payout,
+        entry_times=bars.index[entries].to_numpy(),
+        **score_outcomes(outcomes, payout),
+    )
+
+
+def backtest_expiries(bars: pd.DataFrame, indicators: pd.DataFrame, expiries: Iterable[str] = ('2min', '5min'),
+                      interval: str = '1min', payout: float = DEFAULT_PAYOUT,
+                      rule: Optional[SignalRule] = None) -> pd.DataFrame:
+    """
+    Runs run_backtest for each expiry and returns one summary row per expiry.
+    """
+    rows = [run_backtest(bars, indicators, expiry, interval, payout, rule).summary() for expiry in expiries]
+    return pd.DataFrame(rows).set_index('expiry')
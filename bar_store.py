@@ -0,0 +1,176 @@
+# your_trading_dashboard/bar_store.py
+
+import bisect
+import logging
+import os
+import re
+from typing import Optional, Tuple
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# One fixed 48-byte little-endian record per bar.
+BAR_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+
+
+def store_path(directory: str, symbol: str, interval: str) -> str:
+    safe_symbol = re.sub(r'[^A-Za-z0-9]+', '_', symbol)
+    return os.path.join(directory, f"{safe_symbol}-{interval}.bars")
+
+
+class BarStore:
+    """
+    On-disk bar history for one (symbol, interval), read back through numpy.memmap.
+    New bars are appended; corrected or late bars are written in place by upsert(), so the
+    file stays sorted by timestamp by construction.
+
+    A read_only store follows a file owned by another process (the ingest process in the
+    multi-worker deployment): writes are skipped, and reads pick up whatever it has written since.
+    """
+    def __init__(self, directory: str, symbol: str, interval: str, read_only: bool = False):
+        os.makedirs(directory, exist_ok=True)
+        self.path = store_path(directory, symbol, interval)
+        self.read_only = read_only
+        self._file = None
+        if not read_only:
+            self._truncate_partial_record()
+            self._file = open(self.path, 'ab')
+        self._count = 0
+        self.last_timestamp: Optional[int] = None
+        self._refresh()
+
+    def _refresh(self):
+        """
+        Picks up the file's current length (complete records only) and last timestamp. Only appends
+        and inserts change the length, and a replaced record keeps its timestamp, so the last
+        timestamp is re-read only when the length changes.
+        """
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        count = size // BAR_DTYPE.itemsize
+        if count != self._count:
+            self._count = count
+            self.last_timestamp = None
+            if count:
+                records = np.memmap(self.path, dtype=BAR_DTYPE, mode='r', shape=(count,))
+                self.last_timestamp = int(records['timestamp'][-1])
+
+    def _truncate_partial_record(self):
+        """
+        Drops a half-written trailing record left behind by a crash.
+        """
+        if not os.path.exists(self.path):
+            return
+        size = os.path.getsize(self.path)
+        excess = size % BAR_DTYPE.itemsize
+        if excess:
+            logging.warning(f"Truncating {excess} trailing bytes from partial record in {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(size - excess)
+
+    def __len__(self) -> int:
+        if self.read_only:
+            self._refresh()
+        return self._count
+
+    def append(self, timestamp: int, open_: float, high: float, low: float, close: float, volume: float = 0.0) -> bool:
+        """
+        Appends one bar. Bars at or before the last stored timestamp are ignored.
+        """
+        if self.read_only:
+            return False
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return False
+        record = np.array([(timestamp, open_, high, low, close, volume)], dtype=BAR_DTYPE)
+        self._file.write(record.tobytes())
+        self._file.flush()
+        self._count += 1
+        self.last_timestamp = int(timestamp)
+        return True
+
+    def upsert(self, timestamp: int, open_: float, high: float, low: float, close: float, volume: float = 0.0) -> str:
+        """
+        Writes one bar by timestamp: appended if it is the newest ('append'), overwritten in place if a
+        bar with that timestamp exists ('replace'), otherwise inserted in order ('insert', which
+        rewrites the records after it - late bars are rare and close to the end).
+        Returns 'skipped' on a read-only store.
+        """
+        if self.read_only:
+            return 'skipped'
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.append(timestamp, open_, high, low, close, volume)
+            return 'append'
+
+        lo, hi = self.index_range(timestamp, timestamp)
+        record = np.array([(timestamp, open_, high, low, close, volume)], dtype=BAR_DTYPE).tobytes()
+        with open(self.path, 'r+b') as f:
+            f.seek(lo * BAR_DTYPE.itemsize)
+            if hi > lo:
+                f.write(record)
+                return 'replace'
+            tail = f.read()
+            f.seek(lo * BAR_DTYPE.itemsize)
+            f.write(record + tail)
+        self._count += 1
+        return 'insert'
+
+    def extend(self, timestamps: np.ndarray, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+               closes: np.ndarray, volumes: np.ndarray) -> int:
+        """
+        Appends many oldest-first bars in one write, skipping any not newer than the last stored bar.
+        Returns the number of bars written.
+        """
+        if self.read_only:
+            return 0
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        columns = [np.asarray(col, dtype=np.float64) for col in (opens, highs, lows, closes, volumes)]
+        if self.last_timestamp is not None:
+            newer = timestamps > self.last_timestamp
+            timestamps = timestamps[newer]
+            columns = [col[newer] for col in columns]
+        if not timestamps.size:
+            return 0
+
+        records = np.empty(timestamps.size, dtype=BAR_DTYPE)
+        records['timestamp'] = timestamps
+        for name, col in zip(BAR_DTYPE.names[1:], columns):
+            records[name] = col
+        self._file.write(records.tobytes())
+        self._file.flush()
+        self._count += records.size
+        self.last_timestamp = int(records['timestamp'][-1])
+        return records.size
+
+    def read(self) -> np.ndarray:
+        """
+        Memory-maps every stored bar as a read-only structured array (no copy into RAM).
+        """
+        if self.read_only:
+            self._refresh()
+        if not self._count:
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.memmap(self.path, dtype=BAR_DTYPE, mode='r', shape=(self._count,))
+
+    def tail(self, count: int) -> np.ndarray:
+        return self.read()[-count:]
+
+    def index_range(self, start: Optional[int] = None, end: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Record indices [lo, hi) of the bars with start <= timestamp <= end, by binary search.
+        Bisects the memory-mapped timestamp field directly, so only ~log2(n) records are touched.
+        """
+        timestamps = self.read()['timestamp']
+        lo = bisect.bisect_left(timestamps, start) if start is not None else 0
+        hi = bisect.bisect_right(timestamps, end, lo) if end is not None else self._count
+        return lo, hi
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
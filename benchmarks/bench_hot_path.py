@@ -0,0 +1,212 @@
+# your_trading_dashboard/benchmarks/bench_hot_path.py
+#
+# Benchmarks the ingest -> indicators -> broadcast hot path across history sizes and client counts
+# and writes machine-readable results for tracking regressions between releases.
+#
+#   python benchmarks/bench_hot_path.py --output bench_output.json
+#   python benchmarks/bench_hot_path.py --quick
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from broadcaster import Broadcaster  # noqa: E402
+from feeds import ReplayFeed  # noqa: E402
+from indicators import calculate_technical_indicators  # noqa: E402
+from market_data import MarketDataStreamer  # noqa: E402
+from protocol import build_update  # noqa: E402
+
+HISTORY_SIZES = [300, 1_000, 10_000, 100_000, 1_000_000]
+CLIENT_COUNTS = [1, 10, 100, 1_000, 10_000]
+QUICK_HISTORY_SIZES = [300, 10_000]
+QUICK_CLIENT_COUNTS = [1, 100]
+
+SYMBOL = 'EUR/GBP'
+INTERVAL = '1min'
+START_TIMESTAMP = 1_700_000_000
+
+
+def time_per_call(fn: Callable[[], object], min_seconds: float = 0.2, max_calls: int = 100_000) -> float:
+    """
+    Calls fn repeatedly for at least min_seconds and returns the best-of-batches seconds per call.
+    """
+    fn()  # warm-up
+    calls, elapsed = 1, 0.0
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds or calls >= max_calls:
+            return elapsed / calls
+        calls = min(max_calls, calls * 2 if elapsed <= 0 else max(calls * 2, int(calls * min_seconds / elapsed)))
+
+
+def make_streamer(history_size: int) -> MarketDataStreamer:
+    """
+    A streamer with one stream whose buffer holds `history_size` random-walk bars.
+    """
+    streamer = MarketDataStreamer([SYMBOL], [INTERVAL], 'benchmark', history_size, feed=ReplayFeed(os.devnull, 0))
+    stream = streamer.get_stream(SYMBOL, INTERVAL)
+    rng = np.random.default_rng(7)
+    closes = 0.85 + np.cumsum(rng.normal(0, 1e-4, history_size))
+    highs = closes + np.abs(rng.normal(0, 5e-5, history_size))
+    lows = closes - np.abs(rng.normal(0, 5e-5, history_size))
+    timestamps = START_TIMESTAMP + 60 * np.arange(history_size, dtype=np.int64)
+    stream.ohlcv_history.extend(timestamps, closes, highs, lows, closes, np.zeros(history_size))
+
+    # Indicator state does not depend on history depth; warm it on the newest bars only.
+    for high, low, close in zip(highs[-1_000:].tolist(), lows[-1_000:].tolist(), closes[-1_000:].tolist()):
+        stream.latest_indicators = stream.indicator_engine.update({'high': high, 'low': low, 'close': close})
+    return streamer
+
+
+def record(results: List[Dict], benchmark: str, seconds: float, **params):
+    results.append({
+        'benchmark': benchmark,
+        'params': params,
+        'seconds_per_op': seconds,
+        'ops_per_second': 1.0 / seconds if seconds else None,
+    })
+    print(f"{benchmark:<32}{json.dumps(params):<24}{seconds * 1e6:>14.2f} us/op", file=sys.stderr)
+
+
+def bench_history(results: List[Dict], sizes: List[int]):
+    for size in sizes:
+        streamer = make_streamer(size)
+        stream = streamer.get_stream(SYMBOL, INTERVAL)
+        record(results, 'get_ohlcv_dataframe', time_per_call(stream.get_ohlcv_dataframe), bars=size)
+
+        df = stream.get_ohlcv_dataframe()
+        record(results, 'calculate_technical_indicators',
+               time_per_call(lambda: calculate_technical_indicators(df.copy()), max_calls=1_000), bars=size)
+
+        # Events are replayed through the real async handler, one new bar/tick per call.
+        loop = asyncio.new_event_loop()
+        next_bar = [int(stream.ohlcv_history.last_timestamp)]
+
+        def ohlc_event():
+            next_bar[0] += 60
+            loop.run_until_complete(streamer._on_event({
+                'event': 'ohlc', 'symbol': SYMBOL, 'timestamp': next_bar[0],
+                'open': 0.85, 'high': 0.8502, 'low': 0.8498, 'close': 0.8501,
+            }))
+
+        def price_event():
+            loop.run_until_complete(streamer._on_event({
+                'event': 'price', 'symbol': SYMBOL, 'price': 0.8501, 'timestamp': next_bar[0],
+            }))
+
+        record(results, 'on_event_ohlc', time_per_call(ohlc_event), bars=size)
+        record(results, 'on_event_price', time_per_call(price_event), bars=size)
+        loop.close()
+
+
+class MockWebSocket:
+    """
+    Accepts frames instantly (yielding once, like a socket with buffer space).
+    """
+    def __init__(self):
+        self.frames = 0
+
+    async def send_text(self, frame: str):
+        self.frames += 1
+        await asyncio.sleep(0)
+
+    async def send_bytes(self, frame: bytes):
+        self.frames += 1
+        await asyncio.sleep(0)
+
+    async def close(self):
+        pass
+
+
+async def _broadcast_round(broadcaster: Broadcaster, clients: List[MockWebSocket], payload: Dict, rounds: int):
+    publish_seconds = 0.0
+    drain_seconds = 0.0
+    for _ in range(rounds):
+        expected = [ws.frames + 1 for ws in clients]
+        started = time.perf_counter()
+        broadcaster.publish((SYMBOL, INTERVAL), payload)
+        publish_seconds += time.perf_counter() - started
+        while any(ws.frames < n for ws, n in zip(clients, expected)):
+            await asyncio.sleep(0)
+        drain_seconds += time.perf_counter() - started
+    return publish_seconds / rounds, drain_seconds / rounds
+
+
+def bench_broadcast(results: List[Dict], client_counts: List[int]):
+    stream = make_streamer(300).get_stream(SYMBOL, INTERVAL)
+    payload = build_update(stream, 1)
+
+    async def run(count: int):
+        broadcaster = Broadcaster(max_queue=64, overflow_policy='drop_oldest')
+        clients = [MockWebSocket() for _ in range(count)]
+        for ws in clients:
+            broadcaster.register(ws, (SYMBOL, INTERVAL))
+        await asyncio.sleep(0)
+        rounds = max(3, min(200, 20_000 // count))
+        publish, drain = await _broadcast_round(broadcaster, clients, payload, rounds)
+        broadcaster.close_all()
+        await asyncio.sleep(0)
+        return publish, drain
+
+    for count in client_counts:
+        publish, drain = asyncio.run(run(count))
+        record(results, 'broadcast_publish', publish, clients=count)
+        record(results, 'broadcast_delivered_all', drain, clients=count)
+
+
+def environment() -> Dict:
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                  cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        revision = None
+    return {
+        'git_revision': revision or None,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the ingest -> indicators -> broadcast hot path.')
+    parser.add_argument('--quick', action='store_true', help='small sizes only, for CI smoke runs')
+    parser.add_argument('--sizes', type=int, nargs='+', help='history sizes in bars')
+    parser.add_argument('--clients', type=int, nargs='+', help='mock WebSocket client counts')
+    parser.add_argument('--output', help='write JSON results here (default: stdout)')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    sizes = args.sizes or (QUICK_HISTORY_SIZES if args.quick else HISTORY_SIZES)
+    clients = args.clients or (QUICK_CLIENT_COUNTS if args.quick else CLIENT_COUNTS)
+
+    results: List[Dict] = []
+    bench_history(results, sizes)
+    bench_broadcast(results, clients)
+
+    report = json.dumps({'environment': environment(), 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
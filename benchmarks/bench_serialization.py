@@ -0,0 +1,93 @@
+# your_trading_dashboard/benchmarks/bench_serialization.py
+#
+# Compares serialize time and payload size of the /ws and /latest_data encodings against the
+# original json.dumps(global_latest_data, default=str) path.
+#
+#   python benchmarks/bench_serialization.py [--bars 300] [--repeat 2000]
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_data import MarketStream  # noqa: E402
+from protocol import build_snapshot, build_update  # noqa: E402
+from serialization import available_encodings, encode  # noqa: E402
+
+
+def make_stream(bars: int) -> MarketStream:
+    """
+    A real stream (no bar store), so every field the protocol builders read is present.
+    """
+    rng = np.random.default_rng(42)
+    closes = 0.85 + np.cumsum(rng.normal(0, 1e-4, bars))
+    highs = closes + np.abs(rng.normal(0, 5e-5, bars))
+    lows = closes - np.abs(rng.normal(0, 5e-5, bars))
+    timestamps = 1_700_000_000 + 60 * np.arange(bars, dtype=np.int64)
+
+    stream = MarketStream('EUR/GBP', '1min', bars)
+    for timestamp, high, low, close in zip(timestamps.tolist(), highs.tolist(), lows.tolist(), closes.tolist()):
+        stream.upsert_bar({'timestamp': timestamp, 'open': close, 'high': high, 'low': low, 'close': close, 'volume': 0.0})
+    stream.current_price = {'symbol': 'EUR/GBP', 'price': float(closes[-1]), 'timestamp': int(timestamps[-1])}
+    return stream
+
+
+def legacy_payload(stream) -> dict:
+    """
+    The pre-protocol broadcast: 50 bars plus a pandas row converted to numpy scalars.
+    """
+    bars = stream.ohlcv_history.tail(50)
+    indicators = {k: np.float64(v) for k, v in bars[-1].items() if k != 'timestamp'}
+    indicators.update({k: np.float64(v) for k, v in stream.latest_indicators.items()})
+    return {
+        'latest_price': stream.current_price,
+        'indicators': indicators,
+        'ohlcv': bars,
+        'timestamp': bars[-1]['timestamp'],
+    }
+
+
+def measure(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=repeat, repeat=3)) / repeat
+
+
+def run(bars: int, repeat: int):
+    stream = make_stream(bars)
+    cases = {'legacy json (default=str)': (legacy_payload(stream), None)}
+    for encoding in available_encodings():
+        cases[f'snapshot {encoding}'] = (build_snapshot(stream, 1), encoding)
+        cases[f'update {encoding}'] = (build_update(stream, 2), encoding)
+
+    results = []
+    for name, (payload, encoding) in cases.items():
+        if encoding is None:
+            fn = lambda: json.dumps(payload, default=str)  # noqa: E731
+        else:
+            fn = lambda: encode(payload, encoding)  # noqa: E731
+        body = fn()
+        size = len(body.encode() if isinstance(body, str) else body)
+        results.append({'case': name, 'seconds': measure(fn, repeat), 'bytes': size})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serialize time and payload size per encoding.')
+    parser.add_argument('--bars', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    results = run(args.bars, args.repeat)
+    baseline = results[0]
+    print(f"{'case':<28}{'us/op':>10}{'bytes':>10}{'speedup':>10}{'size':>8}")
+    for r in results:
+        print(f"{r['case']:<28}{r['seconds'] * 1e6:>10.1f}{r['bytes']:>10}"
+              f"{baseline['seconds'] / r['seconds']:>9.1f}x{r['bytes'] / baseline['bytes']:>7.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+# your_trading_dashboard/broadcaster.py
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Optional, Set, Tuple, Union
+
+from fastapi import WebSocket
+
+from metrics import CLIENT_SEND_TIME, FRAMES_DROPPED, TICK_TO_CLIENT_TIME
+from serialization import DEFAULT_ENCODING, encode
+
+Frame = Union[str, bytes]
+
+# Indicator names a client asked for on a topic; None means all of them.
+IndicatorFilter = Optional[FrozenSet[str]]
+
+OVERFLOW_POLICIES = ('drop_oldest', 'conflate', 'disconnect')
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def _select(values: Dict[str, Any], indicators: FrozenSet[str]) -> Dict[str, Any]:
+    return {name: value for name, value in values.items() if name in indicators}
+
+
+def trim_payload(payload: Dict[str, Any], indicators: IndicatorFilter) -> Dict[str, Any]:
+    """
+    Returns the payload with its 'indicators', and those of a snapshot's nested 'analytics' result,
+    reduced to the requested names (shallow copy; None keeps everything).
+    """
+    if indicators is None:
+        return payload
+    trimmed = dict(payload)
+    if 'indicators' in payload:
+        trimmed['indicators'] = _select(payload['indicators'], indicators)
+    analytics = payload.get('analytics')
+    if analytics and 'indicators' in analytics:
+        trimmed['analytics'] = dict(analytics, indicators=_select(analytics['indicators'], indicators))
+    return trimmed
+
+
+class ClientSession:
+    """
+    One connected WebSocket client with its own bounded send queue and writer task.
+    A slow client only ever backs up its own queue. `subscriptions` maps each topic the
+    client follows to the indicator subset it wants there. Topic snapshots are queued pinned:
+    the overflow policy never drops them and they do not count against `max_queue`.
+    """
+    def __init__(self, websocket: WebSocket, max_queue: int, overflow_policy: str,
+                 encoding: str = DEFAULT_ENCODING, on_close: Optional[Callable[['ClientSession'], None]] = None):
+        self.websocket = websocket
+        self.subscriptions: Dict[Hashable, IndicatorFilter] = {}
+        self.encoding = encoding
+        self.max_queue = max_queue
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self.closed = False
+        # (frame, topic, received_at) entries: topic is set only for pinned snapshot frames, received_at
+        # (perf_counter) only for frames caused by a feed event.
+        self._queue = deque()
+        self._pinned = 0
+        self._ready = asyncio.Event()
+        self._on_close = on_close
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def start(self):
+        self._task = asyncio.create_task(self._writer())
+
+    def send(self, payload: Dict[str, Any]):
+        """
+        Encodes a payload for this client only and queues it.
+        """
+        return self.enqueue(encode(payload, self.encoding))
+
+    def send_snapshot(self, topic: Hashable, payload: Dict[str, Any]) -> bool:
+        """
+        Queues a topic's full state for this client outside the overflow policy, so subscribing to
+        more topics than `max_queue` still delivers every snapshot. A snapshot for the same topic
+        that is still waiting is superseded, which keeps pinned frames bounded by the topic count.
+        """
+        if self.closed:
+            return False
+        for i, (_, pinned_topic, _) in enumerate(self._queue):
+            if pinned_topic is not None and pinned_topic == topic:
+                del self._queue[i]
+                self._pinned -= 1
+                break
+        self._queue.append((encode(payload, self.encoding), topic, None))
+        self._pinned += 1
+        self._ready.set()
+        return True
+
+    def _drop_oldest(self):
+        for i, (_, topic, _) in enumerate(self._queue):
+            if topic is None:
+                del self._queue[i]
+                return
+
+    def enqueue(self, frame: Frame, received_at: Optional[float] = None) -> bool:
+        """
+        Queues an already-serialized frame without waiting. Returns False if the client was dropped.
+        `received_at` is the perf_counter() time its feed event arrived, for TICK_TO_CLIENT_TIME.
+        """
+        if self.closed:
+            return False
+        queued = len(self._queue) - self._pinned
+        if queued >= self.max_queue:
+            if self.overflow_policy == 'drop_oldest':
+                self._drop_oldest()
+                self.dropped += 1
+                FRAMES_DROPPED.inc()
+            elif self.overflow_policy == 'conflate':
+                self.dropped += queued
+                FRAMES_DROPPED.inc(amount=queued)
+                self._queue = deque(item for item in self._queue if item[1] is not None)
+            else:
+                logging.warning(f"Disconnecting slow client: send queue full ({self.max_queue} frames).")
+                self.close()
+                return False
+        self._queue.append((frame, None, received_at))
+        self._ready.set()
+        return True
+
+    async def _writer(self):
+        websocket = self.websocket
+        try:
+            while not self.closed:
+                await self._ready.wait()
+                while self._queue:
+                    frame, topic, received_at = self._queue.popleft()
+                    if topic is not None:
+                        self._pinned -= 1
+                    started = time.perf_counter()
+                    if isinstance(frame, bytes):
+                        await websocket.send_bytes(frame)
+                    else:
+                        await websocket.send_text(frame)
+                    sent = time.perf_counter()
+                    CLIENT_SEND_TIME.observe(sent - started)
+                    if received_at is not None:
+                        TICK_TO_CLIENT_TIME.observe(sent - received_at)
+                self._ready.clear()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logging.info(f"Client send failed, dropping connection: {e}")
+        finally:
+            self._finish()
+
+    def _finish(self):
+        if self._on_close:
+            on_close, self._on_close = self._on_close, None
+            on_close(self)
+        self.closed = True
+        self._queue.clear()
+        self._pinned = 0
+
+    def close(self):
+        """
+        Stops the writer and closes the socket in the background.
+        """
+        if self.closed:
+            return
+        self._finish()
+        if self._task and not self._task.done():
+            self._task.cancel()
+        asyncio.ensure_future(self._close_socket())
+
+    async def _close_socket(self):
+        try:
+            await self.websocket.close()
+        except Exception:
+            pass
+
+
+class Broadcaster:
+    """
+    Fans out payloads to the clients subscribed to a topic, e.g. a (symbol, interval) stream.
+    Each topic keeps its own subscriber map, so publishing costs O(subscribers of that topic).
+    A payload is trimmed and serialized once per (indicator subset, encoding) in use, and publish()
+    only appends the shared frame to per-client queues, so it never waits on the network.
+    """
+    def __init__(self, max_queue: int = 64, overflow_policy: str = 'drop_oldest'):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}, got {overflow_policy!r}")
+        self.max_queue = max_queue
+        self.overflow_policy = overflow_policy
+        self.clients: Set[ClientSession] = set()
+        self.topics: Dict[Hashable, Dict[ClientSession, IndicatorFilter]] = {}
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def register(self, websocket: WebSocket, topic: Optional[Hashable] = None, encoding: str = DEFAULT_ENCODING,
+                 initial_payload: Optional[Dict[str, Any]] = None,
+                 indicators: Optional[Iterable[str]] = None) -> ClientSession:
+        """
+        Starts a session for a connected client, optionally subscribed to a first topic.
+        """
+        session = ClientSession(websocket, self.max_queue, self.overflow_policy, encoding, on_close=self._discard)
+        self.clients.add(session)
+        if topic is not None:
+            self.subscribe(session, topic, indicators, initial_payload)
+        session.start()
+        return session
+
+    def unregister(self, session: ClientSession):
+        session.close()
+
+    def subscribe(self, session: ClientSession, topic: Hashable, indicators: Optional[Iterable[str]] = None,
+                  initial_payload: Optional[Dict[str, Any]] = None):
+        """
+        Adds (or updates the indicator subset of) a session's subscription and queues the
+        topic's current state for it, trimmed to that subset, as a pinned snapshot.
+        """
+        if session.closed:
+            return
+        indicator_filter = frozenset(indicators) if indicators is not None else None
+        session.subscriptions[topic] = indicator_filter
+        self.topics.setdefault(topic, {})[session] = indicator_filter
+        if initial_payload:
+            session.send_snapshot(topic, trim_payload(initial_payload, indicator_filter))
+
+    def unsubscribe(self, session: ClientSession, topic: Hashable) -> bool:
+        if topic not in session.subscriptions:
+            return False
+        del session.subscriptions[topic]
+        self._remove_subscriber(topic, session)
+        return True
+
+    def _remove_subscriber(self, topic: Hashable, session: ClientSession):
+        subscribers = self.topics.get(topic)
+        if subscribers is not None:
+            subscribers.pop(session, None)
+            if not subscribers:
+                del self.topics[topic]
+
+    def _discard(self, session: ClientSession):
+        self.clients.discard(session)
+        for topic in session.subscriptions:
+            self._remove_subscriber(topic, session)
+        session.subscriptions.clear()
+
+    def publish(self, topic: Hashable, payload: Dict[str, Any], received_at: Optional[float] = None) -> int:
+        """
+        Queues a payload for every client subscribed to `topic` and returns how many accepted it.
+        `received_at` stamps the frames with when the feed event behind the payload arrived.
+        """
+        subscribers = self.topics.get(topic)
+        if not subscribers:
+            return 0
+        frames: Dict[Tuple[IndicatorFilter, str], Frame] = {}
+        delivered = 0
+        for session, indicator_filter in list(subscribers.items()):
+            key = (indicator_filter, session.encoding)
+            frame = frames.get(key)
+            if frame is None:
+                frame = frames[key] = encode(trim_payload(payload, indicator_filter), session.encoding)
+            if session.enqueue(frame, received_at):
+                delivered += 1
+        return delivered
+
+    def queue_depths(self) -> Dict[Hashable, int]:
+        """
+        Total frames waiting in the send queues of each topic's subscribers.
+        """
+        return {topic: sum(s.queue_depth for s in sessions) for topic, sessions in self.topics.items()}
+
+    def close_all(self):
+        for session in list(self.clients):
+            session.close()
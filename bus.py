@@ -0,0 +1,162 @@
+# your_trading_dashboard/bus.py
+
+import asyncio
+import json
+import logging
+import os
+import struct
+from typing import Dict, Optional, Set
+
+from feeds import EventHandler, FeedSource
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Frame header: body length as a 4-byte big-endian unsigned int; the body is one JSON event.
+_HEADER = struct.Struct('>I')
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+# A subscriber with this much unsent data is disconnected; it resyncs from the bar store on reconnect.
+SUBSCRIBER_MAX_BUFFER = 8 * 1024 * 1024
+
+# Seconds between reconnection attempts of a BusFeed (doubling up to the maximum).
+RECONNECT_DELAY = 0.5
+RECONNECT_DELAY_MAX = 10.0
+
+
+def encode_frame(event: Dict) -> bytes:
+    body = json.dumps(event, separators=(',', ':'), default=str).encode()
+    return _HEADER.pack(len(body)) + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Dict:
+    """
+    Reads one frame. Raises asyncio.IncompleteReadError when the connection closes.
+    """
+    size, = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"Bus frame of {size} bytes exceeds {MAX_FRAME_BYTES}")
+    return json.loads(await reader.readexactly(size))
+
+
+class EventBus:
+    """
+    Local Unix-socket bus from the ingest process to the API workers. Every feed event the ingest
+    process has handled (stored and indicator-updated) is re-published as a length-prefixed frame,
+    encoded once for all subscribers, along with 'analytics' events from its compute pool.
+    """
+    def __init__(self, path: str, max_buffer: int = SUBSCRIBER_MAX_BUFFER):
+        self.path = path
+        self.max_buffer = max_buffer
+        self._subscribers: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    async def start(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # left behind by a previous run
+        self._server = await asyncio.start_unix_server(self._handle_subscriber, path=self.path)
+        logging.info(f"Event bus listening on {self.path}")
+
+    async def _handle_subscriber(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # The resync marker is the first frame, sent as the subscriber joins: every event after it is
+        # delivered, and every event before it is already in the bar stores it reloads from.
+        writer.write(encode_frame({'event': 'bus-resync'}))
+        self._subscribers.add(writer)
+        logging.info(f"Bus subscriber connected ({len(self._subscribers)} total).")
+        try:
+            await reader.read()  # subscribers never send; this returns when they disconnect
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._subscribers.discard(writer)
+            writer.close()
+            logging.info(f"Bus subscriber disconnected ({len(self._subscribers)} total).")
+
+    def publish(self, event: Dict):
+        if not self._subscribers:
+            return
+        frame = encode_frame(event)
+        for writer in list(self._subscribers):
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                logging.warning("Disconnecting a bus subscriber that stopped reading.")
+                self._subscribers.discard(writer)
+                writer.close()
+                continue
+            writer.write(frame)
+
+    def wrap(self, on_event: EventHandler) -> EventHandler:
+        """
+        Returns an event handler that handles the event locally first (so the bar store already has a
+        new bar when subscribers hear of it), then publishes it.
+        """
+        async def handler(event: Dict):
+            await on_event(event)
+            self.publish(event)
+        return handler
+
+    async def close(self):
+        for writer in list(self._subscribers):
+            writer.close()
+        self._subscribers.clear()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class BusFeed(FeedSource):
+    """
+    Feed of an API worker: the events published by the ingest process's EventBus. History comes from
+    the bar store the ingest process writes (offline), never from the REST API. The bus starts every
+    connection with {'event': 'bus-resync'}, so after a reconnect the streamer reloads the bars it missed.
+    """
+    offline = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._task: Optional[asyncio.Task] = None
+
+    async def connect(self, on_event: EventHandler) -> bool:
+        logging.info(f"Following the ingest process on {self.path}...")
+        self._task = asyncio.create_task(self._follow(on_event))
+        return True
+
+    async def _follow(self, on_event: EventHandler):
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+            except OSError as e:
+                logging.warning(f"Event bus {self.path} unavailable ({e}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_DELAY_MAX)
+                continue
+
+            delay = RECONNECT_DELAY
+            logging.info(f"Connected to event bus {self.path}.")
+            try:
+                while True:
+                    event = await read_frame(reader)
+                    try:
+                        await on_event(event)
+                    except Exception as e:
+                        logging.error(f"Failed to handle bus event {event.get('event')}: {e}")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                logging.warning("Event bus connection lost; reconnecting.")
+            except ValueError as e:
+                logging.error(f"Bad event bus frame ({e}); reconnecting.")
+            finally:
+                writer.close()
+
+    async def disconnect(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
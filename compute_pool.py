@@ -0,0 +1,187 @@
+# your_trading_dashboard/compute_pool.py
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from history import tail_history
+from indicators import DEFAULT_INDICATORS, calculate_technical_indicators, resolve
+from metrics import COMPUTE_JOB_TIME
+from ring_buffer import OHLCV_COLUMNS
+
+try:
+    from ai_model import generate_predictions
+except ImportError:
+    generate_predictions = None
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+COMPUTE_MODES = ('process', 'thread', 'off')
+
+# Columns of a stream's shared-memory block, in block order (all 8-byte values).
+SHARED_COLUMNS = ('timestamp',) + OHLCV_COLUMNS
+
+# Blocks attached in this (worker) process, by name.
+_attached: Dict[str, Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]] = {}
+
+
+def _views(block: shared_memory.SharedMemory, capacity: int) -> Dict[str, np.ndarray]:
+    return {
+        column: np.ndarray((capacity,), dtype=np.int64 if column == 'timestamp' else np.float64,
+                           buffer=block.buf, offset=i * capacity * 8)
+        for i, column in enumerate(SHARED_COLUMNS)
+    }
+
+
+def _run_job(block_name: str, capacity: int, length: int, indicators: Sequence[str],
+             predict: bool) -> Dict[str, Any]:
+    """
+    Worker task: indicators (and predictions, when a model is installed) over the bars in a stream's block.
+    Returns the newest bar's values of `indicators` and the model output (which must be JSON-serializable).
+    """
+    attached = _attached.get(block_name)
+    if attached is None:
+        block = shared_memory.SharedMemory(name=block_name)
+        attached = _attached[block_name] = (block, _views(block, capacity))
+    columns = attached[1]
+
+    # The DataFrame copies out of the block, which the parent refills for the stream's next job.
+    df = pd.DataFrame({column: columns[column][:length] for column in SHARED_COLUMNS})
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+    df = df.set_index('timestamp')
+
+    # The model sees the default indicator columns plus the configured ones.
+    names = list(DEFAULT_INDICATORS) + [name for name in indicators if name not in DEFAULT_INDICATORS]
+    df_with_indicators = calculate_technical_indicators(df, names)
+    latest = {}
+    if len(df_with_indicators):
+        row = df_with_indicators.iloc[-1]
+        latest = {name: None if math.isnan(row[name]) else float(row[name]) for name in indicators}
+
+    predictions = generate_predictions(df_with_indicators) if predict and generate_predictions is not None else None
+    return {'indicators': latest, 'predictions': predictions}
+
+
+class _StreamSlot:
+    """
+    A stream's shared-memory block and job state: at most one job in flight, plus a flag for bars that arrived meanwhile.
+    """
+    def __init__(self, key: Hashable, capacity: int):
+        self.key = key
+        self.capacity = capacity
+        self.block = shared_memory.SharedMemory(create=True, size=len(SHARED_COLUMNS) * capacity * 8)
+        self.columns = _views(self.block, capacity)
+        self.running = False
+        self.dirty = False
+
+    def close(self):
+        self.columns = {}
+        self.block.close()
+        self.block.unlink()
+
+
+class ComputePool:
+    """
+    Runs per-stream analytics - registry indicators beyond the streaming ones and, when an `ai_model`
+    module with generate_predictions(df) is installed, model predictions - off the event loop.
+
+    In 'process' mode jobs run on a process pool. Each stream owns a shared-memory block holding its
+    newest `window_bars` bars; the loop copies the window in and submits only the block name and length,
+    so no DataFrame is pickled. A stream has at most one job in flight: bars arriving meanwhile are
+    coalesced into a single follow-up job over the latest window. 'thread' runs the same jobs on a
+    thread pool; 'off' disables them.
+    """
+    def __init__(self, mode: str, indicators: Sequence[str], window_bars: int, workers: Optional[int] = None,
+                 on_result: Optional[Callable[[Any, Dict[str, Any]], None]] = None):
+        if mode not in COMPUTE_MODES:
+            raise ValueError(f"COMPUTE_MODE must be one of {', '.join(COMPUTE_MODES)}")
+        for name in indicators:
+            resolve(name)  # fail at startup on a typo
+        self.mode = mode
+        self.indicators: List[str] = list(indicators)
+        self.predict = generate_predictions is not None
+        self.window_bars = window_bars
+        self.workers = workers or os.cpu_count() or 1
+        self.on_result = on_result
+        self._executor: Optional[Executor] = None
+        self._slots: Dict[Hashable, _StreamSlot] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off' and bool(self.indicators or self.predict)
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.mode == 'process':
+                # spawn, not fork: the server process runs the event loop and the feed's threads.
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='compute')
+            logging.info(f"Started {self.mode} compute pool with {self.workers} workers "
+                         f"(indicators: {', '.join(self.indicators) or 'none'}, predictions: {self.predict})")
+        return self._executor
+
+    def submit(self, stream):
+        """
+        Schedules a job over the stream's newest bars; a no-op while one is running (the result of the
+        next job will cover the new bars). Must be called from the event loop.
+        """
+        if not self.enabled:
+            return
+        slot = self._slots.get(stream.key)
+        if slot is None:
+            slot = self._slots[stream.key] = _StreamSlot(stream.key, self.window_bars)
+        if slot.running:
+            slot.dirty = True
+            return
+        slot.running = True
+        slot.dirty = False
+        asyncio.get_running_loop().create_task(self._run(stream, slot))
+
+    async def _run(self, stream, slot: _StreamSlot):
+        started = asyncio.get_running_loop().time()
+        try:
+            page = tail_history(stream, slot.capacity)
+            length = len(page)
+            slot.columns['timestamp'][:length] = page.timestamps
+            for column in OHLCV_COLUMNS:
+                slot.columns[column][:length] = page.columns[column]
+            timestamp = int(page.timestamps[-1]) if length else None
+
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._pool(), _run_job, slot.block.name, slot.capacity, length, self.indicators, self.predict
+            )
+            result['timestamp'] = timestamp
+            COMPUTE_JOB_TIME.observe(asyncio.get_running_loop().time() - started)
+            if self.on_result is not None:
+                self.on_result(stream, result)
+        except BrokenExecutor as e:
+            # A worker died (e.g. killed for memory); start a fresh pool with the next job.
+            logging.error(f"Compute pool broken while running {stream.symbol} ({stream.interval}): {e}")
+            self._executor = None
+        except Exception as e:
+            logging.error(f"Compute job for {stream.symbol} ({stream.interval}) failed: {e}")
+        finally:
+            slot.running = False
+            if slot.dirty and slot.key in self._slots:
+                self.submit(stream)
+
+    def close(self):
+        """
+        Stops the workers and releases every shared-memory block.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        for slot in self._slots.values():
+            slot.close()
+        self._slots.clear()
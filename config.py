@@ -0,0 +1,78 @@
+# your_trading_dashboard/config.py
+
+# Your Twelvedata API Key
+TWELVEDATA_API_KEY = "eda1e0b1326840358fd7015023fbe7a0"  # << REMEMBER TO REPLACE THIS WITH YOUR OWN KEY FOR PRODUCTION!
+
+# Symbol and Interval for trading
+SYMBOL = "EUR/GBP"
+# Choose interval based on your binary options needs.
+# "1min" is generally good for deriving signals for both 2-min and 5-min expiries.
+INTERVAL = "1min"
+
+# All symbols and intervals streamed over the shared Twelvedata websocket.
+# Each (symbol, interval) pair gets its own history buffer and indicator state.
+SYMBOLS = [SYMBOL]
+INTERVALS = [INTERVAL]
+
+# Higher timeframes resampled locally from each symbol's first interval in INTERVALS.
+# They run through the same indicator/broadcast pipeline but cost no extra upstream credits.
+DERIVED_INTERVALS = ["2min", "5min", "15min", "1h"]
+
+# Number of historical data points (OHLC bars) to keep in memory for indicator calculation
+# 200-300 bars should be sufficient for most common indicators.
+OHLCV_HISTORY_SIZE = 300
+
+# Directory for the append-only on-disk bar store (one file per symbol/interval).
+# On restart history is memory-mapped from here and only the gap since the last stored bar is fetched.
+# Set to None to disable persistence.
+BAR_STORE_DIR = "data/bars"
+
+# Event source: "twelvedata" (live websocket) or "replay" (events recorded to REPLAY_FILE, no network needed).
+FEED_SOURCE = "twelvedata"
+REPLAY_FILE = "data/replay/events.jsonl"
+# Replay speed: 1.0 = real time, N = N times faster, 0 = as fast as the pipeline can go.
+REPLAY_SPEED = 1.0
+# Append every live event to this JSON-lines file so it can be replayed later (None disables recording).
+RECORD_EVENTS_PATH = None
+
+# Minimum seconds between 'partial' (in-progress bar) broadcasts per stream; ticks in between are conflated.
+PARTIAL_BAR_THROTTLE = 0.25
+# Closed tick-built bars are kept this many bars (of tick time) for their upstream bar to arrive and reconcile.
+TICK_RECONCILE_WINDOW = 3
+
+# Maximum number of historical REST requests in flight while bootstrapping streams at startup.
+BOOTSTRAP_CONCURRENCY = 4
+
+# WebSocket fan-out: each client gets its own bounded send queue.
+# When a slow client's queue is full: "drop_oldest", "conflate" (keep only the latest update) or "disconnect".
+BROADCAST_QUEUE_SIZE = 64
+BROADCAST_OVERFLOW_POLICY = "drop_oldest"
+
+# GET /history page size: used when no limit is given, and the largest limit accepted.
+HISTORY_DEFAULT_LIMIT = 1000
+HISTORY_MAX_LIMIT = 100000
+
+# GET /downsample: default and maximum number of chart points, and how many zoom levels/results to keep cached.
+DOWNSAMPLE_DEFAULT_POINTS = 2000
+DOWNSAMPLE_MAX_POINTS = 10000
+DOWNSAMPLE_CACHE_SIZE = 64
+
+# Memory budget (bytes) for indicator arrays cached over full stream histories (least recently used are evicted).
+INDICATOR_CACHE_BYTES = 256 * 1024 * 1024
+
+# Per-stream analytics run after each bar, off the event loop: "process" (worker processes fed through
+# shared memory), "thread" or "off". Jobs only run when COMPUTE_INDICATORS is non-empty or an ai_model
+# module providing generate_predictions(df) is importable.
+COMPUTE_MODE = "process"
+COMPUTE_WORKERS = None  # None = one per CPU
+# Registry indicators (see indicators.available_indicators()) computed per bar, e.g. ["EMA_200", "BB_UPPER_20", "MACD_HIST"].
+COMPUTE_INDICATORS = []
+# Newest bars each job sees, i.e. the lookback available to those indicators and the model.
+COMPUTE_WINDOW_BARS = 5000
+
+# "single": this process owns the upstream feed and serves clients (run uvicorn with one worker).
+# "api": serve clients only, mirroring a separately started `python ingest.py` (which owns the feed,
+# the bar store and the compute pool) over the Unix socket at BUS_PATH; any number of these can run,
+# e.g. `uvicorn main:app --workers 4`, all reading the same BAR_STORE_DIR.
+DEPLOYMENT_MODE = "single"
+BUS_PATH = "data/ingest.sock"
@@ -0,0 +1,187 @@
+# your_trading_dashboard/downsample.py
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from history import query_history
+from resampler import resample_arrays
+from ring_buffer import OHLCV_COLUMNS
+from timeframes import interval_seconds
+
+# Candle sizes a chart zooms through; OHLC downsampling picks the finest one that fits the requested points.
+ZOOM_LEVELS = ('1min', '5min', '15min', '30min', '1h', '2h', '4h', '6h', '12h', '1day', '1week')
+
+DOWNSAMPLE_METHODS = ('ohlc', 'lttb')
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the visual shape of the y(x) line.
+    Bucket averages are computed for all buckets at once from cumulative sums; only the choice of each
+    bucket's point (which depends on the previous choice) walks the buckets.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # threshold - 2 buckets over the interior points; the first and last points are always kept.
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+
+    # Average of the bucket after each bucket (the last one looks ahead to the final point).
+    cx = np.concatenate(([0.0], np.cumsum(x)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    next_starts = np.append(starts[1:], n - 1)
+    next_ends = np.append(ends[1:], n)
+    counts = next_ends - next_starts
+    avg_x = (cx[next_ends] - cx[next_starts]) / counts
+    avg_y = (cy[next_ends] - cy[next_starts]) / counts
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = starts[i], ends[i]
+        ax, ay = x[a], y[a]
+        areas = np.abs((ax - avg_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (avg_y[i] - ay))
+        a = lo + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def choose_zoom_level(first: int, last: int, points: int, base_seconds: int) -> int:
+    """
+    The finest zoom level (in seconds, never below the stream's own interval) whose epoch-aligned
+    candles cover first..last (epoch seconds) in at most `points` candles.
+    """
+    levels = [seconds for seconds in map(interval_seconds, ZOOM_LEVELS) if seconds >= base_seconds]
+    for seconds in levels or [base_seconds]:
+        if last // seconds - first // seconds + 1 <= points:
+            return seconds
+    # Beyond the coarsest level: buckets of span / (points - 1) fit `points` whatever their alignment.
+    return max(levels[-1] if levels else base_seconds, -(-(last - first) // max(points - 1, 1)))
+
+
+class LRUCache:
+    """
+    Small least-recently-used cache, shared by the worker threads serving /downsample.
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class Downsampler:
+    """
+    Reduces a stream's history over a time range to a target number of chart points.
+
+    'ohlc' aggregates bars into time-aligned candles (open first, high max, low min, close last,
+    volume sum), so highs and lows survive decimation. Each zoom level is computed once over the
+    full history, cached and extended as bars arrive; ranges are then sliced out by binary search.
+    'lttb' picks representative close prices with Largest-Triangle-Three-Buckets (cached per range).
+    """
+    def __init__(self, cache_size: int = 64):
+        self._cache = LRUCache(cache_size)
+
+    def _level(self, stream, seconds: int) -> Tuple[np.ndarray, ...]:
+        """
+        One zoom level over the stream's full history. New bars re-aggregate only the level's last
+        (still open) bucket and append the buckets after it; a rewritten bar re-aggregates from its
+        bucket on. The level is rebuilt when the oldest bar changed (history trimmed or reloaded).
+        """
+        # Keyed without the version so a level updated after new bars replaces the stale one.
+        key = ('ohlc-level', stream.key, seconds)
+        version = stream.bar_version
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[2]
+
+        oldest = query_history(stream, limit=1)
+        first = int(oldest.timestamps[0]) if len(oldest) else None
+        since = None
+        if cached is not None and cached[1] == first and len(cached[2][0]):
+            rewritten = stream.rewritten_since(cached[0])
+            if rewritten is None:
+                since = int(cached[2][0][-1])
+            elif rewritten:
+                since = rewritten - rewritten % seconds
+
+        page = query_history(stream, since, limit=sys.maxsize)
+        level = resample_arrays(page.timestamps, *(page.columns[name] for name in OHLCV_COLUMNS), seconds)[:6]
+        if since is not None:
+            keep = int(np.searchsorted(cached[2][0], since, side='left'))
+            level = tuple(np.concatenate((column[:keep], new)) for column, new in zip(cached[2], level))
+        self._cache.put(key, (version, first, level))
+        return level
+
+    def ohlc(self, stream, start: Optional[int], end: Optional[int], points: int) -> Dict:
+        base_seconds = interval_seconds(stream.interval)
+        first_page = query_history(stream, start, end, limit=1)
+        last = stream.ohlcv_history.last_timestamp if end is None else end
+        if not len(first_page) or last is None:
+            return {'bucket_seconds': base_seconds, 'bars': []}
+        first = int(first_page.timestamps[0])
+
+        seconds = choose_zoom_level(first, last, points, base_seconds)
+        if seconds == base_seconds:
+            page = query_history(stream, start, end, limit=points)
+            return {
+                'bucket_seconds': seconds,
+                'bars': self._rows(page.timestamps, [page.columns[name] for name in OHLCV_COLUMNS]),
+            }
+        level = self._level(stream, seconds)
+        timestamps = level[0]
+        lo = int(np.searchsorted(timestamps, first - first % seconds, side='left'))
+        hi = int(np.searchsorted(timestamps, last, side='right'))
+        return {
+            'bucket_seconds': seconds,
+            'bars': self._rows(timestamps[lo:hi], [column[lo:hi] for column in level[1:]]),
+        }
+
+    def lttb(self, stream, start: Optional[int], end: Optional[int], points: int) -> Dict:
+        key = ('lttb', stream.key, start, end, points, stream.bar_version)
+        result = self._cache.get(key)
+        if result is None:
+            page = query_history(stream, start, end, limit=sys.maxsize)
+            indices = lttb(page.timestamps, page.columns['close'], points)
+            times = np.datetime_as_string(page.timestamps[indices].astype('datetime64[s]')).tolist()
+            closes = page.columns['close'][indices].tolist()
+            result = {
+                'source_bars': len(page),
+                'points': [{'timestamp': t, 'close': c} for t, c in zip(times, closes)],
+            }
+            self._cache.put(key, result)
+        return result
+
+    @staticmethod
+    def _rows(timestamps: np.ndarray, columns: List[np.ndarray]) -> List[Dict]:
+        times = np.datetime_as_string(np.asarray(timestamps).astype('datetime64[s]')).tolist()
+        values = [np.asarray(column).tolist() for column in columns]
+        return [
+            {'timestamp': t, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+            for t, o, h, l, c, v in zip(times, *values)
+        ]
@@ -0,0 +1,191 @@
+# your_trading_dashboard/feeds.py
+
+import asyncio
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional
+
+from ring_buffer import to_epoch_seconds
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+EventHandler = Callable[[Dict], Awaitable[None]]
+
+
+class FeedSource:
+    """
+    Where MarketDataStreamer gets its events from. Implementations call `on_event` with
+    Twelvedata-shaped event dicts ('price', 'ohlc', 'heartbeat', 'subscribe-status').
+    """
+    # Offline feeds have no REST API behind them, so history comes only from the bar store.
+    offline = False
+
+    async def connect(self, on_event: EventHandler) -> bool:
+        raise NotImplementedError
+
+    async def disconnect(self):
+        raise NotImplementedError
+
+
+class TwelvedataFeed(FeedSource):
+    """
+    Live Twelvedata websocket for a set of symbols/intervals.
+    """
+    def __init__(self, td, symbols: List[str], intervals: List[str]):
+        self.td = td
+        self.symbols = symbols
+        self.intervals = intervals
+        self._ws_connection = None
+
+    async def connect(self, on_event: EventHandler) -> bool:
+        if self._ws_connection:
+            await self.disconnect()
+
+        logging.info(f"Connecting to Twelvedata WebSocket for {len(self.symbols)} symbols ({', '.join(self.intervals)})...")
+        try:
+            self._ws_connection = self.td.websocket(
+                symbols=self.symbols,
+                on_event=on_event,
+                intervals=self.intervals
+            )
+            await self._ws_connection.connect()
+            logging.info("Twelvedata WebSocket connected.")
+            asyncio.create_task(self._keep_websocket_alive())
+            return True
+        except Exception as e:
+            logging.error(f"Failed to connect to Twelvedata WebSocket: {e}")
+            self._ws_connection = None
+            return False
+
+    async def _keep_websocket_alive(self):
+        """
+        Keeps the WebSocket connection alive by sending heartbeats.
+        """
+        if self._ws_connection:
+            try:
+                while self._ws_connection.is_connected():
+                    await self._ws_connection.keep_alive()
+                    await asyncio.sleep(5)
+            except Exception as e:
+                logging.error(f"WebSocket keep-alive error: {e}")
+            finally:
+                if self._ws_connection:
+                    logging.info("WebSocket keep-alive routine ending.")
+
+    async def disconnect(self):
+        """
+        Disconnects the Twelvedata WebSocket.
+        """
+        if self._ws_connection:
+            logging.info("Disconnecting Twelvedata WebSocket...")
+            await self._ws_connection.disconnect()
+            self._ws_connection = None
+            logging.info("Twelvedata WebSocket disconnected.")
+
+
+class ReplayFeed(FeedSource):
+    """
+    Replays events recorded by EventRecorder (one JSON object per line) into the streamer.
+
+    speed=1.0 replays in real time, speed=N runs N times faster, and speed=0 (or None)
+    replays as fast as the pipeline can absorb, which gives the maximum bars/ticks per second.
+    """
+    offline = True
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0):
+        self.path = path
+        self.speed = speed or 0.0
+        self.stats: Dict[str, float] = {}
+        self.finished = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def connect(self, on_event: EventHandler) -> bool:
+        speed = f"{self.speed}x" if self.speed else "unthrottled"
+        logging.info(f"Replaying recorded events from {self.path} ({speed})...")
+        self.finished.clear()
+        self._task = asyncio.create_task(self._replay(on_event))
+        return True
+
+    @staticmethod
+    def _event_time(event: Dict) -> Optional[float]:
+        if 'received_at' in event:
+            return float(event['received_at'])
+        if 'timestamp' in event:
+            return float(to_epoch_seconds(event['timestamp']))
+        return None
+
+    def _read_events(self) -> Iterator[Dict]:
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    async def _replay(self, on_event: EventHandler):
+        counts = {'events': 0, 'price': 0, 'ohlc': 0}
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        replay_start = loop.time()
+        first_event_time = None
+        try:
+            for event in self._read_events():
+                event_time = self._event_time(event) if self.speed else None
+                if event_time is not None:
+                    if first_event_time is None:
+                        first_event_time = event_time
+                    delay = replay_start + (event_time - first_event_time) / self.speed - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                event.pop('received_at', None)
+                await on_event(event)
+                counts['events'] += 1
+                kind = event.get('event')
+                if kind in counts:
+                    counts[kind] += 1
+                if not self.speed:
+                    await asyncio.sleep(0)  # let the processing loop and client writers keep up
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logging.error(f"Replay of {self.path} failed: {e}")
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stats = {
+                'events': counts['events'],
+                'ticks': counts['price'],
+                'bars': counts['ohlc'],
+                'seconds': elapsed,
+                'events_per_second': counts['events'] / elapsed if elapsed else 0.0,
+                'ticks_per_second': counts['price'] / elapsed if elapsed else 0.0,
+                'bars_per_second': counts['ohlc'] / elapsed if elapsed else 0.0,
+            }
+            logging.info(
+                f"Replay finished: {counts['events']} events ({counts['ohlc']} bars, {counts['price']} ticks) "
+                f"in {elapsed:.3f}s = {self.stats['events_per_second']:.0f} events/s"
+            )
+            self.finished.set()
+
+    async def disconnect(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+
+class EventRecorder:
+    """
+    Wraps an event handler and appends every event to a JSON-lines file for later replay,
+    stamped with the wall-clock time it was received.
+    """
+    def __init__(self, path: str, on_event: EventHandler):
+        self.path = path
+        self.on_event = on_event
+        self._file = open(path, 'a')
+
+    async def __call__(self, event: Dict):
+        self._file.write(json.dumps(dict(event, received_at=time.time()), default=str) + '\n')
+        await self.on_event(event)
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,123 @@
+# your_trading_dashboard/history.py
+
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+from ring_buffer import OHLCV_COLUMNS
+
+# Bars serialized per chunk of a streamed /history response.
+HISTORY_CHUNK_BARS = 2000
+
+
+@dataclass
+class HistoryPage:
+    """
+    One page of a range query: oldest-first columns plus the cursor of the next page (None on the last one).
+    `indicators` optionally holds indicator values aligned with the bars.
+    """
+    symbol: str
+    interval: str
+    timestamps: np.ndarray
+    columns: Dict[str, np.ndarray]
+    next_cursor: Optional[str]
+    indicators: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+def query_history(stream, start: Optional[int] = None, end: Optional[int] = None, limit: int = 1000,
+                  cursor: Optional[str] = None) -> HistoryPage:
+    """
+    Returns up to `limit` bars of a stream with start <= timestamp <= end (epoch seconds, inclusive).
+
+    Completed bars come from the on-disk store (memory-mapped, located by binary search); bars newer
+    than the store's last one - such as the still-forming bar - come from the in-memory buffer.
+    `cursor` is the next_cursor of a previous page and resumes right after it.
+    """
+    if cursor is not None:
+        start = int(cursor)
+    wanted = limit + 1  # one extra bar tells us whether another page follows
+
+    parts = []
+    store_last = None
+    store = stream.store
+    if store is not None and len(store):
+        lo, hi = store.index_range(start, end)
+        bars = store.read()[lo:min(hi, lo + wanted)]
+        if len(bars):
+            parts.append((bars['timestamp'], {name: bars[name] for name in OHLCV_COLUMNS}))
+        store_last = store.last_timestamp
+
+    remaining = wanted - sum(len(part[0]) for part in parts)
+    history = stream.ohlcv_history
+    if remaining > 0 and history:
+        buffer_start = start
+        if store_last is not None:
+            buffer_start = store_last + 1 if start is None else max(start, store_last + 1)
+        # Copied under the buffer's lock: this runs in worker threads while the loop appends.
+        timestamps, columns = history.copy_range(buffer_start, end, remaining)
+        if len(timestamps):
+            parts.append((timestamps, columns))
+
+    if not parts:
+        timestamps = np.empty(0, dtype=np.int64)
+        columns = {name: np.empty(0) for name in OHLCV_COLUMNS}
+    elif len(parts) == 1:
+        timestamps, columns = parts[0]
+    else:
+        timestamps = np.concatenate([part[0] for part in parts])
+        columns = {name: np.concatenate([part[1][name] for part in parts]) for name in OHLCV_COLUMNS}
+
+    next_cursor = None
+    if len(timestamps) > limit:
+        next_cursor = str(int(timestamps[limit]))
+        timestamps = timestamps[:limit]
+        columns = {name: values[:limit] for name, values in columns.items()}
+    return HistoryPage(stream.symbol, stream.interval, timestamps, columns, next_cursor)
+
+
+def tail_history(stream, count: int) -> HistoryPage:
+    """
+    The newest `count` bars of a stream (store and buffer), oldest first.
+    """
+    newer = 0
+    store = stream.store
+    history = stream.ohlcv_history
+    if store is None or not len(store):
+        return query_history(stream, None if len(history) <= count else int(history.timestamps[-count]), limit=count)
+    if history:
+        lo, hi = history.index_range(store.last_timestamp + 1, None)
+        newer = hi - lo
+    if newer >= count:
+        return query_history(stream, int(history.timestamps[-count]), limit=count)
+    from_store = min(count - newer, len(store))
+    return query_history(stream, int(store.read()['timestamp'][-from_store]), limit=count)
+
+
+def iter_history_json(page: HistoryPage, chunk_bars: int = HISTORY_CHUNK_BARS) -> Iterator[bytes]:
+    """
+    Serializes a page as one JSON document, yielding it in chunks so large ranges start streaming immediately.
+    Bars use the same shape as the 'ohlcv' bars of the protocol snapshot, plus any indicators (null during warm-up).
+    """
+    header = {"symbol": page.symbol, "interval": page.interval, "count": len(page), "next_cursor": page.next_cursor}
+    yield (json.dumps(header, separators=(',', ':'))[:-1] + ',"bars":[').encode()
+
+    for offset in range(0, len(page), chunk_bars):
+        window = slice(offset, offset + chunk_bars)
+        times = np.datetime_as_string(page.timestamps[window].astype('datetime64[s]')).tolist()
+        values = [page.columns[name][window].tolist() for name in OHLCV_COLUMNS]
+        bars = [
+            {'timestamp': t, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+            for t, o, h, l, c, v in zip(times, *values)
+        ]
+        for name, series in page.indicators.items():
+            for bar, value in zip(bars, series[window].tolist()):
+                bar[name] = None if value != value else value
+        chunk = json.dumps(bars, separators=(',', ':'))[1:-1]
+        yield ((',' if offset else '') + chunk).encode()
+
+    yield b']}'
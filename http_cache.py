@@ -0,0 +1,115 @@
+# your_trading_dashboard/http_cache.py
+
+import gzip
+import time
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Dict, Hashable, Optional, Union
+
+from fastapi import Request, Response
+
+# Bodies smaller than this are not worth a gzip variant.
+GZIP_MIN_SIZE = 1024
+
+# Distinguishes ETags across restarts, since versions start again from zero.
+_BOOT_ID = format(time.time_ns() // 1_000_000, 'x')
+
+
+@dataclass
+class CachedBody:
+    """
+    One serialized response and its validators, built once per version.
+    """
+    version: Hashable
+    body: bytes
+    media_type: str
+    etag: str
+    last_modified: str
+    modified_at: float
+    _gzipped: Optional[bytes] = None
+
+    @property
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+
+def _accepts_gzip(request: Request) -> bool:
+    for part in request.headers.get('accept-encoding', '').split(','):
+        coding, _, params = part.partition(';')
+        if coding.strip().lower() == 'gzip':
+            quality = params.strip().removeprefix('q=')
+            try:
+                return not params.strip() or float(quality) > 0
+            except ValueError:
+                return True
+    return False
+
+
+def _not_modified(request: Request, entry: CachedBody, etag: str) -> bool:
+    """
+    Evaluates If-None-Match (preferred) or If-Modified-Since against a cached body.
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        candidates = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in candidates or any(tag.removeprefix('W/') == etag for tag in candidates)
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since:
+        try:
+            return int(entry.modified_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class ResponseCache:
+    """
+    Serves a resource from bytes produced once per version rather than once per request.
+    Supports conditional GETs (ETag / Last-Modified -> 304) and a lazily built gzip variant.
+    """
+    def __init__(self, gzip_min_size: int = GZIP_MIN_SIZE):
+        self.gzip_min_size = gzip_min_size
+        self._entries: Dict[Hashable, CachedBody] = {}
+
+    def get(self, key: Hashable, version: Hashable, modified_at: float, media_type: str,
+            render: Callable[[], Union[str, bytes]]) -> CachedBody:
+        """
+        Returns the cached body for `key`, calling `render` only when `version` has changed.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.version != version:
+            body = render()
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            version_tag = '-'.join(str(part) for part in version) if isinstance(version, tuple) else str(version)
+            entry = CachedBody(
+                version=version,
+                body=body,
+                media_type=media_type,
+                etag=f'"{_BOOT_ID}-{version_tag}"',
+                last_modified=formatdate(modified_at, usegmt=True),
+                modified_at=modified_at,
+            )
+            self._entries[key] = entry
+        return entry
+
+    def respond(self, request: Request, entry: CachedBody) -> Response:
+        """
+        Answers with 304, the gzip variant (its own ETag) or the plain body, without re-serializing.
+        """
+        compressed = len(entry.body) >= self.gzip_min_size and _accepts_gzip(request)
+        etag = entry.etag[:-1] + '-gzip"' if compressed else entry.etag
+        headers = {
+            'ETag': etag,
+            'Last-Modified': entry.last_modified,
+            'Cache-Control': 'no-cache',
+            'Vary': 'Accept, Accept-Encoding',
+        }
+        if _not_modified(request, entry, etag):
+            return Response(status_code=304, headers=headers)
+        if compressed:
+            headers['Content-Encoding'] = 'gzip'
+            return Response(content=entry.gzipped, media_type=entry.media_type, headers=headers)
+        return Response(content=entry.body, media_type=entry.media_type, headers=headers)
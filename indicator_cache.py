@@ -0,0 +1,237 @@
+# your_trading_dashboard/indicator_cache.py
+
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+import numpy as np
+
+from history import query_history
+from indicators import compute_indicators, resolve
+from metrics import INDICATOR_CACHE_REQUESTS
+from ring_buffer import OHLCV_COLUMNS
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Cached bars recomputed in front of new ones when extending an indicator, so recursive
+# indicators (EMA, RSI, ATR) converge before the first new value.
+EXTEND_CONTEXT_BARS = 2048
+
+# Largest relative difference between a cached value and its recomputation that still counts as converged.
+EXTEND_TOLERANCE = 1e-9
+
+
+class _Growable:
+    """
+    A float/int array with spare capacity, so appending k values costs O(k) rather than a full copy.
+    """
+    def __init__(self, values: np.ndarray):
+        self._data = np.array(values, copy=True)
+        self.length = len(values)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[:self.length]
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def truncate(self, length: int):
+        self.length = min(self.length, length)
+
+    def extend(self, values: np.ndarray):
+        needed = self.length + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data), 64), dtype=self._data.dtype)
+            grown[:self.length] = self._data[:self.length]
+            self._data = grown
+        self._data[self.length:needed] = values
+        self.length = needed
+
+
+class _Bars:
+    """
+    The cached input of one stream: oldest-first timestamps and OHLCV columns, and the indicator entries computed from them.
+    """
+    def __init__(self, bar_version: int, timestamps: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.bar_version = bar_version
+        self.timestamps = _Growable(timestamps)
+        self.columns = {name: _Growable(columns[name]) for name in OHLCV_COLUMNS}
+        self.dependents = set()
+
+    def __len__(self) -> int:
+        return self.timestamps.length
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + sum(column.nbytes for column in self.columns.values())
+
+    def window(self, lo: int, hi: int) -> Dict[str, np.ndarray]:
+        return {name: column.values[lo:hi] for name, column in self.columns.items()}
+
+
+class IndicatorCache:
+    """
+    Indicator arrays computed over a stream's full history (bar store plus buffer), kept under a
+    memory budget with least-recently-used eviction.
+
+    Entries are keyed by (symbol, interval, indicator, params) and valid up to the last bar timestamp
+    they cover. New bars extend an entry: only a short context window in front of them is recomputed
+    (checked against the cached values, with a full recompute of just the entries that disagree). A corrected or late
+    bar truncates entries to the bars before it (indicators only look backwards) and extends again.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries: OrderedDict = OrderedDict()
+        # Consumers run in worker threads (asyncio.to_thread) as well as on the event loop.
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, stream, names: Iterable[str]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Timestamps of the stream's history and the requested indicators over it (by requested name).
+        Returned arrays are copies, safe to keep.
+        """
+        names = list(names)
+        with self._lock:
+            bars, results = self._compute(stream, names)
+            return bars.timestamps.values.copy(), {name: values.copy() for name, values in results.items()}
+
+    def values_at(self, stream, names: Iterable[str], timestamps: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        The requested indicators at the given bar timestamps (NaN where a timestamp is unknown or in warm-up).
+        """
+        names = list(names)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        with self._lock:
+            bars, results = self._compute(stream, names)
+            cached = bars.timestamps.values
+            positions = np.searchsorted(cached, timestamps)
+            found = positions < len(cached)
+            found[found] = cached[positions[found]] == timestamps[found]
+            positions = np.where(found, positions, 0)
+            return {name: np.where(found, values[positions], np.nan) for name, values in results.items()}
+
+    # --- Internals (called with the lock held) ---
+
+    def _compute(self, stream, names: List[str]):
+        bars = self._sync_bars(stream)
+        keys = {name: (stream.symbol, stream.interval, spec.name, spec.params) for name, spec in
+                ((name, resolve(name)) for name in names)}
+        entries: Dict[Hashable, _Growable] = {}
+        behind: Dict[int, List[Tuple[Hashable, str]]] = {}
+        missing: List[Tuple[Hashable, str]] = []
+
+        for name, key in keys.items():
+            if key in entries or any(key == pending for pending, _ in missing):
+                continue
+            entry = self._entries.get(key)
+            if entry is None:
+                missing.append((key, name))
+                continue
+            self._entries.move_to_end(key)
+            entries[key] = entry
+            if entry.length == len(bars):
+                INDICATOR_CACHE_REQUESTS.inc('hit')
+            else:
+                behind.setdefault(entry.length, []).append((key, name))
+
+        for length, group in behind.items():
+            diverged = self._extend(bars, length, [(entries[key], name) for key, name in group])
+            if len(diverged) < len(group):
+                INDICATOR_CACHE_REQUESTS.inc('extend', amount=len(group) - len(diverged))
+            missing.extend((key, name) for key, name in group if name in diverged)
+
+        if missing:
+            INDICATOR_CACHE_REQUESTS.inc('miss', amount=len(missing))
+            full = compute_indicators(bars.window(0, len(bars)), [name for _, name in missing])
+            for key, name in missing:
+                entries[key] = self._entries[key] = _Growable(full[name])
+                bars.dependents.add(key)
+
+        self._evict()
+        return bars, {name: entries[key].values for name, key in keys.items()}
+
+    def _extend(self, bars: _Bars, length: int, group: List[Tuple[_Growable, str]]) -> Set[str]:
+        """
+        Appends values for bars[length:] to each entry by recomputing over a context window.
+        Returns the names left unextended because the window's recomputation of their last cached
+        value does not match it (e.g. a long EMA that has not converged within the window).
+        """
+        context = min(length, EXTEND_CONTEXT_BARS)
+        tail = compute_indicators(bars.window(length - context, len(bars)), [name for _, name in group])
+        diverged = set()
+        for entry, name in group:
+            if context:
+                cached, recomputed = entry.values[length - 1], tail[name][context - 1]
+                if np.isnan(cached) != np.isnan(recomputed) or (
+                        not np.isnan(cached) and abs(recomputed - cached) > EXTEND_TOLERANCE * max(abs(cached), 1.0)):
+                    diverged.add(name)
+                    continue
+            entry.extend(tail[name][context:])
+        return diverged
+
+    def _sync_bars(self, stream) -> _Bars:
+        """
+        Brings the stream's cached input up to date: appends new bars, truncates rewritten ones.
+        """
+        key = (stream.symbol, stream.interval)
+        # Read before the bars: if the loop changes them while we copy, the next call sees a newer
+        # version and re-syncs, instead of the copy being marked current.
+        bar_version = stream.bar_version
+        bars = self._entries.get(key)
+        if bars is not None:
+            self._entries.move_to_end(key)
+            if bars.bar_version == bar_version:
+                return bars
+            rewritten = stream.rewritten_since(bars.bar_version)
+            if rewritten == 0:
+                self.nbytes -= self._drop(key)
+                bars = None
+            else:
+                if rewritten is not None:
+                    keep = int(np.searchsorted(bars.timestamps.values, rewritten, side='left'))
+                    self._truncate(bars, keep)
+                last = int(bars.timestamps.values[-1]) if len(bars) else None
+                page = query_history(stream, None if last is None else last + 1, limit=sys.maxsize)
+                bars.timestamps.extend(page.timestamps)
+                for name in OHLCV_COLUMNS:
+                    bars.columns[name].extend(page.columns[name])
+                bars.bar_version = bar_version
+
+        if bars is None:
+            page = query_history(stream, limit=sys.maxsize)
+            bars = _Bars(bar_version, page.timestamps, page.columns)
+            self._entries[key] = bars
+        return bars
+
+    def _truncate(self, bars: _Bars, length: int):
+        bars.timestamps.truncate(length)
+        for column in bars.columns.values():
+            column.truncate(length)
+        for key in bars.dependents:
+            self._entries[key].truncate(length)
+
+    def _drop(self, key: Hashable) -> int:
+        """
+        Removes an entry (a stream's bars take their indicator entries with them). Returns the bytes freed.
+        """
+        entry = self._entries.pop(key)
+        freed = entry.nbytes
+        if isinstance(entry, _Bars):
+            for dependent in entry.dependents:
+                freed += self._entries.pop(dependent).nbytes
+        else:
+            self._entries[key[:2]].dependents.discard(key)
+        return freed
+
+    def _evict(self):
+        self.nbytes = sum(entry.nbytes for entry in self._entries.values())
+        while self.nbytes > self.max_bytes and self._entries:
+            self.nbytes -= self._drop(next(iter(self._entries)))
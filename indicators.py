@@ -1,14 +1,190 @@
 # your_trading_dashboard/indicators.py
 
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
 import pandas as pd
 import talib as ta
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
+# Columns every indicator graph starts from.
+BASE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# What calculate_technical_indicators produces when no indicator list is given
+# (the same columns as streaming_indicators.IndicatorEngine).
+DEFAULT_INDICATORS = ('RSI', 'SMA_20', 'SMA_50', 'EMA_20', 'EMA_50', 'MOMENTUM_ROC_10', 'ATR')
+
+# Dashboard names for parametrized registry entries.
+ALIASES = {
+    'RSI': 'RSI_14',
+    'ATR': 'ATR_14',
+    'MOMENTUM_ROC_10': 'ROC_10',
+}
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """
+    One node of the indicator graph: a named array computed from other nodes or base columns.
+    Nodes registered with public=False are intermediates for other nodes and are not listed as indicators.
+    """
+    name: str
+    inputs: Tuple[str, ...]
+    compute: Callable[..., np.ndarray]
+    params: Tuple[Tuple[str, Any], ...] = ()
+    public: bool = True
+
+    def __call__(self, *arrays: np.ndarray) -> np.ndarray:
+        return self.compute(*arrays, **dict(self.params))
+
+
+# Largest period TA-Lib accepts for any of its timeperiod arguments.
+TALIB_MAX_PERIOD = 100000
+
+# Family members built from request names are memoized, up to this many.
+FAMILY_MEMBER_CACHE_SIZE = 1024
+
+_REGISTRY: Dict[str, IndicatorSpec] = {}
+# Parametrized families: "<PREFIX>_<period>" names are built on first use, e.g. SMA_200 or RSI_7,
+# for periods within the family's (factory, min_period, max_period) bounds.
+_FAMILIES: Dict[str, Tuple[Callable[[int], IndicatorSpec], int, int]] = {}
+_FAMILY_NAME = re.compile(r'^(?P<prefix>[A-Z][A-Z_]*?)_(?P<period>\d+)$')
+
+
+def register_indicator(name: str, inputs: Sequence[str], compute: Callable[..., np.ndarray],
+                       public: bool = True, **params) -> IndicatorSpec:
+    """
+    Adds (or replaces) a registry entry. `compute` receives the input arrays in order plus `params`.
+    """
+    spec = IndicatorSpec(name, tuple(inputs), compute, tuple(sorted(params.items())), public)
+    _REGISTRY[name] = spec
+    return spec
+
+
+def register_family(prefix: str, factory: Callable[[int], IndicatorSpec], min_period: int = 1,
+                    max_period: int = TALIB_MAX_PERIOD):
+    """
+    Registers a parametrized indicator: `factory(period)` returns the spec named f"{prefix}_{period}".
+    Periods outside [min_period, max_period] (what the underlying kernels accept) are unknown names.
+    """
+    _FAMILIES[prefix] = (factory, min_period, max_period)
+    _family_member.cache_clear()
+
+
+@lru_cache(maxsize=FAMILY_MEMBER_CACHE_SIZE)
+def _family_member(prefix: str, period: int) -> IndicatorSpec:
+    return _FAMILIES[prefix][0](period)
+
+
+def resolve(name: str) -> IndicatorSpec:
+    name = ALIASES.get(name, name)
+    spec = _REGISTRY.get(name)
+    if spec is not None:
+        return spec
+    match = _FAMILY_NAME.match(name)
+    if match and match.group('prefix') in _FAMILIES:
+        prefix, period = match.group('prefix'), int(match.group('period'))
+        _, min_period, max_period = _FAMILIES[prefix]
+        if not min_period <= period <= max_period:
+            raise KeyError(f"{prefix} period must be between {min_period} and {max_period}: {name}")
+        return _family_member(prefix, period)
+    raise KeyError(f"Unknown indicator: {name}")
+
+
+def available_indicators() -> List[str]:
     """
-    Calculates various technical indicators and adds them as new columns to the DataFrame.
+    Registered output indicators plus the parametrized families (as "<PREFIX>_<n>").
+    """
+    names = {name for name, spec in _REGISTRY.items() if spec.public}
+    families = {f"{prefix}_<n>" for prefix, (factory, min_period, _) in _FAMILIES.items()
+                if factory(min_period).public}
+    return sorted(names | set(ALIASES) | families)
+
+
+def build_plan(names: Iterable[str]) -> List[IndicatorSpec]:
+    """
+    The dependency DAG of the requested indicators in evaluation order (inputs before consumers).
+    Every node appears once, however many indicators share it, and nodes nobody asked for are left out.
+    """
+    order: List[IndicatorSpec] = []
+    done = set(BASE_COLUMNS)
+    visiting = set()
+
+    def visit(name: str):
+        spec = resolve(name)
+        if spec.name in done:
+            return
+        if spec.name in visiting:
+            raise ValueError(f"Indicator dependency cycle through {spec.name}")
+        visiting.add(spec.name)
+        for dependency in spec.inputs:
+            if dependency not in BASE_COLUMNS:
+                visit(dependency)
+        visiting.discard(spec.name)
+        done.add(spec.name)
+        order.append(spec)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def compute_indicators(columns: Mapping[str, Any], names: Iterable[str] = DEFAULT_INDICATORS) -> Dict[str, np.ndarray]:
+    """
+    Evaluates the requested indicators over oldest-first base columns and returns them by requested name.
+    """
+    names = list(names)
+    values: Dict[str, np.ndarray] = {
+        column: np.asarray(columns[column], dtype=np.float64) for column in BASE_COLUMNS if column in columns
+    }
+    for spec in build_plan(names):
+        missing = [name for name in spec.inputs if name not in values]
+        if missing:
+            raise KeyError(f"{spec.name} needs columns {missing}")
+        values[spec.name] = spec(*(values[name] for name in spec.inputs))
+    return {name: values[resolve(name).name] for name in names}
+
+
+# --- Registry contents ---
+# Single-input indicators call TA-Lib's fused kernels directly: composing them from shared numpy
+# intermediates (price diffs, gains/losses) measured several times slower than one C pass each.
+# Sharing pays off between nodes: Bollinger bands reuse SMA_n and STDDEV_n, MACD reuses EMA_12/EMA_26
+# (also served to anyone asking for those EMAs), NATR reuses ATR_n, and TRUE_RANGE is computed once
+# for every custom indicator built on it.
+
+def _bollinger(sma: np.ndarray, stddev: np.ndarray, width: float) -> np.ndarray:
+    return sma + width * stddev
+
+
+register_indicator('TRUE_RANGE', ('high', 'low', 'close'), ta.TRANGE)
+register_indicator('MACD', ('EMA_12', 'EMA_26'), np.subtract)
+register_indicator('MACD_SIGNAL', ('MACD',), ta.EMA, timeperiod=9)
+register_indicator('MACD_HIST', ('MACD', 'MACD_SIGNAL'), np.subtract)
+
+register_family('SMA', lambda n: IndicatorSpec(f'SMA_{n}', ('close',), ta.SMA, (('timeperiod', n),)))
+register_family('EMA', lambda n: IndicatorSpec(f'EMA_{n}', ('close',), ta.EMA, (('timeperiod', n),)))
+register_family('RSI', lambda n: IndicatorSpec(f'RSI_{n}', ('close',), ta.RSI, (('timeperiod', n),)), min_period=2)
+register_family('ROC', lambda n: IndicatorSpec(f'ROC_{n}', ('close',), ta.ROC, (('timeperiod', n),)))
+register_family('STDDEV', lambda n: IndicatorSpec(f'STDDEV_{n}', ('close',), ta.STDDEV, (('timeperiod', n),)),
+                min_period=2)
+register_family('ATR', lambda n: IndicatorSpec(f'ATR_{n}', ('high', 'low', 'close'), ta.ATR, (('timeperiod', n),)))
+register_family('NATR', lambda n: IndicatorSpec(f'NATR_{n}', (f'ATR_{n}', 'close'), lambda atr, close: atr / close * 100.0))
+register_family('BB_UPPER', lambda n: IndicatorSpec(f'BB_UPPER_{n}', (f'SMA_{n}', f'STDDEV_{n}'), _bollinger,
+                                                    (('width', 2.0),)), min_period=2)
+register_family('BB_LOWER', lambda n: IndicatorSpec(f'BB_LOWER_{n}', (f'SMA_{n}', f'STDDEV_{n}'), _bollinger,
+                                                    (('width', -2.0),)), min_period=2)
+
+
+def calculate_technical_indicators(df: pd.DataFrame, indicators: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Calculates technical indicators and adds them as new columns to the DataFrame.
+    `indicators` picks which ones (registry names, aliases or family names such as "EMA_200");
+    the default is DEFAULT_INDICATORS. Shared inputs are computed once per call.
     """
     if df.empty or not all(col in df.columns for col in ['open', 'high', 'low', 'close']):
         logging.warning("DataFrame is empty or missing OHLC columns. Cannot calculate indicators.")
@@ -16,29 +192,17 @@ def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
 
     for col in ['open', 'high', 'low', 'close']:
         df[col] = pd.to_numeric(df[col], errors='coerce')
-    
+
     df = df.dropna(subset=['open', 'high', 'low', 'close'])
 
     if df.empty:
         logging.warning("DataFrame is empty after cleaning. Cannot calculate indicators.")
         return df
 
-    # --- 1. Relative Strength Index (RSI) ---
-    df['RSI'] = ta.RSI(df['close'], timeperiod=14)
-
-    # --- 2. Moving Averages ---
-    df['SMA_20'] = ta.SMA(df['close'], timeperiod=20)
-    df['SMA_50'] = ta.SMA(df['close'], timeperiod=50)
-
-    df['EMA_20'] = ta.EMA(df['close'], timeperiod=20)
-    df['EMA_50'] = ta.EMA(df['close'], timeperiod=50)
-
-    # --- 3. Momentum (Rate of Change - ROC) ---
-    df['MOMENTUM_ROC_10'] = ta.ROC(df['close'], timeperiod=10)
-
-    # --- 4. Volatility (Average True Range - ATR) ---
-    df['ATR'] = ta.ATR(df['high'], df['low'], df['close'], timeperiod=14)
+    names = list(indicators) if indicators is not None else list(DEFAULT_INDICATORS)
+    columns = {col: df[col].to_numpy() for col in BASE_COLUMNS if col in df.columns}
+    df = df.assign(**compute_indicators(columns, names))
 
     df = df.dropna()
-    
-    return df
\ No newline at end of file
+
+    return df
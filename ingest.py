@@ -0,0 +1,71 @@
+# your_trading_dashboard/ingest.py
+
+import asyncio
+import logging
+from typing import Any, Dict
+
+from config import (
+    SYMBOLS, INTERVALS, DERIVED_INTERVALS, TWELVEDATA_API_KEY, OHLCV_HISTORY_SIZE, BAR_STORE_DIR,
+    FEED_SOURCE, REPLAY_FILE, REPLAY_SPEED, RECORD_EVENTS_PATH,
+    COMPUTE_MODE, COMPUTE_WORKERS, COMPUTE_INDICATORS, COMPUTE_WINDOW_BARS, BUS_PATH
+)
+from bus import EventBus
+from compute_pool import ComputePool
+from feeds import ReplayFeed
+from market_data import MarketDataStreamer, MarketStream
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+async def run_ingest():
+    """
+    The ingest side of the multi-worker deployment (DEPLOYMENT_MODE = "api" in the API workers).
+
+    Owns the only upstream connection and REST bootstrap, writes the bar stores and runs the compute
+    pool. Every handled feed event, and each analytics result, is published on the event bus at
+    BUS_PATH; the API workers replay them to keep identical state and serve all clients.
+    """
+    bus = EventBus(BUS_PATH)
+    feed = ReplayFeed(REPLAY_FILE, REPLAY_SPEED) if FEED_SOURCE == "replay" else None
+    streamer = MarketDataStreamer(
+        SYMBOLS, INTERVALS, TWELVEDATA_API_KEY, OHLCV_HISTORY_SIZE, BAR_STORE_DIR,
+        feed=feed, record_events_path=RECORD_EVENTS_PATH, derived_intervals=DERIVED_INTERVALS, event_bus=bus
+    )
+
+    def analytics_ready(stream: MarketStream, result: Dict[str, Any]):
+        stream.analytics = result
+        bus.publish({'event': 'analytics', 'symbol': stream.symbol, 'interval': stream.interval, 'result': result})
+
+    compute_pool = ComputePool(COMPUTE_MODE, COMPUTE_INDICATORS, COMPUTE_WINDOW_BARS, COMPUTE_WORKERS,
+                               on_result=analytics_ready)
+    updates = streamer.subscribe()
+    try:
+        if not await streamer.fetch_initial_historical_data():
+            logging.error("Failed to fetch initial historical data.")
+        # Listen only once the stores hold the bootstrap history: workers resync from them on connecting.
+        await bus.start()
+        await streamer.start_websocket()
+
+        while True:
+            notification = await updates.get()
+            if notification.kind not in ('bar', 'correction', 'history'):
+                continue
+            stream = streamer.get_stream(notification.symbol, notification.interval)
+            if stream is not None and stream.indicator_engine.ready:
+                compute_pool.submit(stream)
+    finally:
+        streamer.unsubscribe(updates)
+        await streamer.stop_websocket()
+        compute_pool.close()
+        await bus.close()
+
+
+def main():
+    try:
+        asyncio.run(run_ingest())
+    except KeyboardInterrupt:
+        logging.info("Ingest stopped.")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,41 @@
 # trading_dashboard/main.py
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 import asyncio
 import logging
 import json
-from typing import List, Dict, Any
-import pandas as pd
+import time
+from typing import List, Dict, Any, FrozenSet, Optional, Set, Tuple
 
-from config import SYMBOL, INTERVAL, TWELVEDATA_API_KEY, OHLCV_HISTORY_SIZE
-from market_data import MarketDataStreamer
-from indicators import calculate_technical_indicators
-# Placeholder for future AI model integration
-# from ai_model import generate_predictions  
+from config import (
+    SYMBOLS, INTERVALS, DERIVED_INTERVALS, TWELVEDATA_API_KEY, OHLCV_HISTORY_SIZE, BAR_STORE_DIR,
+    FEED_SOURCE, REPLAY_FILE, REPLAY_SPEED, RECORD_EVENTS_PATH,
+    BROADCAST_QUEUE_SIZE, BROADCAST_OVERFLOW_POLICY, PARTIAL_BAR_THROTTLE,
+    HISTORY_DEFAULT_LIMIT, HISTORY_MAX_LIMIT, DOWNSAMPLE_DEFAULT_POINTS, DOWNSAMPLE_MAX_POINTS, DOWNSAMPLE_CACHE_SIZE,
+    INDICATOR_CACHE_BYTES, COMPUTE_MODE, COMPUTE_WORKERS, COMPUTE_INDICATORS, COMPUTE_WINDOW_BARS,
+    DEPLOYMENT_MODE, BUS_PATH
+)
+from broadcaster import Broadcaster, ClientSession, trim_payload
+from bus import BusFeed
+from compute_pool import ComputePool
+from downsample import DOWNSAMPLE_METHODS, Downsampler
+from feeds import ReplayFeed
+from history import iter_history_json, query_history
+from http_cache import ResponseCache
+from market_data import MarketDataStreamer, MarketStream
+from indicator_cache import IndicatorCache
+from indicators import build_plan
+from metrics import BAR_DISPATCH_DELAY, gauge, histogram_snapshots, render_prometheus
+from ring_buffer import to_epoch_seconds
+from protocol import (
+    build_ack, build_analytics, build_error, build_partial, build_snapshot, build_update, format_analytics,
+    format_partial_bar, update_covers
+)
+from serialization import MEDIA_TYPES, available_encodings, encode, negotiate
+from streaming_indicators import INDICATOR_NAMES
+# AI model integration: compute_pool imports generate_predictions from an ai_model module when one is installed.
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -34,85 +56,433 @@ app.add_middleware(
 )
 
 # --- Global instances ---
-data_streamer = MarketDataStreamer(SYMBOL, INTERVAL, TWELVEDATA_API_KEY, OHLCV_HISTORY_SIZE)
-connected_clients: List[WebSocket] = []
-global_latest_data: Dict[str, Any] = {}
+if DEPLOYMENT_MODE not in ("single", "api"):
+    raise ValueError('DEPLOYMENT_MODE must be "single" or "api"')
+# An API worker mirrors the ingest process: it replays its events over the bus and only reads the bar store.
+api_worker = DEPLOYMENT_MODE == "api"
+if api_worker:
+    feed = BusFeed(BUS_PATH)
+else:
+    feed = ReplayFeed(REPLAY_FILE, REPLAY_SPEED) if FEED_SOURCE == "replay" else None
+data_streamer = MarketDataStreamer(
+    SYMBOLS, INTERVALS, TWELVEDATA_API_KEY, OHLCV_HISTORY_SIZE, BAR_STORE_DIR,
+    feed=feed, record_events_path=None if api_worker else RECORD_EVENTS_PATH, derived_intervals=DERIVED_INTERVALS,
+    read_only_store=api_worker
+)
+broadcaster = Broadcaster(BROADCAST_QUEUE_SIZE, BROADCAST_OVERFLOW_POLICY)
+# Sequence number of the last update published per (symbol, interval) stream,
+# and the snapshot built for it (rebuilt lazily once per sequence).
+stream_sequences: Dict[Tuple[str, str], int] = {}
+snapshot_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+# When each stream last broadcast its in-progress bar, and which streams have one waiting on the throttle.
+partial_sent_at: Dict[Tuple[str, str], float] = {}
+partial_pending: Set[Tuple[str, str]] = set()
+# Receive time (perf_counter) of the oldest tick folded into each stream's next partial message.
+partial_received_at: Dict[Tuple[str, str], float] = {}
+# (bar_version, newest bar timestamp) of each stream when it was last broadcast, so repeated notifications
+# for unchanged bars are dropped and changes one update cannot carry go out as a snapshot.
+published_bars: Dict[Tuple[str, str], Tuple[int, Optional[int]]] = {}
+# Serialized /latest_data bodies per (stream, encoding), rebuilt only when the stream changes.
+latest_data_cache = ResponseCache()
+downsampler = Downsampler(DOWNSAMPLE_CACHE_SIZE)
+# Indicator arrays over full histories for analytical queries (/history?indicators=...).
+indicator_cache = IndicatorCache(INDICATOR_CACHE_BYTES)
+
+
+def analytics_ready(stream: MarketStream, result: Dict[str, Any]):
+    """
+    Called on the event loop with each finished compute-pool job.
+    """
+    stream.analytics = result
+    stream.touch()
+    broadcaster.publish(stream.key, build_analytics(stream, stream_sequences.get(stream.key, 0)))
+
+
+# API workers receive analytics from the ingest process's pool instead of running their own.
+compute_pool = ComputePool(
+    "off" if api_worker else COMPUTE_MODE, COMPUTE_INDICATORS, COMPUTE_WINDOW_BARS, COMPUTE_WORKERS,
+    on_result=analytics_ready
+)
+
+# --- Scrape-time gauges ---
+gauge('ws_connected_clients', 'Connected WebSocket clients.', lambda: len(broadcaster))
+gauge(
+    'ws_send_queue_depth', 'Frames waiting in client send queues, per stream.',
+    broadcaster.queue_depths,
+    ('symbol', 'interval')
+)
+gauge(
+    'ws_send_queue_depth_max', 'Deepest single client send queue.',
+    lambda: max((session.queue_depth for session in broadcaster.clients), default=0)
+)
+gauge('indicator_cache_bytes', 'Memory held by the indicator cache.', lambda: indicator_cache.nbytes)
+
 
 # --- Startup / Shutdown events ---
 @app.on_event("startup")
 async def startup_event():
     logging.info("Starting backend...")
+    asyncio.create_task(data_processing_loop())
+    asyncio.create_task(bootstrap_streams())
+    logging.info("Backend started.")
+
+
+async def bootstrap_streams():
+    """
+    Loads history for every stream in the background, then connects the upstream websocket.
+    Clients can connect meanwhile; each stream starts broadcasting as soon as its history is in.
+    """
     success = await data_streamer.fetch_initial_historical_data()
     if not success:
         logging.error("Failed to fetch initial historical data.")
 
     await data_streamer.start_websocket()
-    asyncio.create_task(data_processing_loop())
-    logging.info("Backend started.")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logging.info("Shutting down backend...")
     await data_streamer.stop_websocket()
+    broadcaster.close_all()
+    compute_pool.close()
     logging.info("Backend shut down.")
 
+
 # --- Background data processing ---
+def latest_snapshot(stream: MarketStream) -> Dict[str, Any]:
+    """
+    Returns the protocol snapshot for a stream, or {} until its indicators are warmed up.
+    """
+    if not stream.ohlcv_history or not stream.indicator_engine.ready:
+        return {}
+
+    # Indicators are updated incrementally by the stream as each bar arrives;
+    # use calculate_technical_indicators(stream.get_ohlcv_dataframe()) for the full frame.
+    # Heavier analytics (extra indicators, ML predictions) come from the compute pool.
+
+    seq = stream_sequences.get(stream.key, 0)
+    snapshot = snapshot_cache.get(stream.key)
+    if snapshot is None or snapshot["seq"] != seq:
+        snapshot = build_snapshot(stream, seq)
+        snapshot_cache[stream.key] = snapshot
+    snapshot["latest_price"] = stream.current_price
+    snapshot["partial_bar"] = format_partial_bar(stream)
+    snapshot["analytics"] = format_analytics(stream)
+    return snapshot
+
+
+def publish_partial(stream: MarketStream):
+    """
+    Broadcasts a stream's in-progress bar with provisional indicators, if it still has one.
+    """
+    partial_pending.discard(stream.key)
+    received_at = partial_received_at.pop(stream.key, None)
+    if stream.partial_bar is None or not stream.indicator_engine.ready:
+        return
+    partial_sent_at[stream.key] = time.monotonic()
+    broadcaster.publish(stream.key, build_partial(stream, stream_sequences.get(stream.key, 0)), received_at)
+
+
+def schedule_partial(stream: MarketStream, received_at: float):
+    """
+    Sends the in-progress bar now, or once PARTIAL_BAR_THROTTLE has passed since the last one;
+    ticks arriving meanwhile are folded into that single message.
+    """
+    partial_received_at.setdefault(stream.key, received_at)
+    if stream.key in partial_pending:
+        return
+    wait = partial_sent_at.get(stream.key, float('-inf')) + PARTIAL_BAR_THROTTLE - time.monotonic()
+    if wait <= 0:
+        publish_partial(stream)
+    else:
+        partial_pending.add(stream.key)
+        asyncio.get_running_loop().call_later(wait, publish_partial, stream)
+
+
 async def data_processing_loop():
-    last_timestamp = None
-    while True:
-        ohlcv = data_streamer.ohlcv_history
-        if ohlcv:
-            latest_bar = ohlcv[-1]
-            if latest_bar['timestamp'] != last_timestamp:
-                df = data_streamer.get_ohlcv_dataframe()
-                df_with_indicators = calculate_technical_indicators(df.copy())
-
-                # --- ML Hook: placeholder for predictions ---
-                # predictions = generate_predictions(df_with_indicators)
-
-                if not df_with_indicators.empty:
-                    latest_data = df_with_indicators.iloc[-1].dropna().to_dict()
-                    global global_latest_data
-                    global_latest_data = {
-                        "latest_price": data_streamer.current_price,
-                        "indicators": latest_data,
-                        # "predictions": predictions,  # Will integrate ML later
-                        "ohlcv": list(ohlcv)[-50:],
-                        "timestamp": latest_bar['timestamp']
-                    }
-
-                    message = json.dumps(global_latest_data, default=str)
-                    for client in list(connected_clients):
-                        try:
-                            await client.send_text(message)
-                        except:
-                            connected_clients.remove(client)
-
-                last_timestamp = latest_bar['timestamp']
-        await asyncio.sleep(0.5)
+    """
+    Waits on the streamer's notifications and broadcasts as soon as a new bar is stored.
+    A new (or corrected newest) bar goes out as a small update delta; a reloaded history, a correction
+    further back, or several bars landing before the loop ran go out as a fresh snapshot.
+    In-progress bars (from ticks, or resampled for derived timeframes) go out as throttled 'partial' messages.
+    Each published bar also schedules the stream's compute-pool job, whose result follows as 'analytics'.
+    """
+    updates = data_streamer.subscribe()
+    try:
+        while True:
+            notification = await updates.get()
+            BAR_DISPATCH_DELAY.observe(time.perf_counter() - notification.received_at)
+
+            if notification.kind == 'price':
+                continue  # picked up by the next snapshot/update
+
+            stream = data_streamer.get_stream(notification.symbol, notification.interval)
+            if notification.kind == 'partial':
+                if stream is not None:
+                    schedule_partial(stream, notification.received_at)
+                continue
+            if notification.kind == 'analytics':
+                if stream is not None:
+                    broadcaster.publish(stream.key, build_analytics(stream, stream_sequences.get(stream.key, 0)))
+                continue
+
+            if stream is not None:
+                publish_bars(stream, notification)
+    finally:
+        data_streamer.unsubscribe(updates)
+
+
+def publish_bars(stream: MarketStream, notification):
+    """
+    Sends a stream's stored bars to its subscribers as an update delta, or as a snapshot when a delta
+    would not cover everything that changed since the last publish.
+    """
+    if notification.kind == 'bar' and notification.timestamp != stream.ohlcv_history.last_timestamp:
+        return  # a newer bar is already queued behind this one
+    published = published_bars.get(stream.key)
+    if not stream.indicator_engine.ready or (published is not None and published[0] == stream.bar_version):
+        return
+    published_bars[stream.key] = (stream.bar_version, stream.ohlcv_history.last_timestamp)
+
+    seq = stream_sequences.get(stream.key, 0) + 1
+    stream_sequences[stream.key] = seq
+    covered = published is None or update_covers(stream, *published)
+    if notification.kind in ('history', 'correction') or not covered:
+        message = latest_snapshot(stream)
+    else:
+        message = build_update(stream, seq)
+
+    broadcaster.publish(stream.key, message, notification.received_at)
+    compute_pool.submit(stream)
+
+
+def resolve_stream(symbol: Optional[str], interval: Optional[str]) -> Optional[MarketStream]:
+    """
+    Looks up the stream for request parameters, defaulting to the first configured symbol/interval.
+    """
+    return data_streamer.get_stream(symbol or data_streamer.symbols[0], interval)
+
 
 # --- REST endpoints ---
 @app.get("/")
 async def root():
     return {"message": "Tradinglight AI-Ready Backend running!"}
 
+
+@app.get("/stats")
+async def get_stats():
+    return histogram_snapshots()
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/symbols")
+async def get_symbols():
+    return {
+        "symbols": data_streamer.symbols,
+        "intervals": data_streamer.intervals + data_streamer.derived_intervals,
+        "derived_intervals": data_streamer.derived_intervals,
+    }
+
+
 @app.get("/latest_data")
-async def get_latest():
-    return JSONResponse(content=global_latest_data)
+async def get_latest(request: Request, symbol: Optional[str] = None, interval: Optional[str] = None,
+                     format: Optional[str] = None):
+    stream = resolve_stream(symbol, interval)
+    if stream is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown stream {symbol} ({interval})"})
+    encoding = negotiate(format, request.headers.get("accept"))
+    if encoding is None:
+        return JSONResponse(status_code=406,
+                            content={"error": f"Unsupported format {format}", "available": available_encodings()})
+    version = (stream.revision, stream_sequences.get(stream.key, 0), encoding)
+    entry = latest_data_cache.get(
+        (stream.key, encoding), version, stream.updated_at, MEDIA_TYPES[encoding],
+        lambda: encode(latest_snapshot(stream), encoding)
+    )
+    return latest_data_cache.respond(request, entry)
+
+
+@app.get("/history")
+async def get_history(symbol: Optional[str] = None, interval: Optional[str] = None, start: Optional[str] = None,
+                      end: Optional[str] = None, limit: int = HISTORY_DEFAULT_LIMIT, cursor: Optional[str] = None,
+                      indicators: Optional[str] = None):
+    """
+    Bars with start <= timestamp <= end (ISO-8601 or epoch seconds, UTC), oldest first, streamed as JSON.
+    Pass the returned next_cursor back as `cursor` (with the same end/limit) to get the following page.
+    `indicators` (comma-separated, e.g. "RSI,EMA_200,BB_UPPER_20") adds those indicators to each bar,
+    computed over the stream's full history and served from the indicator cache.
+    """
+    stream = resolve_stream(symbol, interval)
+    if stream is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown stream {symbol} ({interval})"})
+    if not 1 <= limit <= HISTORY_MAX_LIMIT:
+        return JSONResponse(status_code=400, content={"error": f"limit must be between 1 and {HISTORY_MAX_LIMIT}"})
+    try:
+        start_ts = to_epoch_seconds(start) if start else None
+        end_ts = to_epoch_seconds(end) if end else None
+        if cursor is not None:
+            int(cursor)
+    except ValueError:
+        return JSONResponse(status_code=400, content={
+            "error": "start/end must be ISO-8601 or epoch seconds, and cursor a value returned by /history"
+        })
+
+    names = [name.strip() for name in indicators.split(',') if name.strip()] if indicators else []
+    try:
+        build_plan(names)  # also checks the indicators each one is built from
+    except KeyError as exc:
+        return JSONResponse(status_code=400, content={"error": str(exc.args[0])})
+
+    page = query_history(stream, start_ts, end_ts, limit, cursor)
+    if names and len(page):
+        page.indicators = await asyncio.to_thread(indicator_cache.values_at, stream, names, page.timestamps)
+    return StreamingResponse(iter_history_json(page), media_type=MEDIA_TYPES["json"])
+
+
+@app.get("/downsample")
+async def get_downsampled(symbol: Optional[str] = None, interval: Optional[str] = None, start: Optional[str] = None,
+                          end: Optional[str] = None, points: int = DOWNSAMPLE_DEFAULT_POINTS, method: str = "ohlc"):
+    """
+    A time range reduced to at most `points` chart points: aggregated candles ('ohlc') or an LTTB close line ('lttb').
+    """
+    stream = resolve_stream(symbol, interval)
+    if stream is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown stream {symbol} ({interval})"})
+    if method not in DOWNSAMPLE_METHODS:
+        return JSONResponse(status_code=400, content={"error": f"method must be one of {', '.join(DOWNSAMPLE_METHODS)}"})
+    if not 3 <= points <= DOWNSAMPLE_MAX_POINTS:
+        return JSONResponse(status_code=400, content={"error": f"points must be between 3 and {DOWNSAMPLE_MAX_POINTS}"})
+    try:
+        start_ts = to_epoch_seconds(start) if start else None
+        end_ts = to_epoch_seconds(end) if end else None
+    except ValueError:
+        return JSONResponse(status_code=400, content={"error": "start/end must be ISO-8601 or epoch seconds"})
+
+    # Level building touches the whole history, so keep it off the event loop.
+    downsample = downsampler.ohlc if method == "ohlc" else downsampler.lttb
+    result = await asyncio.to_thread(downsample, stream, start_ts, end_ts, points)
+    return {"symbol": stream.symbol, "interval": stream.interval, "method": method, **result}
+
 
 # --- WebSocket endpoint ---
+def parse_indicator_filter(value: Any) -> Tuple[Optional[FrozenSet[str]], Optional[str]]:
+    """
+    Reads an indicator subset given as a list or comma-separated string. Returns (subset or None for all, error).
+    """
+    if value is None:
+        return None, None
+    names = value.split(",") if isinstance(value, str) else value
+    if not isinstance(names, list):
+        return None, "indicators must be a list of names"
+    subset = frozenset(str(name).strip() for name in names if str(name).strip())
+    unknown = subset.difference(INDICATOR_NAMES, COMPUTE_INDICATORS)
+    if unknown:
+        return None, f"unknown indicators: {', '.join(sorted(unknown))}"
+    return subset, None
+
+
+def streams_for_request(request: Dict[str, Any]) -> Tuple[List[MarketStream], Optional[str]]:
+    """
+    Resolves the streams named by a subscribe/unsubscribe/resync message: every combination of its
+    'symbols' and 'intervals' (a name or a list; omitted means all configured ones).
+    """
+    selection = []
+    for field, configured in (("symbols", data_streamer.symbols),
+                              ("intervals", data_streamer.intervals + data_streamer.derived_intervals)):
+        value = request.get(field, request.get(field[:-1]))
+        if value is None:
+            selection.append(configured)
+            continue
+        names = [value] if isinstance(value, str) else value
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            return [], f"{field} must be a name or a list of names"
+        unknown = set(names).difference(configured)
+        if unknown:
+            return [], f"unknown {field}: {', '.join(sorted(unknown))}"
+        selection.append(names)
+    symbols, intervals = selection
+    return [data_streamer.get_stream(symbol, interval) for symbol in symbols for interval in intervals], None
+
+
+def handle_client_message(session: ClientSession, request: Any):
+    """
+    Applies a client control message:
+      {"type": "subscribe", "symbols": [...], "intervals": [...], "indicators": [...]}
+      {"type": "unsubscribe", "symbols": [...], "intervals": [...]}
+      {"type": "resync", "symbols": [...], "intervals": [...]}   (omitted fields: every subscribed topic)
+    """
+    if not isinstance(request, dict):
+        return
+    kind = request.get("type")
+    if kind not in ("subscribe", "unsubscribe", "resync"):
+        session.send(build_error(f"unknown message type: {kind!r}"))
+        return
+
+    streams, error = streams_for_request(request)
+    if error:
+        session.send(build_error(error))
+        return
+
+    if kind == "subscribe":
+        subscribe_client(session, streams, request.get("indicators"))
+    elif kind == "unsubscribe":
+        removed = [stream for stream in streams if broadcaster.unsubscribe(session, stream.key)]
+        session.send(build_ack("unsubscribed", removed))
+    else:
+        # Clients that detect a gap in update sequence numbers can ask for a fresh snapshot.
+        for stream in streams:
+            if stream.key in session.subscriptions:
+                snapshot = latest_snapshot(stream)
+                if snapshot:
+                    session.send_snapshot(stream.key, trim_payload(snapshot, session.subscriptions[stream.key]))
+
+
+def subscribe_client(session: ClientSession, streams: List[MarketStream], indicators: Any):
+    """
+    Subscribes a client to the given streams, each starting with its latest snapshot.
+    """
+    indicator_filter, error = parse_indicator_filter(indicators)
+    if error:
+        session.send(build_error(error))
+        return
+    session.send(build_ack("subscribed", streams, indicator_filter))
+    for stream in streams:
+        broadcaster.subscribe(session, stream.key, indicator_filter, latest_snapshot(stream))
+
+
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await websocket.accept()
-    connected_clients.append(websocket)
-    logging.info(f"Client connected: {len(connected_clients)} total")
+async def websocket_endpoint(websocket: WebSocket, symbol: Optional[str] = None, interval: Optional[str] = None,
+                             format: Optional[str] = None, indicators: Optional[str] = None):
+    """
+    Streams one (symbol, interval) topic from the query parameters to start with; the client can
+    then subscribe to / unsubscribe from more topics and narrow the indicators it receives.
+    """
+    stream = resolve_stream(symbol, interval)
+    encoding = negotiate(format)
+    indicator_filter, error = parse_indicator_filter(indicators)
+    if stream is None or encoding is None or error:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
 
-    if global_latest_data:
-        await websocket.send_text(json.dumps(global_latest_data, default=str))
+    await websocket.accept()
+    session = broadcaster.register(websocket, stream.key, encoding, latest_snapshot(stream), indicator_filter)
+    logging.info(f"Client connected to {stream.symbol} ({stream.interval}): {len(broadcaster)} total")
 
     try:
         while True:
-            await websocket.receive_text()  # keep connection alive
+            message = await websocket.receive_text()
+            try:
+                request = json.loads(message)
+            except ValueError:
+                session.send(build_error("messages must be JSON"))
+                continue
+            handle_client_message(session, request)
     except WebSocketDisconnect:
-        connected_clients.remove(websocket)
-        logging.info(f"Client disconnected: {len(connected_clients)} total")
+        pass
+    finally:
+        broadcaster.unregister(session)
+        logging.info(f"Client disconnected: {len(broadcaster)} total")
@@ -1,108 +1,578 @@
 # your_trading_dashboard/market_data.py
 
+import numpy as np
 import pandas as pd
 from twelvedata import TDClient
-from collections import deque
 import asyncio
 import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
 
-from config import TWELVEDATA_API_KEY, SYMBOL, INTERVAL, OHLCV_HISTORY_SIZE
+from config import BOOTSTRAP_CONCURRENCY
+from bar_store import BarStore
+from feeds import EventRecorder, FeedSource, TwelvedataFeed
+from history import query_history
+from metrics import BARS_PROCESSED, INDICATOR_COMPUTE_TIME, TICK_BARS_RECONCILED, UPSTREAM_EVENT_LAG
+from resampler import BarResampler
+from ring_buffer import OHLCV_COLUMNS, OHLCVRingBuffer, to_epoch_seconds
+from streaming_indicators import IndicatorEngine
+from tick_aggregator import TickAggregator
+from timeframes import interval_seconds
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-class MarketDataStreamer:
-    def __init__(self, symbol: str, interval: str, api_key: str, history_size: int):
+# Indicator state is checkpointed every this many bars, bounding how far a late bar has to replay.
+CHECKPOINT_EVERY_BARS = 32
+
+
+@dataclass
+class StreamNotification:
+    """
+    Published to subscribers whenever a new or corrected newest bar ('bar'), a corrected older bar ('correction'),
+    price tick ('price'), in-progress bar ('partial') or a freshly loaded history ('history') is stored,
+    and in API workers when the ingest process's compute pool sends a stream's analytics ('analytics').
+    """
+    kind: str
+    symbol: str
+    interval: Optional[str] = None
+    timestamp: Optional[int] = None
+    # perf_counter() when the event behind it reached the streamer (or when it was published).
+    received_at: float = field(default_factory=time.perf_counter)
+
+
+def time_series_to_arrays(values: List[Dict]) -> Tuple[np.ndarray, ...]:
+    """
+    Converts Twelvedata time_series 'values' (newest first, string fields) into oldest-first
+    (timestamps, open, high, low, close, volume) arrays with one table-wide conversion.
+    """
+    price_cols = ['open', 'high', 'low', 'close']
+    has_volume = bool(values) and 'volume' in values[0]
+    table = pd.DataFrame.from_records(values, columns=['datetime'] + price_cols + (['volume'] if has_volume else []))
+
+    timestamps = table['datetime'].to_numpy().astype('datetime64[s]').astype(np.int64)
+    prices = table[price_cols + (['volume'] if has_volume else [])].to_numpy().astype(np.float64).T
+    volumes = prices[4] if has_volume else np.zeros(len(table), dtype=np.float64)
+
+    order = np.argsort(timestamps, kind='stable')
+    return (timestamps[order], prices[0][order], prices[1][order], prices[2][order], prices[3][order], volumes[order])
+
+
+class MarketStream:
+    """
+    History buffer and indicator state for one (symbol, interval) stream.
+    Upstream streams build their in-progress bar from price ticks; derived streams carry the
+    resampler that builds their bars from a lower-timeframe stream.
+    """
+    def __init__(self, symbol: str, interval: str, history_size: int, store: Optional[BarStore] = None,
+                 resampler: Optional[BarResampler] = None):
         self.symbol = symbol
         self.interval = interval
+        self.ohlcv_history = OHLCVRingBuffer(history_size)
+        self.current_price = None
+        self.store = store
+        self.resampler = resampler
+        self.tick_aggregator = TickAggregator(interval) if resampler is None else None
+
+        self.indicator_engine = IndicatorEngine()
+        self.latest_indicators = {}
+        # Latest compute-pool result (extra indicators, predictions, bar timestamp), if any.
+        self.analytics: Optional[Dict] = None
+        # Engine state before the newest bar (rewinds a correction of it in O(1)), and periodic
+        # (timestamp, state-before-that-bar) checkpoints for late bars further back.
+        self._pre_latest: Optional[Tuple] = None
+        self._checkpoints: Deque[Tuple[int, Tuple]] = deque(maxlen=history_size // CHECKPOINT_EVERY_BARS + 2)
+        self._checkpoint_spacing = CHECKPOINT_EVERY_BARS * interval_seconds(interval)
+
+        # Bumped on every change a client could see (bar, price, partial bar), so responses can be cached per revision.
+        self.revision = 0
+        # Bumped only when the stored bars change (new, corrected or reloaded).
+        self.bar_version = 0
+        # (bar_version, earliest timestamp changed) for every change other than an append, so data derived
+        # from older bars can be kept; timestamp 0 means everything may have changed (a reload).
+        self._bar_edits: Deque[Tuple[int, int]] = deque(maxlen=64)
+        self._bar_edits_floor = 0
+        self.updated_at = time.time()
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.symbol, self.interval)
+
+    @property
+    def partial_bar(self) -> Optional[Dict]:
+        """
+        The still-forming bar (epoch-second timestamp): tick-built for upstream streams,
+        resampled for derived ones. None between bars.
+        """
+        if self.resampler is not None:
+            return self.resampler.partial
+        return self.tick_aggregator.partial
+
+    def touch(self, bars_changed: bool = False):
+        self.revision += 1
+        self.updated_at = time.time()
+        if bars_changed:
+            self.bar_version += 1
+
+    def _record_edit(self, timestamp: int):
+        """
+        Records a non-append change under the bar_version the following touch() will set. Called
+        after the bars are written and before that touch, so a worker thread that reads the new
+        version always finds the edit (and the changed bars).
+        """
+        if len(self._bar_edits) == self._bar_edits.maxlen:
+            self._bar_edits_floor = self._bar_edits[0][0]
+        self._bar_edits.append((self.bar_version + 1, timestamp))
+
+    def rewritten_since(self, bar_version: int) -> Optional[int]:
+        """
+        The earliest bar timestamp changed by anything but an append after `bar_version`
+        (0 if that is unknown), or None when bars have only been appended since.
+        """
+        if bar_version < self._bar_edits_floor:
+            return 0
+        # list() copies the deque atomically; the indicator cache calls this from worker threads.
+        changed = [timestamp for version, timestamp in list(self._bar_edits) if version > bar_version]
+        return min(changed) if changed else None
+
+    def upsert_bar(self, bar: Dict) -> str:
+        """
+        Stores a bar by its timestamp and brings the indicators up to date. Returns the buffer's
+        upsert kind: 'append', 'replace', 'insert', or 'duplicate'/'stale' (nothing changed).
+
+        A new bar costs one O(1) engine update and a corrected newest bar rewinds one bar; a late or
+        corrected older bar replays only from the nearest checkpoint before it.
+        """
+        timestamp = to_epoch_seconds(bar['timestamp'])
+        kind, position = self.ohlcv_history.upsert_bar(bar)
+        if kind in ('duplicate', 'stale'):
+            return kind
+
+        if self.store is not None:
+            self.store.upsert(timestamp, bar['open'], bar['high'], bar['low'], bar['close'], bar.get('volume', 0.0) or 0.0)
+        if kind != 'append':
+            self._record_edit(timestamp)
+        self.touch(bars_changed=True)
+        started = time.perf_counter()
+        if kind == 'append':
+            self._apply(timestamp, bar)
+        elif position == len(self.ohlcv_history) - 1 and self._pre_latest is not None:
+            self.indicator_engine.restore(self._pre_latest)
+            self.latest_indicators = self.indicator_engine.update(bar)
+        else:
+            self._replay_from(timestamp)
+        INDICATOR_COMPUTE_TIME.observe(time.perf_counter() - started)
+
+        if kind != 'replace':
+            BARS_PROCESSED.inc(self.symbol, self.interval)
+        return kind
+
+    def _apply(self, timestamp: int, bar: Dict, newest: bool = True):
+        """
+        Feeds one bar to the indicator engine, keeping the state from just before it when it is the
+        newest bar or due for a checkpoint.
+        """
+        state = self._feed(self.indicator_engine, self._checkpoints, timestamp, bar, newest)
+        if newest:
+            self._pre_latest = state
+        self.latest_indicators = self.indicator_engine.latest
+
+    def _feed(self, engine: IndicatorEngine, checkpoints: Deque[Tuple[int, Tuple]], timestamp: int, bar: Dict,
+              newest: bool) -> Optional[Tuple]:
+        """
+        Feeds one bar to `engine`, appending a checkpoint when one is due. Returns the state from just
+        before the bar when it is the newest one.
+        """
+        checkpoint = not checkpoints or timestamp - checkpoints[-1][0] >= self._checkpoint_spacing
+        state = engine.snapshot() if newest or checkpoint else None
+        if checkpoint:
+            checkpoints.append((timestamp, state))
+        engine.update(bar)
+        return state if newest else None
+
+    def _replay_bars(self, engine: IndicatorEngine, checkpoints: Deque[Tuple[int, Tuple]], timestamps: np.ndarray,
+                     highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> Optional[Tuple]:
+        """
+        Feeds oldest-first bars to `engine`. Touches only the engine and checkpoints passed in, so it
+        can run in a worker thread. Returns the state from just before the last bar.
+        """
+        pre_latest = None
+        last = len(timestamps) - 1
+        rows = zip(timestamps.tolist(), highs.tolist(), lows.tolist(), closes.tolist())
+        for i, (bar_timestamp, high, low, close) in enumerate(rows):
+            state = self._feed(engine, checkpoints, bar_timestamp, {'high': high, 'low': low, 'close': close}, i == last)
+            if i == last:
+                pre_latest = state
+        return pre_latest
+
+    def _replay_from(self, timestamp: Optional[int]):
+        """
+        Rewinds the indicator engine to the newest checkpoint at or before `timestamp` and replays the
+        buffered bars from there. With no usable checkpoint (or timestamp None) it rebuilds from scratch.
+        """
+        checkpoints = self._checkpoints
+        while checkpoints and (timestamp is None or checkpoints[-1][0] > timestamp):
+            checkpoints.pop()
+
+        history = self.ohlcv_history
+        start = 0
+        if checkpoints and history and checkpoints[-1][0] >= history.timestamps[0]:
+            checkpoint_timestamp, state = checkpoints[-1]
+            start = history.index_range(checkpoint_timestamp)[0]
+            self.indicator_engine.restore(state)
+        else:
+            checkpoints.clear()
+            self.indicator_engine = IndicatorEngine()
+
+        pre_latest = self._replay_bars(self.indicator_engine, checkpoints, history.timestamps[start:],
+                                       history.column('high')[start:], history.column('low')[start:],
+                                       history.column('close')[start:])
+        if pre_latest is not None:
+            self._pre_latest = pre_latest
+        self.latest_indicators = self.indicator_engine.latest
+
+    def load_from_store(self) -> int:
+        """
+        Refills the history buffer from the newest bars in the on-disk store. Returns the number of bars loaded.
+        """
+        self.ohlcv_history.clear()
+        if self.store is not None and len(self.store):
+            stored = self.store.tail(self.ohlcv_history.maxlen)
+            self.ohlcv_history.extend(
+                stored['timestamp'], stored['open'], stored['high'], stored['low'], stored['close'], stored['volume']
+            )
+        self._record_edit(0)
+        self.touch(bars_changed=True)
+        return len(self.ohlcv_history)
+
+    def add_history(self, timestamps: np.ndarray, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                    closes: np.ndarray, volumes: np.ndarray, now: Optional[int] = None):
+        """
+        Appends fetched oldest-first bars newer than the buffer's last bar and persists the completed ones.
+        The still-forming bar (if any) is kept in memory only.
+        """
+        self.touch(bars_changed=True)
+        last_timestamp = self.ohlcv_history.last_timestamp
+        if last_timestamp is not None:
+            newer = timestamps > last_timestamp
+            timestamps, opens, highs, lows, closes, volumes = (
+                col[newer] for col in (timestamps, opens, highs, lows, closes, volumes)
+            )
+        self.ohlcv_history.extend(timestamps, opens, highs, lows, closes, volumes)
+
+        if self.store is not None and timestamps.size:
+            now = int(time.time()) if now is None else now
+            completed = timestamps + interval_seconds(self.interval) <= now
+            self.store.extend(
+                *(col[completed] for col in (timestamps, opens, highs, lows, closes, volumes))
+            )
+
+    async def seed_indicator_engine(self):
+        """
+        Rebuilds the streaming indicator state from the bars currently in history. The replay is pure
+        Python (most of a second for 100k bars), so it runs in a worker thread over a copy of the bars
+        with a fresh engine, which is swapped in on the loop; bars that changed meanwhile mean a rerun.
+        """
+        history = self.ohlcv_history
+        while True:
+            bar_version = self.bar_version
+            columns = (history.timestamps.copy(),) + tuple(history.column(name).copy() for name in ('high', 'low', 'close'))
+            engine = IndicatorEngine()
+            checkpoints: Deque[Tuple[int, Tuple]] = deque(maxlen=self._checkpoints.maxlen)
+            pre_latest = await asyncio.to_thread(self._replay_bars, engine, checkpoints, *columns)
+            if self.bar_version == bar_version:
+                break
+        self.indicator_engine = engine
+        self._checkpoints = checkpoints
+        self._pre_latest = pre_latest
+        self.latest_indicators = engine.latest
+
+    def get_ohlcv_dataframe(self) -> pd.DataFrame:
+        """
+        Builds a Pandas DataFrame from the columnar OHLCV history.
+        """
+        if not self.ohlcv_history:
+            return pd.DataFrame()
+
+        return self.ohlcv_history.to_dataframe()
+
+
+class MarketDataStreamer:
+    """
+    Manages many (symbol, interval) streams over a single Twelvedata websocket connection.
+
+    `derived_intervals` are resampled locally from each symbol's first (base) interval as its bars
+    arrive, so they need no upstream subscription or REST history of their own.
+
+    In the multi-worker deployment the ingest process passes an `event_bus`, which re-publishes every
+    handled event; API workers follow it with a BusFeed and open the bar stores `read_only_store`.
+    """
+    def __init__(self, symbols: List[str], intervals: List[str], api_key: str, history_size: int,
+                 store_dir: Optional[str] = None, feed: Optional[FeedSource] = None,
+                 record_events_path: Optional[str] = None, derived_intervals: Optional[List[str]] = None,
+                 event_bus=None, read_only_store: bool = False):
+        self.symbols = list(symbols)
+        self.intervals = list(intervals)
+        self.derived_intervals = [interval for interval in derived_intervals or [] if interval not in self.intervals]
         self.td = TDClient(apikey=api_key)
-        
-        self.ohlcv_history = deque(maxlen=history_size)
-        self.current_price = None 
+        self.event_bus = event_bus
+        self.read_only_store = read_only_store
+
+        self.streams: Dict[Tuple[str, str], MarketStream] = {}
+        self._streams_by_symbol: Dict[str, List[MarketStream]] = {}
+        self._derived_streams: Dict[Tuple[str, str], List[MarketStream]] = {}
+        for symbol in self.symbols:
+            for interval in self.intervals:
+                self._add_stream(symbol, interval, history_size, store_dir)
+            base = self.streams[(symbol, self.intervals[0])]
+            for interval in self.derived_intervals:
+                resampler = BarResampler(base.interval, interval)
+                stream = self._add_stream(symbol, interval, history_size, store_dir, resampler)
+                self._derived_streams.setdefault(base.key, []).append(stream)
 
-        self._ws_connection = None 
+        self._subscribers: List[asyncio.Queue] = []
+        self._event_received_at: Optional[float] = None
+
+        self.feed = feed or TwelvedataFeed(self.td, self.symbols, self.intervals)
+        self.record_events_path = record_events_path
+        self._recorder: Optional[EventRecorder] = None
+
+    def _add_stream(self, symbol: str, interval: str, history_size: int, store_dir: Optional[str],
+                    resampler: Optional[BarResampler] = None) -> MarketStream:
+        store = BarStore(store_dir, symbol, interval, self.read_only_store) if store_dir else None
+        stream = MarketStream(symbol, interval, history_size, store, resampler)
+        self.streams[stream.key] = stream
+        self._streams_by_symbol.setdefault(symbol, []).append(stream)
+        return stream
+
+    def get_stream(self, symbol: str, interval: Optional[str] = None) -> Optional[MarketStream]:
+        return self.streams.get((symbol, interval or self.intervals[0]))
+
+    def streams_for_symbol(self, symbol: str) -> List[MarketStream]:
+        return self._streams_by_symbol.get(symbol, [])
 
     async def fetch_initial_historical_data(self):
         """
-        Fetches initial historical OHLCV data using REST API.
+        Fetches initial historical OHLCV data for every upstream stream using the REST API.
+        Requests run in worker threads (at most BOOTSTRAP_CONCURRENCY at a time) so the event loop keeps serving clients.
+        Derived streams are resampled from their base stream's history once it is in.
         """
-        logging.info(f"Fetching initial {self.symbol} historical data ({self.interval})...")
+        semaphore = asyncio.Semaphore(BOOTSTRAP_CONCURRENCY)
+
+        async def fetch(stream: MarketStream):
+            async with semaphore:
+                return await self._fetch_stream_history(stream)
+
+        upstream = [stream for stream in self.streams.values() if stream.resampler is None]
+        results = await asyncio.gather(*(fetch(stream) for stream in upstream))
+        return all(results)
+
+    async def _fetch_stream_history(self, stream: MarketStream):
+        history = stream.ohlcv_history
+        outputsize = history.maxlen
+        if stream.load_from_store():
+            # Warm restart: only backfill the bars missed since the last stored one.
+            now = int(time.time())
+            missing = (now - history.last_timestamp) // interval_seconds(stream.interval) - 1
+            if missing <= 0:
+                return await self._history_loaded(stream, "bar store")
+            outputsize = min(history.maxlen, missing + 1)
+        if self.feed.offline:
+            if not history:
+                logging.info(f"No stored history for {stream.symbol} ({stream.interval}); it will build up from the feed.")
+                return True
+            return await self._history_loaded(stream, "bar store")
+
+        logging.info(f"Fetching {outputsize} {stream.symbol} historical bars ({stream.interval})...")
         try:
-            ts_data = self.td.time_series(
-                symbol=self.symbol,
-                interval=self.interval,
-                outputsize=self.ohlcv_history.maxlen,
-                timezone="exchange"
-            ).as_json()
+            ts_data = await asyncio.to_thread(
+                lambda: self.td.time_series(
+                    symbol=stream.symbol,
+                    interval=stream.interval,
+                    outputsize=outputsize,
+                    timezone="UTC"
+                ).as_json()
+            )
 
             if not ts_data or 'values' not in ts_data:
-                logging.error("No initial historical data received or 'values' key missing.")
-                return False
+                logging.error(f"No initial historical data received for {stream.symbol} ({stream.interval}) "
+                              f"or 'values' key missing.")
+                if not history:
+                    return False
+                return await self._history_loaded(stream, "bar store")
 
-            df = pd.DataFrame(ts_data['values'])
-            df = df[['datetime', 'open', 'high', 'low', 'close', 'volume']]
-            numeric_cols = ['open', 'high', 'low', 'close', 'volume']
-            for col in numeric_cols:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            df['datetime'] = pd.to_datetime(df['datetime'])
-            df = df.set_index('datetime').sort_index()
-
-            for _, row in df.iterrows():
-                self.ohlcv_history.append({
-                    'timestamp': row.name.isoformat(),
-                    'open': row['open'],
-                    'high': row['high'],
-                    'low': row['low'],
-                    'close': row['close'],
-                    'volume': row['volume'] if 'volume' in row else 0
-                })
-            logging.info(f"Initial OHLCV history populated with {len(self.ohlcv_history)} bars.")
-            return True
+            stream.add_history(*time_series_to_arrays(ts_data['values']))
+            return await self._history_loaded(stream, "REST backfill" if outputsize < history.maxlen else "REST")
 
         except Exception as e:
-            logging.error(f"Error fetching initial historical data: {e}")
-            return False
+            logging.error(f"Error fetching initial historical data for {stream.symbol} ({stream.interval}): {e}")
+            if not history:
+                return False
+            return await self._history_loaded(stream, "bar store")
 
-    def get_ohlcv_dataframe(self) -> pd.DataFrame:
+    async def _history_loaded(self, stream: MarketStream, source: str) -> bool:
+        await stream.seed_indicator_engine()
+        self._notify('history', stream.symbol, stream.interval, stream.ohlcv_history.last_timestamp)
+        logging.info(f"Initial {stream.symbol} ({stream.interval}) history populated with "
+                     f"{len(stream.ohlcv_history)} bars from {source}.")
+        for derived in self._derived_streams.get(stream.key, []):
+            await self._resample_history(stream, derived)
+        return True
+
+    async def _resample_history(self, base: MarketStream, derived: MarketStream):
         """
-        Converts the current OHLCV history (deque) into a Pandas DataFrame.
+        Builds a derived stream's history from its base stream's closed bars, preferring the deeper
+        on-disk store over the in-memory buffer. The trailing incomplete bucket becomes the partial bar.
         """
-        if not self.ohlcv_history:
-            return pd.DataFrame()
+        resampler = derived.resampler
+        derived.load_from_store()
+        if base.store is not None and len(base.store) > len(base.ohlcv_history):
+            ratio = resampler.target_seconds // resampler.base_seconds
+            stored = base.store.tail(derived.ohlcv_history.maxlen * ratio)
+            columns = tuple(np.asarray(stored[name]) for name in ('timestamp', 'open', 'high', 'low', 'close', 'volume'))
+        else:
+            columns = (base.ohlcv_history.timestamps,) + tuple(
+                base.ohlcv_history.column(name) for name in ('open', 'high', 'low', 'close', 'volume')
+            )
+
+        now = int(time.time())
+        closed = columns[0] + resampler.base_seconds <= now
+        derived.add_history(*resampler.seed(*(column[closed] for column in columns)), now=now)
+        await self._history_loaded(derived, f"{base.interval} resample")
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Returns a queue that receives a StreamNotification for every new bar and price tick.
+        """
+        queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def _notify(self, kind: str, symbol: str, interval: Optional[str] = None, timestamp: Optional[int] = None):
+        notification = StreamNotification(kind, symbol, interval, timestamp)
+        if self._event_received_at is not None:
+            notification.received_at = self._event_received_at
+        for queue in self._subscribers:
+            queue.put_nowait(notification)
+
+    def _on_price(self, event):
+        """
+        Handles a price tick: updates each stream's current price and tick-built partial bar.
+        """
+        timestamp = to_epoch_seconds(event['timestamp'])
+        UPSTREAM_EVENT_LAG.observe(time.time() - timestamp)
+        symbol = event['symbol']
+        price = float(event['price'])
+        current_price = {
+            'symbol': symbol,
+            'price': price,
+            'timestamp': event['timestamp']
+        }
+        for stream in self.streams_for_symbol(symbol):
+            stream.current_price = current_price
+            stream.touch()
+            if stream.tick_aggregator is not None:
+                partial = stream.tick_aggregator.update(price, timestamp)
+                if partial is not None:
+                    self._notify('partial', symbol, stream.interval, partial['timestamp'])
+        self._notify('price', symbol)
+
+    def _on_ohlc(self, event):
+        """
+        Handles a completed OHLC bar: stores it, reconciles ticks and advances derived timeframes.
+        """
+        stream = self.get_stream(event.get('symbol'), event.get('interval'))
+        if stream is None:
+            logging.debug(f"Ignoring OHLC bar for unmanaged stream: {event}")
+            return
+        ohlc_data = {
+            'timestamp': to_epoch_seconds(event['timestamp']),
+            'open': float(event['open']),
+            'high': float(event['high']),
+            'low': float(event['low']),
+            'close': float(event['close']),
+            'volume': float(event['volume']) if 'volume' in event else 0
+        }
+        UPSTREAM_EVENT_LAG.observe(time.time() - ohlc_data['timestamp'] - interval_seconds(stream.interval))
+        self._reconcile_ticks(stream, ohlc_data)
+        kind = stream.upsert_bar(ohlc_data)
+        if kind in ('duplicate', 'stale'):
+            logging.debug(f"Ignoring {kind} OHLC bar for {stream.symbol} ({stream.interval}): {event}")
+            return
+        # A new or corrected newest bar goes out as an update; a change further back needs a snapshot.
+        latest = ohlc_data['timestamp'] == stream.ohlcv_history.last_timestamp
+        self._notify('bar' if latest else 'correction', stream.symbol, stream.interval, ohlc_data['timestamp'])
+        if kind != 'append':
+            logging.info(f"Corrected OHLC bar ({kind}) for {stream.symbol} ({stream.interval}) "
+                         f"at {ohlc_data['timestamp']}")
+            self._rebuild_derived(stream, ohlc_data['timestamp'])
+            return
+        logging.info(f"New OHLC bar received for {stream.symbol} ({stream.interval}): Close={ohlc_data['close']}")
+
+        for derived in self._derived_streams.get(stream.key, []):
+            derived.touch()
+            for bar in derived.resampler.update(ohlc_data):
+                derived.upsert_bar(bar)
+                self._notify('bar', derived.symbol, derived.interval, bar['timestamp'])
+            if derived.partial_bar is not None:
+                self._notify('partial', derived.symbol, derived.interval, derived.partial_bar['timestamp'])
 
-        df = pd.DataFrame(list(self.ohlcv_history))
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.set_index('timestamp').sort_index()
-        
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        return df
+    def _rebuild_derived(self, base: MarketStream, timestamp: int):
+        """
+        Re-aggregates the derived bars whose bucket holds a corrected or late base bar from the base
+        stream's stored bars, and stores them like any other corrected bar.
+        """
+        for derived in self._derived_streams.get(base.key, []):
+            resampler = derived.resampler
+            bucket = timestamp - timestamp % resampler.target_seconds
+            page = query_history(base, bucket, bucket + resampler.target_seconds - 1,
+                                 limit=resampler.target_seconds // resampler.base_seconds)
+            bar = resampler.rebuild(page.timestamps, *(page.columns[name] for name in OHLCV_COLUMNS))
+            if bar is None:
+                derived.touch()
+                self._notify('partial', derived.symbol, derived.interval, bucket)
+                continue
+            kind = derived.upsert_bar(bar)
+            if kind in ('duplicate', 'stale'):
+                continue
+            latest = bucket == derived.ohlcv_history.last_timestamp
+            self._notify('bar' if latest else 'correction', derived.symbol, derived.interval, bucket)
 
     async def _on_event(self, event):
         """
         Internal callback function for Twelvedata WebSocket events.
         """
+        # Stamped on the notifications the event causes, so latency can be measured up to the client.
+        self._event_received_at = time.perf_counter()
+        try:
+            await self._handle_event(event)
+        finally:
+            self._event_received_at = None
+
+    async def _handle_event(self, event):
         if event['event'] == 'price':
-            self.current_price = {
-                'symbol': event['symbol'],
-                'price': float(event['price']),
-                'timestamp': event['timestamp']
-            }
+            self._on_price(event)
         elif event['event'] == 'ohlc':
-            ohlc_data = {
-                'timestamp': event['timestamp'],
-                'open': float(event['open']),
-                'high': float(event['high']),
-                'low': float(event['low']),
-                'close': float(event['close']),
-                'volume': float(event['volume']) if 'volume' in event else 0
-            }
-            self.ohlcv_history.append(ohlc_data)
-            logging.info(f"New OHLC bar received for {self.symbol} ({self.interval}): Close={ohlc_data['close']}")
+            self._on_ohlc(event)
+        elif event['event'] == 'analytics':
+            # From the ingest process's compute pool (API workers only).
+            stream = self.get_stream(event.get('symbol'), event.get('interval'))
+            if stream is not None:
+                stream.analytics = event['result']
+                stream.touch()
+                self._notify('analytics', stream.symbol, stream.interval, event['result'].get('timestamp'))
+
+        elif event['event'] == 'bus-resync':
+            # (Re)connected to the ingest process: catch up on bars stored while we were not listening.
+            await self.fetch_initial_historical_data()
 
         elif event['event'] == 'heartbeat':
-            pass 
+            pass
 
         elif event['event'] == 'subscribe-status':
             logging.info(f"WebSocket Subscription Status: {event}")
@@ -112,50 +582,38 @@ class MarketDataStreamer:
         else:
             logging.debug(f"Received other WebSocket event: {event}")
 
-    async def start_websocket(self):
+    @staticmethod
+    def _reconcile_ticks(stream: MarketStream, bar: Dict):
         """
-        Connects to the Twelvedata WebSocket for real-time streaming.
+        Checks the tick-built bar against the upstream one, which replaces it.
         """
-        if self._ws_connection:
-            await self.stop_websocket()
-
-        logging.info(f"Connecting to Twelvedata WebSocket for {self.symbol} ({self.interval})...")
-        try:
-            self._ws_connection = self.td.websocket(
-                symbols=[self.symbol],
-                on_event=self._on_event,
-                intervals=[self.interval]
-            )
-            await self._ws_connection.connect()
-            logging.info("Twelvedata WebSocket connected.")
-            asyncio.create_task(self._keep_websocket_alive())
-            return True
-        except Exception as e:
-            logging.error(f"Failed to connect to Twelvedata WebSocket: {e}")
-            self._ws_connection = None
-            return False
+        differences = stream.tick_aggregator.reconcile(bar)
+        if differences is None:
+            return
+        tolerance = abs(bar['close']) * 1e-9
+        if all(abs(diff) <= tolerance for diff in differences.values()):
+            TICK_BARS_RECONCILED.inc('match')
+        else:
+            TICK_BARS_RECONCILED.inc('diverged')
+            logging.debug(f"Tick-built {stream.symbol} ({stream.interval}) bar differs from upstream: {differences}")
 
-    async def _keep_websocket_alive(self):
+    async def start_websocket(self):
         """
-        Keeps the WebSocket connection alive by sending heartbeats.
+        Connects the feed (the Twelvedata WebSocket unless another source was given) for real-time streaming.
         """
-        if self._ws_connection:
-            try:
-                while self._ws_connection.is_connected():
-                    await self._ws_connection.keep_alive()
-                    await asyncio.sleep(5)
-            except Exception as e:
-                logging.error(f"WebSocket keep-alive error: {e}")
-            finally:
-                if self._ws_connection:
-                    logging.info("WebSocket keep-alive routine ending.")
+        on_event = self._on_event
+        if self.event_bus is not None:
+            on_event = self.event_bus.wrap(on_event)
+        if self.record_events_path:
+            self._recorder = EventRecorder(self.record_events_path, on_event)
+            on_event = self._recorder
+        return await self.feed.connect(on_event)
 
     async def stop_websocket(self):
         """
-        Disconnects the Twelvedata WebSocket.
+        Disconnects the feed.
         """
-        if self._ws_connection:
-            logging.info("Disconnecting Twelvedata WebSocket...")
-            await self._ws_connection.disconnect()
-            self._ws_connection = None
-            logging.info("Twelvedata WebSocket disconnected.")
\ No newline at end of file
+        await self.feed.disconnect()
+        if self._recorder:
+            self._recorder.close()
+            self._recorder = None
@@ -0,0 +1,210 @@
+# your_trading_dashboard/metrics.py
+
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+# Upper bounds in seconds, from 50us to 5s.
+DEFAULT_LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+# Upper bounds in seconds for network lag from the upstream feed, from 10ms to 2min.
+LAG_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(
+        f'{n}="' + str(v).replace('\\', '\\\\').replace('"', '\\"') + '"' for n, v in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram. observe() is a bisect plus two additions, cheap enough for the hot path.
+    """
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'max': self.max,
+            'buckets': {str(bound): n for bound, n in zip(self.buckets + ('+Inf',), self.counts)},
+        }
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        cumulative = 0
+        for bound, n in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += n
+            lines.append(f'{self.name}_bucket{{le="{_format_value(bound)}"}} {cumulative}')
+        lines.append(f'{self.name}_sum {_format_value(self.sum)}')
+        lines.append(f'{self.name}_count {self.count}')
+        return lines
+
+
+class Counter:
+    """
+    Monotonic counter, optionally split by label values (e.g. symbol, interval).
+    """
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {} if self.labelnames else {(): 0.0}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0):
+        self.values[labelvalues] = self.values.get(labelvalues, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        for labelvalues, value in self.values.items():
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}')
+        return lines
+
+
+class Gauge:
+    """
+    Gauge read from a callback at scrape time, so keeping it current costs nothing on the hot path.
+    The callback returns a number, or a dict of label-value tuples to numbers.
+    """
+    def __init__(self, name: str, documentation: str,
+                 read: Callable[[], Union[float, Dict[Tuple[str, ...], float]]], labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} gauge']
+        value = self.read()
+        if isinstance(value, dict):
+            for labelvalues, v in value.items():
+                lines.append(f'{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(v)}')
+        else:
+            lines.append(f'{self.name} {_format_value(value)}')
+        return lines
+
+
+REGISTRY: List[Union[Histogram, Counter, Gauge]] = []
+
+
+def histogram(name: str, documentation: str, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+    """
+    Creates a histogram and registers it for reporting.
+    """
+    metric = Histogram(name, documentation, buckets)
+    REGISTRY.append(metric)
+    return metric
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    metric = Counter(name, documentation, labelnames)
+    REGISTRY.append(metric)
+    return metric
+
+
+def gauge(name: str, documentation: str, read: Callable, labelnames: Sequence[str] = ()) -> Gauge:
+    metric = Gauge(name, documentation, read, labelnames)
+    REGISTRY.append(metric)
+    return metric
+
+
+def render_prometheus() -> str:
+    """
+    Renders every registered metric in the Prometheus text exposition format (0.0.4).
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def histogram_snapshots() -> Dict[str, Dict]:
+    return {metric.name: metric.snapshot() for metric in REGISTRY if isinstance(metric, Histogram)}
+
+
+# Time from a Twelvedata event being handled by the streamer to the processing loop picking it up.
+BAR_DISPATCH_DELAY = histogram(
+    'bar_dispatch_delay_seconds',
+    'Delay between a bar/price event arriving and the processing loop handling it.'
+)
+
+UPSTREAM_EVENT_LAG = histogram(
+    'upstream_event_lag_seconds',
+    'Wall-clock lag between a Twelvedata price tick (or bar close) and it reaching the streamer.',
+    LAG_BUCKETS
+)
+
+INDICATOR_COMPUTE_TIME = histogram(
+    'indicator_compute_seconds',
+    'Time spent updating the streaming indicators for one bar.'
+)
+
+SERIALIZATION_TIME = histogram(
+    'serialization_seconds',
+    'Time spent encoding one payload (any encoding).'
+)
+
+CLIENT_SEND_TIME = histogram(
+    'ws_client_send_seconds',
+    'Time for one frame to be written to a WebSocket client.'
+)
+
+TICK_TO_CLIENT_TIME = histogram(
+    'tick_to_client_seconds',
+    'Time from the streamer receiving a tick or bar event to the resulting frame being written to a WebSocket client.'
+)
+
+COMPUTE_JOB_TIME = histogram(
+    'compute_job_seconds',
+    'Time from submitting a stream\'s compute-pool job to its result reaching the event loop.'
+)
+
+BARS_PROCESSED = counter(
+    'bars_processed_total',
+    'Bars stored per stream.',
+    ('symbol', 'interval')
+)
+
+TICK_BARS_RECONCILED = counter(
+    'tick_bars_reconciled_total',
+    'Locally aggregated bars checked against the upstream bar, by result (match/diverged).',
+    ('result',)
+)
+
+INDICATOR_CACHE_REQUESTS = counter(
+    'indicator_cache_requests_total',
+    'Indicator arrays requested from the cache, by result (hit/extend/miss).',
+    ('result',)
+)
+
+FRAMES_DROPPED = counter(
+    'ws_frames_dropped_total',
+    'Frames discarded by the overflow policy of slow WebSocket clients.'
+)
@@ -0,0 +1,142 @@
+# your_trading_dashboard/protocol.py
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Bump whenever the shape of snapshot/update messages changes.
+PROTOCOL_VERSION = 1
+
+# Number of bars carried by a snapshot.
+SNAPSHOT_BARS = 50
+
+
+def format_partial_bar(stream) -> Optional[Dict[str, Any]]:
+    """
+    A stream's in-progress bar with an ISO timestamp like the other bars, or None.
+    """
+    partial = stream.partial_bar
+    if partial is None:
+        return None
+    return dict(partial, timestamp=np.datetime_as_string(np.datetime64(partial['timestamp'], 's')))
+
+
+def build_snapshot(stream, seq: int) -> Dict[str, Any]:
+    """
+    Full state for a stream: sent to clients when they connect (or resync) and served by /latest_data.
+    """
+    bars = stream.ohlcv_history.tail(SNAPSHOT_BARS)
+    return {
+        "v": PROTOCOL_VERSION,
+        "type": "snapshot",
+        "seq": seq,
+        "symbol": stream.symbol,
+        "interval": stream.interval,
+        "latest_price": stream.current_price,
+        "indicators": dict(stream.latest_indicators),
+        "analytics": format_analytics(stream),
+        "ohlcv": bars,
+        "partial_bar": format_partial_bar(stream),
+        "timestamp": bars[-1]['timestamp'] if bars else None,
+    }
+
+
+def build_update(stream, seq: int) -> Dict[str, Any]:
+    """
+    Delta for one new or corrected bar. Clients apply it on top of the snapshot with seq - 1;
+    a bar whose timestamp matches the client's last bar replaces it.
+    """
+    bar = stream.ohlcv_history.tail(1)[0]
+    return {
+        "v": PROTOCOL_VERSION,
+        "type": "update",
+        "seq": seq,
+        "symbol": stream.symbol,
+        "interval": stream.interval,
+        "latest_price": stream.current_price,
+        "bar": bar,
+        "partial_bar": format_partial_bar(stream),
+        "indicators": dict(stream.latest_indicators),
+        "timestamp": bar['timestamp'],
+    }
+
+
+def update_covers(stream, bar_version: int, last_timestamp: Optional[int]) -> bool:
+    """
+    True when the stream's bars differ from the published state (`bar_version`, whose newest bar was
+    `last_timestamp`) by one appended bar or a corrected newest bar: what one update can carry.
+    Anything more (several new bars, an older correction) has to go out as a snapshot.
+    """
+    if last_timestamp is None:
+        return False
+    history = stream.ohlcv_history
+    appended = len(history) - history.index_range(last_timestamp + 1)[0]
+    rewritten = stream.rewritten_since(bar_version)
+    if appended == 1:
+        return rewritten is None
+    return appended == 0 and rewritten == last_timestamp
+
+
+def build_partial(stream, seq: int) -> Dict[str, Any]:
+    """
+    The in-progress bar of a stream with provisional indicators computed as if it closed now.
+    It does not advance `seq` (it carries the seq of the last snapshot/update) and is superseded
+    by the update that completes the bar.
+    """
+    partial = stream.partial_bar
+    return {
+        "v": PROTOCOL_VERSION,
+        "type": "partial",
+        "seq": seq,
+        "symbol": stream.symbol,
+        "interval": stream.interval,
+        "latest_price": stream.current_price,
+        "partial_bar": format_partial_bar(stream),
+        "indicators": stream.indicator_engine.peek(partial) if partial is not None else dict(stream.latest_indicators),
+    }
+
+
+def format_analytics(stream) -> Optional[Dict[str, Any]]:
+    """
+    A stream's latest compute-pool result (extra indicators, model predictions) with an ISO bar timestamp, or None.
+    """
+    result = stream.analytics
+    if result is None:
+        return None
+    timestamp = result.get('timestamp')
+    return {
+        "indicators": result.get('indicators', {}),
+        "predictions": result.get('predictions'),
+        "timestamp": np.datetime_as_string(np.datetime64(timestamp, 's')) if timestamp is not None else None,
+    }
+
+
+def build_analytics(stream, seq: int) -> Dict[str, Any]:
+    """
+    Result of a stream's compute-pool job: extra indicators and model predictions for the bar at `timestamp`.
+    Like 'partial' it carries the seq of the last snapshot/update without advancing it.
+    """
+    return {
+        "v": PROTOCOL_VERSION,
+        "type": "analytics",
+        "seq": seq,
+        "symbol": stream.symbol,
+        "interval": stream.interval,
+        **format_analytics(stream),
+    }
+
+
+def build_ack(kind: str, streams, indicators=None) -> Dict[str, Any]:
+    """
+    Confirms a client's 'subscribe' or 'unsubscribe' request ('subscribed' / 'unsubscribed').
+    """
+    return {
+        "v": PROTOCOL_VERSION,
+        "type": kind,
+        "topics": [{"symbol": stream.symbol, "interval": stream.interval} for stream in streams],
+        "indicators": sorted(indicators) if indicators is not None else None,
+    }
+
+
+def build_error(message: str) -> Dict[str, Any]:
+    return {"v": PROTOCOL_VERSION, "type": "error", "message": message}
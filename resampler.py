@@ -0,0 +1,133 @@
+# your_trading_dashboard/resampler.py
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from timeframes import interval_seconds
+
+
+def resample_arrays(timestamps: np.ndarray, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                    closes: np.ndarray, volumes: np.ndarray, target_seconds: int) -> Tuple[np.ndarray, ...]:
+    """
+    Aggregates oldest-first bars into `target_seconds` buckets aligned to the epoch, vectorized.
+    Returns (bucket timestamps, open, high, low, close, volume, last base timestamp in each bucket).
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if not timestamps.size:
+        empty = np.empty(0)
+        return (np.empty(0, dtype=np.int64), empty, empty, empty, empty, empty, np.empty(0, dtype=np.int64))
+    buckets = timestamps - timestamps % target_seconds
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.concatenate((starts[1:], [timestamps.size])) - 1
+    return (
+        buckets[starts],
+        np.asarray(opens)[starts],
+        np.maximum.reduceat(highs, starts),
+        np.minimum.reduceat(lows, starts),
+        np.asarray(closes)[ends],
+        np.add.reduceat(volumes, starts),
+        timestamps[ends],
+    )
+
+
+class BarResampler:
+    """
+    Incrementally derives `target_interval` bars from a stream of closed `base_interval` bars,
+    keeping the in-progress (partial) higher-timeframe bar between updates.
+    """
+    def __init__(self, base_interval: str, target_interval: str):
+        self.base_seconds = interval_seconds(base_interval)
+        self.target_seconds = interval_seconds(target_interval)
+        if self.target_seconds <= self.base_seconds or self.target_seconds % self.base_seconds:
+            raise ValueError(f"{target_interval} is not a whole multiple of {base_interval}")
+        self.target_interval = target_interval
+        self.partial: Optional[Dict] = None
+        self.last_timestamp: Optional[int] = None
+
+    def _is_complete(self, bucket: int, last_base_timestamp: int) -> bool:
+        return last_base_timestamp + self.base_seconds >= bucket + self.target_seconds
+
+    def update(self, bar: Dict) -> List[Dict]:
+        """
+        Folds one closed base bar into the current bucket and returns any bars it completed (oldest first).
+        A bucket completes when its last base bar arrives, or when a bar from a later bucket shows up.
+        Base bars at or before the last one folded in are ignored.
+        """
+        timestamp = int(bar['timestamp'])
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return []
+        self.last_timestamp = timestamp
+        bucket = timestamp - timestamp % self.target_seconds
+        completed = []
+
+        partial = self.partial
+        if partial is not None and partial['timestamp'] != bucket:
+            completed.append(partial)
+            partial = None
+
+        if partial is None:
+            partial = {
+                'timestamp': bucket,
+                'open': bar['open'],
+                'high': bar['high'],
+                'low': bar['low'],
+                'close': bar['close'],
+                'volume': bar.get('volume', 0.0) or 0.0,
+            }
+        else:
+            partial['high'] = max(partial['high'], bar['high'])
+            partial['low'] = min(partial['low'], bar['low'])
+            partial['close'] = bar['close']
+            partial['volume'] += bar.get('volume', 0.0) or 0.0
+
+        if self._is_complete(bucket, timestamp):
+            completed.append(partial)
+            partial = None
+        self.partial = partial
+        return completed
+
+    def rebuild(self, timestamps: np.ndarray, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                closes: np.ndarray, volumes: np.ndarray) -> Optional[Dict]:
+        """
+        Re-aggregates one bucket from all of its base bars (after one of them was corrected or arrived
+        late). Returns the bucket's bar, or None when it is the in-progress bucket, whose partial bar
+        is replaced instead.
+        """
+        resampled = resample_arrays(timestamps, opens, highs, lows, closes, volumes, self.target_seconds)
+        if resampled[0].size != 1:
+            return None
+        bar = {
+            'timestamp': int(resampled[0][0]),
+            'open': float(resampled[1][0]),
+            'high': float(resampled[2][0]),
+            'low': float(resampled[3][0]),
+            'close': float(resampled[4][0]),
+            'volume': float(resampled[5][0]),
+        }
+        if self.partial is not None and self.partial['timestamp'] == bar['timestamp']:
+            self.partial = bar
+            return None
+        return bar
+
+    def seed(self, timestamps: np.ndarray, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+             closes: np.ndarray, volumes: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Resamples a block of base history in one pass. Completed bars are returned as arrays
+        (timestamps, open, high, low, close, volume); a trailing incomplete bucket becomes the partial bar.
+        """
+        resampled = resample_arrays(timestamps, opens, highs, lows, closes, volumes, self.target_seconds)
+        self.partial = None
+        if resampled[0].size:
+            self.last_timestamp = int(resampled[6][-1])
+        if resampled[0].size and not self._is_complete(int(resampled[0][-1]), int(resampled[6][-1])):
+            self.partial = {
+                'timestamp': int(resampled[0][-1]),
+                'open': float(resampled[1][-1]),
+                'high': float(resampled[2][-1]),
+                'low': float(resampled[3][-1]),
+                'close': float(resampled[4][-1]),
+                'volume': float(resampled[5][-1]),
+            }
+            return tuple(col[:-1] for col in resampled[:6])
+        return resampled[:6]
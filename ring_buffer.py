@@ -0,0 +1,238 @@
+# your_trading_dashboard/ring_buffer.py
+
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def to_epoch_seconds(value: Union[int, float, str, pd.Timestamp]) -> int:
+    """
+    Converts a Twelvedata timestamp (unix seconds or a datetime string) to int64 epoch seconds (UTC).
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return int(value)
+    if isinstance(value, str) and value.lstrip('-').isdigit():
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return int(ts.value // 1_000_000_000)
+
+
+class OHLCVRingBuffer:
+    """
+    Fixed-capacity columnar OHLCV history.
+
+    Bars are stored in preallocated float64 columns with int64 epoch-second timestamps.
+    Storage is twice the capacity so the live window is always one contiguous slice:
+    appends write past the end and, once the spare half is used up, the window is
+    moved back to the front in a single copy (amortised O(1) per bar).
+    Views returned by `timestamps` / `column` are zero-copy and valid until the next append.
+    upsert() keeps the timestamps strictly increasing, so the history never needs sorting.
+    Worker threads read through copy_range(), which holds the same lock as every mutation.
+    """
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._ts = np.zeros(2 * capacity, dtype=np.int64)
+        self._data = np.zeros((len(OHLCV_COLUMNS), 2 * capacity), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+        self._lock = threading.RLock()
+
+    @property
+    def maxlen(self) -> int:
+        return self.capacity
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def _make_room(self, count: int):
+        """
+        Ensures `count` (<= capacity) slots are free after the current end.
+        """
+        if self._end + count <= self._ts.size:
+            return
+        keep = min(len(self), self.capacity - count)
+        src = slice(self._end - keep, self._end)
+        self._ts[:keep] = self._ts[src]
+        self._data[:, :keep] = self._data[:, src]
+        self._start = 0
+        self._end = keep
+
+    def append(self, timestamp: int, open_: float, high: float, low: float, close: float, volume: float = 0.0):
+        """
+        Appends one bar, evicting the oldest one when the buffer is full.
+        """
+        with self._lock:
+            self._make_room(1)
+            i = self._end
+            self._ts[i] = timestamp
+            data = self._data
+            data[0, i] = open_
+            data[1, i] = high
+            data[2, i] = low
+            data[3, i] = close
+            data[4, i] = volume
+            self._end = i + 1
+            if self._end - self._start > self.capacity:
+                self._start += 1
+
+    def append_bar(self, bar: Dict):
+        self.append(
+            to_epoch_seconds(bar['timestamp']),
+            bar['open'], bar['high'], bar['low'], bar['close'],
+            bar.get('volume', 0.0) or 0.0
+        )
+
+    def upsert(self, timestamp: int, open_: float, high: float, low: float, close: float,
+               volume: float = 0.0) -> Tuple[str, int]:
+        """
+        Inserts or replaces the bar with this timestamp, keeping the buffer sorted.
+        Returns (kind, position) with position relative to the oldest bar and kind one of:
+        'append' (newer than every bar, O(1)), 'replace' (same timestamp, values changed; O(1) for
+        the latest bar, O(log n) otherwise), 'duplicate' (same timestamp and values, nothing written),
+        'insert' (late bar between existing ones, shifts the newer bars) or 'stale' (older than a
+        full buffer's window, dropped).
+        """
+        with self._lock:
+            last = self.last_timestamp
+            if last is None or timestamp > last:
+                self.append(timestamp, open_, high, low, close, volume)
+                return 'append', len(self) - 1
+
+            if timestamp == last:
+                position = len(self) - 1
+            else:
+                position = int(np.searchsorted(self.timestamps, timestamp, side='left'))
+            i = self._start + position
+            values = (open_, high, low, close, volume)
+
+            if self._ts[i] == timestamp:
+                if all(self._data[row, i] == value for row, value in enumerate(values)):
+                    return 'duplicate', position
+                self._data[:, i] = values
+                return 'replace', position
+
+            if position == 0 and len(self) == self.capacity:
+                return 'stale', -1
+            if self._end == self._ts.size:
+                # Compaction may drop the oldest bar, so locate the slot again afterwards.
+                self._make_room(1)
+                position = int(np.searchsorted(self.timestamps, timestamp, side='left'))
+            i = self._start + position
+            end = self._end
+            self._ts[i + 1:end + 1] = self._ts[i:end]
+            self._data[:, i + 1:end + 1] = self._data[:, i:end]
+            self._ts[i] = timestamp
+            self._data[:, i] = values
+            self._end = end + 1
+            if self._end - self._start > self.capacity:
+                self._start += 1
+                position -= 1
+            return 'insert', position
+
+    def upsert_bar(self, bar: Dict) -> Tuple[str, int]:
+        return self.upsert(
+            to_epoch_seconds(bar['timestamp']),
+            bar['open'], bar['high'], bar['low'], bar['close'],
+            bar.get('volume', 0.0) or 0.0
+        )
+
+    def extend(self, timestamps: np.ndarray, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+               closes: np.ndarray, volumes: Optional[np.ndarray] = None):
+        """
+        Appends many bars at once (oldest first). Only the newest `capacity` bars are kept.
+        """
+        with self._lock:
+            timestamps = np.asarray(timestamps, dtype=np.int64)
+            count = timestamps.size
+            if volumes is None:
+                volumes = np.zeros(count, dtype=np.float64)
+            columns = [opens, highs, lows, closes, volumes]
+            if count > self.capacity:
+                timestamps = timestamps[-self.capacity:]
+                columns = [np.asarray(col)[-self.capacity:] for col in columns]
+                count = self.capacity
+            if count == 0:
+                return
+
+            self._make_room(count)
+            dst = slice(self._end, self._end + count)
+            self._ts[dst] = timestamps
+            for row, col in enumerate(columns):
+                self._data[row, dst] = col
+            self._end += count
+            if self._end - self._start > self.capacity:
+                self._start = self._end - self.capacity
+
+    def clear(self):
+        with self._lock:
+            self._start = 0
+            self._end = 0
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._ts[self._start:self._end]
+
+    def column(self, name: str) -> np.ndarray:
+        return self._data[OHLCV_COLUMNS.index(name), self._start:self._end]
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {name: self._data[row, self._start:self._end] for row, name in enumerate(OHLCV_COLUMNS)}
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        with self._lock:
+            if self._end == self._start:
+                return None
+            return int(self._ts[self._end - 1])
+
+    def index_range(self, start: Optional[int] = None, end: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Positions [lo, hi) (relative to the oldest bar) of the bars with start <= timestamp <= end.
+        """
+        timestamps = self.timestamps
+        lo = int(np.searchsorted(timestamps, start, side='left')) if start is not None else 0
+        hi = int(np.searchsorted(timestamps, end, side='right')) if end is not None else len(timestamps)
+        return lo, max(lo, hi)
+
+    def copy_range(self, start: Optional[int] = None, end: Optional[int] = None,
+                   limit: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Copies of the bars with start <= timestamp <= end (at most `limit`, oldest first).
+        Safe to call from a worker thread while the event loop appends or inserts.
+        """
+        with self._lock:
+            lo, hi = self.index_range(start, end)
+            if limit is not None:
+                hi = min(hi, lo + limit)
+            window = slice(self._start + lo, self._start + hi)
+            return self._ts[window].copy(), {name: self._data[row, window].copy() for row, name in enumerate(OHLCV_COLUMNS)}
+
+    def tail(self, count: int) -> List[Dict]:
+        """
+        Returns the newest `count` bars as dicts with ISO-8601 (UTC) timestamps, oldest first.
+        """
+        start = max(self._start, self._end - count)
+        window = slice(start, self._end)
+        times = np.datetime_as_string(self._ts[window].astype('datetime64[s]')).tolist()
+        values = [self._data[row, window].tolist() for row in range(len(OHLCV_COLUMNS))]
+        return [
+            {'timestamp': t, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+            for t, o, h, l, c, v in zip(times, *values)
+        ]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Builds a DataFrame indexed by timestamp straight from the columns (no parsing or coercion).
+        """
+        index = pd.DatetimeIndex(self.timestamps.astype('datetime64[s]'), name='timestamp')
+        return pd.DataFrame(self.columns(), index=index)
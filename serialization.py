@@ -0,0 +1,70 @@
+# your_trading_dashboard/serialization.py
+
+import json
+import time
+from typing import Any, Dict, Iterable, Optional, Union
+
+from metrics import SERIALIZATION_TIME
+
+try:
+    import msgpack
+except ImportError:  # optional dependency; only needed for the binary encoding
+    msgpack = None
+
+DEFAULT_ENCODING = 'json'
+
+MEDIA_TYPES = {
+    'json': 'application/json',
+    'msgpack': 'application/msgpack',
+}
+
+_MEDIA_TYPE_ALIASES = {
+    'application/json': 'json',
+    'application/msgpack': 'msgpack',
+    'application/x-msgpack': 'msgpack',
+    'application/vnd.msgpack': 'msgpack',
+}
+
+
+def _fallback(value: Any) -> Any:
+    """
+    Converts numpy/pandas scalars that slip into a payload; native types never reach this.
+    """
+    if hasattr(value, 'item'):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def available_encodings() -> Iterable[str]:
+    return [name for name in MEDIA_TYPES if name != 'msgpack' or msgpack is not None]
+
+
+def encode(payload: Dict[str, Any], encoding: str = DEFAULT_ENCODING) -> Union[str, bytes]:
+    """
+    Serializes a payload. JSON is returned as str (sent as a text frame), binary encodings as bytes.
+    """
+    started = time.perf_counter()
+    if encoding == 'msgpack':
+        body = msgpack.packb(payload, default=_fallback, use_bin_type=True)
+    else:
+        body = json.dumps(payload, separators=(',', ':'), default=_fallback)
+    SERIALIZATION_TIME.observe(time.perf_counter() - started)
+    return body
+
+
+def negotiate(requested: Optional[str] = None, accept: Optional[str] = None) -> Optional[str]:
+    """
+    Picks an encoding from an explicit ?format= value or an Accept header, defaulting to JSON.
+    Returns None if the explicitly requested format is unknown or unavailable.
+    """
+    if requested:
+        requested = _MEDIA_TYPE_ALIASES.get(requested.lower(), requested.lower())
+        return requested if requested in available_encodings() else None
+    if accept:
+        for part in accept.split(','):
+            name = _MEDIA_TYPE_ALIASES.get(part.split(';')[0].strip().lower())
+            if name and name in available_encodings():
+                return name
+    return DEFAULT_ENCODING
@@ -0,0 +1,281 @@
+# your_trading_dashboard/streaming_indicators.py
+
+import math
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+# Indicator names produced by IndicatorEngine (the same columns as the batch path).
+INDICATOR_NAMES = ('RSI', 'SMA_20', 'SMA_50', 'EMA_20', 'EMA_50', 'MOMENTUM_ROC_10', 'ATR')
+
+
+class _StreamingIndicator:
+    """
+    State capture for the streaming indicators: snapshot() before a bar, restore() to replay it.
+    """
+    def snapshot(self) -> Dict:
+        return {name: value.copy() if isinstance(value, deque) else value for name, value in self.__dict__.items()}
+
+    def restore(self, state: Dict):
+        self.__dict__.update({name: value.copy() if isinstance(value, deque) else value for name, value in state.items()})
+
+
+class StreamingSMA(_StreamingIndicator):
+    """
+    Simple moving average kept as a rolling window sum (matches ta.SMA).
+    """
+    def __init__(self, period: int):
+        self.period = period
+        self._window = deque(maxlen=period)
+        self._total = 0.0
+
+    def update(self, value: float) -> Optional[float]:
+        if len(self._window) == self.period:
+            self._total -= self._window[0]
+        self._window.append(value)
+        self._total += value
+        if len(self._window) < self.period:
+            return None
+        return self._total / self.period
+
+    def peek(self, value: float) -> Optional[float]:
+        """
+        The value update() would return for `value`, without changing any state.
+        """
+        if len(self._window) + 1 < self.period:
+            return None
+        dropped = self._window[0] if len(self._window) == self.period else 0.0
+        return (self._total - dropped + value) / self.period
+
+
+class StreamingEMA(_StreamingIndicator):
+    """
+    Exponential moving average seeded with the SMA of the first `period` values (matches ta.EMA).
+    """
+    def __init__(self, period: int):
+        self.period = period
+        self._k = 2.0 / (period + 1)
+        self._seed_total = 0.0
+        self._count = 0
+        self._value = None
+
+    def update(self, value: float) -> Optional[float]:
+        if self._value is None:
+            self._count += 1
+            self._seed_total += value
+            if self._count < self.period:
+                return None
+            self._value = self._seed_total / self.period
+        else:
+            self._value = (value - self._value) * self._k + self._value
+        return self._value
+
+    def peek(self, value: float) -> Optional[float]:
+        if self._value is None:
+            if self._count + 1 < self.period:
+                return None
+            return (self._seed_total + value) / self.period
+        return (value - self._value) * self._k + self._value
+
+
+class StreamingRSI(_StreamingIndicator):
+    """
+    Wilder RSI keeping the smoothed average gain/loss between bars (matches ta.RSI).
+    """
+    def __init__(self, period: int):
+        self.period = period
+        self._prev_close = None
+        self._count = 0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    def _step(self, close: float):
+        """
+        Returns (rsi, count, avg_gain, avg_loss) after `close` without storing it.
+        """
+        diff = close - self._prev_close
+        gain = diff if diff > 0 else 0.0
+        loss = -diff if diff < 0 else 0.0
+        count = self._count + 1
+
+        if count < self.period:
+            return None, count, self._avg_gain + gain, self._avg_loss + loss
+        if count == self.period:
+            avg_gain = (self._avg_gain + gain) / self.period
+            avg_loss = (self._avg_loss + loss) / self.period
+        else:
+            avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+            avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+
+        total = avg_gain + avg_loss
+        rsi = 0.0 if total == 0 else 100.0 * (avg_gain / total)
+        return rsi, count, avg_gain, avg_loss
+
+    def update(self, close: float) -> Optional[float]:
+        if self._prev_close is None:
+            self._prev_close = close
+            return None
+        rsi, self._count, self._avg_gain, self._avg_loss = self._step(close)
+        self._prev_close = close
+        return rsi
+
+    def peek(self, close: float) -> Optional[float]:
+        if self._prev_close is None:
+            return None
+        return self._step(close)[0]
+
+
+class StreamingROC(_StreamingIndicator):
+    """
+    Rate of change against the close `period` bars ago (matches ta.ROC).
+    """
+    def __init__(self, period: int):
+        self.period = period
+        self._closes = deque(maxlen=period + 1)
+
+    @staticmethod
+    def _rate(close: float, previous: float) -> float:
+        if previous == 0:
+            return 0.0
+        return ((close / previous) - 1.0) * 100.0
+
+    def update(self, close: float) -> Optional[float]:
+        self._closes.append(close)
+        if len(self._closes) <= self.period:
+            return None
+        return self._rate(close, self._closes[0])
+
+    def peek(self, close: float) -> Optional[float]:
+        if len(self._closes) < self.period:
+            return None
+        # Once the window is full, appending `close` would evict the oldest close.
+        return self._rate(close, self._closes[1] if len(self._closes) > self.period else self._closes[0])
+
+
+class StreamingATR(_StreamingIndicator):
+    """
+    Average True Range with Wilder smoothing, seeded by the SMA of the first `period` true ranges (matches ta.ATR).
+    """
+    def __init__(self, period: int):
+        self.period = period
+        self._prev_close = None
+        self._count = 0
+        self._tr_total = 0.0
+        self._value = None
+
+    def _step(self, high: float, low: float, close: float):
+        """
+        Returns (atr, count, tr_total) after this bar without storing it; atr is None while warming up.
+        """
+        prev_close = self._prev_close
+        true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+        if self._value is None:
+            count = self._count + 1
+            tr_total = self._tr_total + true_range
+            return (tr_total / self.period if count >= self.period else None), count, tr_total
+        return (self._value * (self.period - 1) + true_range) / self.period, self._count, self._tr_total
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        if self._prev_close is None:
+            self._prev_close = close
+            return None
+        self._value, self._count, self._tr_total = self._step(high, low, close)
+        self._prev_close = close
+        return self._value
+
+    def peek(self, high: float, low: float, close: float) -> Optional[float]:
+        if self._prev_close is None:
+            return None
+        return self._step(high, low, close)[0]
+
+
+class IndicatorEngine:
+    """
+    Keeps running state for every dashboard indicator and updates them in O(1) per closed bar.
+    Produces the same columns as indicators.calculate_technical_indicators.
+    """
+    def __init__(self):
+        self._rsi = StreamingRSI(14)
+        self._sma_20 = StreamingSMA(20)
+        self._sma_50 = StreamingSMA(50)
+        self._ema_20 = StreamingEMA(20)
+        self._ema_50 = StreamingEMA(50)
+        self._roc_10 = StreamingROC(10)
+        self._atr = StreamingATR(14)
+        self.latest: Dict[str, Optional[float]] = {}
+
+    @staticmethod
+    def _prices(bar: Dict) -> Optional[Tuple[float, float, float]]:
+        """
+        (high, low, close) as floats, or None for bars with missing or non-numeric prices.
+        """
+        try:
+            high = float(bar['high'])
+            low = float(bar['low'])
+            close = float(bar['close'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if math.isnan(high) or math.isnan(low) or math.isnan(close):
+            return None
+        return high, low, close
+
+    def update(self, bar: Dict) -> Dict[str, Optional[float]]:
+        """
+        Feeds one closed OHLC bar and returns the indicator values for it.
+        Bars with missing or non-numeric prices are skipped, like the dropna in the batch path.
+        """
+        prices = self._prices(bar)
+        if prices is None:
+            return self.latest
+        high, low, close = prices
+
+        self.latest = {
+            'RSI': self._rsi.update(close),
+            'SMA_20': self._sma_20.update(close),
+            'SMA_50': self._sma_50.update(close),
+            'EMA_20': self._ema_20.update(close),
+            'EMA_50': self._ema_50.update(close),
+            'MOMENTUM_ROC_10': self._roc_10.update(close),
+            'ATR': self._atr.update(high, low, close),
+        }
+        return self.latest
+
+    def peek(self, bar: Dict) -> Dict[str, Optional[float]]:
+        """
+        Provisional indicator values if the still-forming `bar` closed as it is now.
+        Leaves the engine untouched, so it can be called on every tick.
+        """
+        prices = self._prices(bar)
+        if prices is None:
+            return self.latest
+        high, low, close = prices
+
+        return {
+            'RSI': self._rsi.peek(close),
+            'SMA_20': self._sma_20.peek(close),
+            'SMA_50': self._sma_50.peek(close),
+            'EMA_20': self._ema_20.peek(close),
+            'EMA_50': self._ema_50.peek(close),
+            'MOMENTUM_ROC_10': self._roc_10.peek(close),
+            'ATR': self._atr.peek(high, low, close),
+        }
+
+    def snapshot(self) -> Tuple:
+        """
+        Captures the full engine state so a later restore() can rewind to this point (e.g. to re-apply a corrected bar).
+        """
+        indicators = (self._rsi, self._sma_20, self._sma_50, self._ema_20, self._ema_50, self._roc_10, self._atr)
+        return tuple(indicator.snapshot() for indicator in indicators) + (self.latest,)
+
+    def restore(self, state: Tuple):
+        indicators = (self._rsi, self._sma_20, self._sma_50, self._ema_20, self._ema_50, self._roc_10, self._atr)
+        for indicator, indicator_state in zip(indicators, state):
+            indicator.restore(indicator_state)
+        self.latest = state[-1]
+
+    @property
+    def ready(self) -> bool:
+        """
+        True once every indicator has enough history to produce a value.
+        """
+        return bool(self.latest) and all(value is not None for value in self.latest.values())
@@ -0,0 +1,171 @@
+# your_trading_dashboard/sweep.py
+
+import argparse
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import talib as ta
+
+from config import BAR_STORE_DIR, INTERVAL, SYMBOL
+from backtest import DEFAULT_PAYOUT, resolve_outcomes, score_outcomes
+from bar_store import BarStore
+from timeframes import interval_seconds
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Columns shared with the workers, in shared-memory order.
+SHARED_COLUMNS = ('timestamp', 'high', 'low', 'close')
+
+# One grid point: (rsi_period, rsi_lower, rsi_upper, ema_fast, ema_slow, expiry).
+# ema_fast/ema_slow of 0 disables the trend filter.
+Combination = Tuple[int, float, float, int, int, str]
+
+PARAM_NAMES = ('rsi_period', 'rsi_lower', 'rsi_upper', 'ema_fast', 'ema_slow', 'expiry')
+
+# Set in each worker by _attach_shared_history.
+_shared: Dict[str, np.ndarray] = {}
+_indicator_cache: Dict[Tuple[str, int], np.ndarray] = {}
+
+
+def build_grid(rsi_periods: Iterable[int] = (7, 9, 14, 21), rsi_lowers: Iterable[float] = (20, 25, 30, 35),
+               rsi_uppers: Iterable[float] = (65, 70, 75, 80),
+               ema_pairs: Iterable[Tuple[int, int]] = ((0, 0), (10, 30), (20, 50), (50, 200)),
+               expiries: Iterable[str] = ('2min', '5min')) -> List[Combination]:
+    return [
+        (period, lower, upper, fast, slow, expiry)
+        for period, lower, upper, (fast, slow), expiry
+        in itertools.product(rsi_periods, rsi_lowers, rsi_uppers, ema_pairs, expiries)
+        if lower < upper
+    ]
+
+
+def _attach_shared_history(name: str, length: int):
+    """
+    Worker initializer: maps the parent's shared-memory block as read-only numpy views.
+    """
+    block = shared_memory.SharedMemory(name=name)
+    _shared['_block'] = block  # keep the mapping alive for the views below
+    for i, column in enumerate(SHARED_COLUMNS):
+        dtype = np.int64 if column == 'timestamp' else np.float64
+        view = np.ndarray((length,), dtype=dtype, buffer=block.buf, offset=i * length * 8)
+        view.flags.writeable = False
+        _shared[column] = view
+    _indicator_cache.clear()
+
+
+def _indicator(kind: str, period: int) -> np.ndarray:
+    key = (kind, period)
+    values = _indicator_cache.get(key)
+    if values is None:
+        func = ta.RSI if kind == 'RSI' else ta.EMA
+        values = _indicator_cache[key] = func(_shared['close'], timeperiod=period)
+    return values
+
+
+def _evaluate(combinations: Sequence[Combination], payout: float) -> List[Dict]:
+    """
+    Worker task: scores a batch of grid points against the shared history.
+    """
+    timestamps = _shared['timestamp']
+    closes = _shared['close']
+    rows = []
+    for period, lower, upper, fast, slow, expiry in combinations:
+        rsi = _indicator('RSI', period)
+        signals = np.where(rsi < lower, 1, np.where(rsi > upper, -1, 0)).astype(np.int8)
+        if fast and slow:
+            fast_ema, slow_ema = _indicator('EMA', fast), _indicator('EMA', slow)
+            uptrend = fast_ema > slow_ema
+            warm = ~np.isnan(slow_ema)
+            signals[~warm] = 0
+            signals[(signals == 1) & ~uptrend] = 0
+            signals[(signals == -1) & uptrend] = 0
+
+        _, outcomes = resolve_outcomes(timestamps, closes, signals, interval_seconds(expiry))
+        scores = score_outcomes(outcomes, payout)
+        del scores['pnl'], scores['equity']
+        rows.append(dict(zip(PARAM_NAMES, (period, lower, upper, fast, slow, expiry)), **scores))
+    return rows
+
+
+def _batches(grid: List[Combination], batch_count: int) -> List[List[Combination]]:
+    """
+    Splits the grid into batches, keeping combinations that share indicator periods together
+    so each worker computes every RSI/EMA series once.
+    """
+    grid = sorted(grid, key=lambda c: (c[0], c[3], c[4]))
+    size = max(1, -(-len(grid) // batch_count))
+    return [grid[i:i + size] for i in range(0, len(grid), size)]
+
+
+def run_sweep(history: Dict[str, np.ndarray], grid: Optional[List[Combination]] = None,
+              payout: float = DEFAULT_PAYOUT, workers: Optional[int] = None, min_trades: int = 30,
+              rank_by: str = 'expectancy') -> pd.DataFrame:
+    """
+    Evaluates every grid point on a process pool and returns them ranked by `rank_by`.
+
+    `history` holds oldest-first 'timestamp', 'high', 'low', 'close' arrays. They are copied once
+    into a shared-memory block that all workers map, instead of being pickled per task.
+    """
+    grid = grid if grid is not None else build_grid()
+    workers = workers or os.cpu_count() or 1
+    length = len(history['close'])
+
+    block = shared_memory.SharedMemory(create=True, size=max(1, len(SHARED_COLUMNS) * length * 8))
+    try:
+        for i, column in enumerate(SHARED_COLUMNS):
+            dtype = np.int64 if column == 'timestamp' else np.float64
+            np.ndarray((length,), dtype=dtype, buffer=block.buf, offset=i * length * 8)[:] = history[column]
+
+        logging.info(f"Sweeping {len(grid)} combinations over {length} bars on {workers} processes...")
+        batches = _batches(grid, workers * 4)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared_history,
+                                 initargs=(block.name, length)) as pool:
+            rows = [row for batch_rows in pool.map(_evaluate, batches, itertools.repeat(payout))
+                    for row in batch_rows]
+    finally:
+        block.close()
+        block.unlink()
+
+    results = pd.DataFrame(rows)
+    if results.empty:
+        return results
+    results = results[results['trades'] >= min_trades]
+    return results.sort_values(rank_by, ascending=False).reset_index(drop=True)
+
+
+def load_history(store_dir: str, symbol: str, interval: str) -> Dict[str, np.ndarray]:
+    """
+    Reads a stream's bars from the on-disk bar store (memory-mapped). The store is opened read-only,
+    since a running server may be appending to it.
+    """
+    bars = BarStore(store_dir, symbol, interval, read_only=True).read()
+    return {column: np.asarray(bars[column]) for column in SHARED_COLUMNS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parallel parameter sweep over stored bar history.')
+    parser.add_argument('--symbol', default=SYMBOL)
+    parser.add_argument('--interval', default=INTERVAL)
+    parser.add_argument('--store-dir', default=BAR_STORE_DIR)
+    parser.add_argument('--payout', type=float, default=DEFAULT_PAYOUT)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--min-trades', type=int, default=30)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--output', help='write the full ranked table as CSV')
+    args = parser.parse_args()
+
+    history = load_history(args.store_dir, args.symbol, args.interval)
+    results = run_sweep(history, payout=args.payout, workers=args.workers, min_trades=args.min_trades)
+    if args.output:
+        results.to_csv(args.output, index=False)
+    print(results.head(args.top).to_string())
+
+
+if __name__ == '__main__':
+    main()
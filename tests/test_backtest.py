@@ -0,0 +1,61 @@
+# your_trading_dashboard/tests/test_backtest.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import backtest_expiries, resolve_outcomes, rsi_reversal_signals, run_backtest, score_outcomes
+
+START = 1_700_000_040 // 60 * 60
+
+
+def frames(closes: list, rsi: list) -> tuple:
+    index = pd.to_datetime(START + 60 * np.arange(len(closes)), unit='s')
+    bars = pd.DataFrame({'open': closes, 'high': closes, 'low': closes, 'close': closes, 'volume': 0.0}, index=index)
+    return bars, pd.DataFrame({'RSI': rsi}, index=index)
+
+
+def test_outcomes_resolve_at_the_expiry_bar_and_skip_gaps():
+    timestamps = np.array([0, 60, 120, 180, 300, 360])  # the bar at 240 is missing
+    closes = np.array([1.0, 1.1, 1.2, 1.2, 1.0, 0.9])
+    signals = np.array([1, -1, 1, 1, 1, 0], dtype=np.int8)
+    entries, outcomes = resolve_outcomes(timestamps, closes, signals, 120)
+    # 0 -> 120 up (call wins), 60 -> 180 up (put loses), 120 -> 240 missing, 180 -> 300 down (call loses),
+    # 300 -> 420 past the end.
+    assert entries.tolist() == [0, 1, 3]
+    assert outcomes.tolist() == [1, -1, -1]
+
+
+def test_scores_pay_out_wins_and_refund_ties():
+    scores = score_outcomes(np.array([1, 1, -1, 0, -1, -1], dtype=np.int8), payout=0.8)
+    assert (scores['trades'], scores['wins'], scores['losses'], scores['ties']) == (6, 2, 3, 1)
+    assert scores['win_rate'] == pytest.approx(0.4)
+    assert scores['total_return'] == pytest.approx(-1.4)
+    assert scores['max_drawdown'] == pytest.approx(3.0)  # from the 1.6 peak down to -1.4
+    assert scores['breakeven_win_rate'] == pytest.approx(1 / 1.8)
+
+
+def test_run_backtest_with_the_rsi_rule():
+    bars, indicators = frames([1.0, 1.1, 1.0, 0.9, 1.0, 1.2], [25.0, 50.0, 75.0, 50.0, 20.0, 50.0])
+    result = run_backtest(bars, indicators, expiry='2min')
+    # Calls at bars 0 and 4, a put at bar 2: 0 -> 2 equal (tie), 2 -> 4 same (tie), 4 -> 6 past the end.
+    assert (result.trades, result.ties) == (2, 2)
+    assert list(result.entry_times) == list(bars.index[[0, 2]].to_numpy())
+
+
+def test_custom_rule_and_expiry_table():
+    bars, indicators = frames([1.0, 1.1, 1.2, 1.3, 1.4], [50.0] * 5)
+    table = backtest_expiries(bars, indicators, ('1min', '2min'), rule=lambda _: np.ones(5))
+    assert table.loc['1min', 'trades'] == 4 and table.loc['1min', 'win_rate'] == 1.0
+    assert table.loc['2min', 'total_return'] == pytest.approx(3 * 0.8)
+
+
+def test_trend_filter_blocks_counter_trend_signals():
+    indicators = pd.DataFrame({'RSI': [20.0, 80.0], 'EMA_20': [1.0, 1.0], 'EMA_50': [2.0, 2.0]})
+    assert rsi_reversal_signals(indicators, trend_filter=True).tolist() == [0, -1]
+
+
+def test_expiry_must_be_whole_bars():
+    bars, indicators = frames([1.0, 1.0], [50.0, 50.0])
+    with pytest.raises(ValueError):
+        run_backtest(bars, indicators, expiry='1min', interval='2min')
@@ -0,0 +1,159 @@
+# your_trading_dashboard/tests/test_broadcaster.py
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from broadcaster import OVERFLOW_POLICIES, Broadcaster, trim_payload
+from config import BROADCAST_QUEUE_SIZE
+from metrics import TICK_TO_CLIENT_TIME
+
+
+class RecordingWebSocket:
+    """
+    Stands in for a FastAPI WebSocket; keeps every frame the writer sends.
+    """
+    def __init__(self):
+        self.frames = []
+        self.closed = False
+
+    async def send_text(self, frame):
+        self.frames.append(json.loads(frame))
+
+    async def send_bytes(self, frame):
+        self.frames.append(frame)
+
+    async def close(self):
+        self.closed = True
+
+
+async def drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.mark.parametrize('policy', OVERFLOW_POLICIES)
+def test_subscribe_snapshots_bypass_overflow_policy(policy):
+    topics = [('SYM', f'{i}min') for i in range(BROADCAST_QUEUE_SIZE + 37)]
+
+    async def scenario():
+        broadcaster = Broadcaster(BROADCAST_QUEUE_SIZE, policy)
+        websocket = RecordingWebSocket()
+        session = broadcaster.register(websocket)
+        for topic in topics:
+            broadcaster.subscribe(session, topic, None, {'type': 'snapshot', 'interval': topic[1]})
+        await drain()
+        return session.closed, session.dropped, websocket
+
+    closed, dropped, websocket = run(scenario())
+    assert not closed
+    assert dropped == 0
+    assert [frame['interval'] for frame in websocket.frames] == [topic[1] for topic in topics]
+
+
+def test_pinned_snapshots_survive_overflow_of_regular_frames():
+    async def scenario():
+        broadcaster = Broadcaster(4, 'drop_oldest')
+        websocket = RecordingWebSocket()
+        session = broadcaster.register(websocket)
+        broadcaster.subscribe(session, 'topic', None, {'type': 'snapshot'})
+        for seq in range(10):
+            broadcaster.publish('topic', {'type': 'update', 'seq': seq})
+        await drain()
+        return session, websocket
+
+    session, websocket = run(scenario())
+    assert websocket.frames[0] == {'type': 'snapshot'}
+    assert [frame['seq'] for frame in websocket.frames[1:]] == [6, 7, 8, 9]
+    assert session.dropped == 6
+
+
+def test_newer_snapshot_supersedes_a_queued_one():
+    async def scenario():
+        broadcaster = Broadcaster(4, 'drop_oldest')
+        websocket = RecordingWebSocket()
+        session = broadcaster.register(websocket)
+        broadcaster.subscribe(session, 'topic', None, {'type': 'snapshot', 'seq': 1})
+        session.send_snapshot('topic', {'type': 'snapshot', 'seq': 2})
+        assert session.queue_depth == 1
+        await drain()
+        return websocket
+
+    assert run(scenario()).frames == [{'type': 'snapshot', 'seq': 2}]
+
+
+def test_conflate_keeps_only_the_latest_frames():
+    async def scenario():
+        broadcaster = Broadcaster(4, 'conflate')
+        websocket = RecordingWebSocket()
+        session = broadcaster.register(websocket, 'topic')
+        for seq in range(6):
+            broadcaster.publish('topic', {'seq': seq})
+        await drain()
+        return session, websocket
+
+    session, websocket = run(scenario())
+    assert [frame['seq'] for frame in websocket.frames] == [4, 5]
+    assert session.dropped == 4
+
+
+def test_disconnect_policy_closes_slow_client():
+    async def scenario():
+        broadcaster = Broadcaster(4, 'disconnect')
+        websocket = RecordingWebSocket()
+        session = broadcaster.register(websocket, 'topic')
+        delivered = [broadcaster.publish('topic', {'seq': seq}) for seq in range(5)]
+        await drain()
+        return broadcaster, session, websocket, delivered
+
+    broadcaster, session, websocket, delivered = run(scenario())
+    assert delivered == [1, 1, 1, 1, 0]
+    assert session.closed and websocket.closed
+    assert len(broadcaster) == 0 and 'topic' not in broadcaster.topics
+
+
+def test_publish_trims_indicators_per_subscriber():
+    payload = {'type': 'update', 'indicators': {'RSI': 50.0, 'MACD': 0.1},
+               'analytics': {'indicators': {'RSI': 1.0, 'MACD': 2.0}}}
+
+    async def scenario():
+        broadcaster = Broadcaster(8, 'drop_oldest')
+        everything, rsi_only = RecordingWebSocket(), RecordingWebSocket()
+        broadcaster.register(everything, 'topic')
+        broadcaster.register(rsi_only, 'topic', indicators=['RSI'])
+        assert broadcaster.publish('topic', payload) == 2
+        await drain()
+        return everything, rsi_only
+
+    everything, rsi_only = run(scenario())
+    assert everything.frames == [payload]
+    assert rsi_only.frames == [trim_payload(payload, frozenset({'RSI'}))]
+    assert rsi_only.frames[0]['analytics']['indicators'] == {'RSI': 1.0}
+
+
+def test_unknown_overflow_policy_is_rejected():
+    with pytest.raises(ValueError):
+        Broadcaster(4, 'block')
+
+
+def test_tick_to_client_time_is_observed_for_event_frames_only():
+    async def scenario():
+        broadcaster = Broadcaster(8, 'drop_oldest')
+        session = broadcaster.register(RecordingWebSocket())
+        broadcaster.subscribe(session, 'topic', None, {'type': 'snapshot'})
+        before = TICK_TO_CLIENT_TIME.count
+        received_at = time.perf_counter() - 0.5
+        broadcaster.publish('topic', {'type': 'update'}, received_at)
+        broadcaster.publish('topic', {'type': 'analytics'})
+        await drain()
+        return TICK_TO_CLIENT_TIME.count - before, TICK_TO_CLIENT_TIME.max
+
+    observed, slowest = run(scenario())
+    assert observed == 1
+    assert slowest >= 0.5
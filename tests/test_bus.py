@@ -0,0 +1,100 @@
+# your_trading_dashboard/tests/test_bus.py
+
+import asyncio
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from bus import MAX_FRAME_BYTES, BusFeed, EventBus, encode_frame, read_frame
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to ~100 bytes, so stay out of pytest's deep tmp_path.
+    directory = tempfile.mkdtemp(prefix='bus')
+    yield os.path.join(directory, 'events.sock')
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+async def wait_for(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError('timed out')
+        await asyncio.sleep(0.01)
+
+
+def test_frames_round_trip():
+    async def scenario():
+        reader = asyncio.StreamReader()
+        reader.feed_data(encode_frame({'event': 'price', 'price': 1.5}) + encode_frame({'event': 'heartbeat'}))
+        return [await read_frame(reader), await read_frame(reader)]
+
+    assert asyncio.run(scenario()) == [{'event': 'price', 'price': 1.5}, {'event': 'heartbeat'}]
+
+
+def test_oversized_frame_is_rejected():
+    async def scenario():
+        reader = asyncio.StreamReader()
+        reader.feed_data((MAX_FRAME_BYTES + 1).to_bytes(4, 'big'))
+        await read_frame(reader)
+
+    with pytest.raises(ValueError):
+        asyncio.run(scenario())
+
+
+def test_subscriber_gets_resync_then_events_handled_locally_first(socket_path):
+    async def scenario():
+        bus = EventBus(socket_path)
+        await bus.start()
+        handled, received = [], []
+
+        async def local(event):
+            handled.append(event)
+
+        async def remote(event):
+            received.append((event, list(handled)))
+
+        feed = BusFeed(socket_path)
+        await feed.connect(remote)
+        await wait_for(lambda: len(bus) == 1)
+        handler = bus.wrap(local)
+        for i in range(3):
+            await handler({'event': 'price', 'price': i})
+        await wait_for(lambda: len(received) == 4)
+        await feed.disconnect()
+        await bus.close()
+        return received
+
+    received = asyncio.run(scenario())
+    assert received[0][0] == {'event': 'bus-resync'}
+    assert [event['price'] for event, _ in received[1:]] == [0, 1, 2]
+    # Each event reached the subscriber only after the publishing process had handled it.
+    assert all(event in seen for event, seen in received[1:])
+
+
+def test_feed_reconnects_and_resyncs_after_the_bus_restarts(socket_path):
+    async def scenario():
+        bus = EventBus(socket_path)
+        await bus.start()
+        received = []
+
+        async def remote(event):
+            received.append(event['event'])
+
+        feed = BusFeed(socket_path)
+        await feed.connect(remote)
+        await wait_for(lambda: len(bus) == 1)
+        await bus.close()
+        bus = EventBus(socket_path)
+        await bus.start()
+        await wait_for(lambda: len(bus) == 1, timeout=5.0)
+        bus.publish({'event': 'heartbeat'})
+        await wait_for(lambda: received[-1:] == ['heartbeat'])
+        await feed.disconnect()
+        await bus.close()
+        return received
+
+    assert asyncio.run(scenario()) == ['bus-resync', 'bus-resync', 'heartbeat']
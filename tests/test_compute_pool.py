@@ -0,0 +1,68 @@
+# your_trading_dashboard/tests/test_compute_pool.py
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from compute_pool import ComputePool
+from indicators import compute_indicators
+from market_data import MarketStream
+
+START = 1_700_000_040 // 60 * 60
+
+
+def make_stream(count: int = 300) -> MarketStream:
+    stream = MarketStream('EUR/GBP', '1min', 1000)
+    closes = 1.0 + np.cumsum(np.random.default_rng(8).normal(0, 1e-3, count))
+    stream.ohlcv_history.extend(START + 60 * np.arange(count), closes, closes + 0.002, closes - 0.002, closes,
+                                np.ones(count))
+    return stream
+
+
+def expected_latest(stream: MarketStream, names: list, window: int) -> dict:
+    columns = {name: stream.ohlcv_history.column(name)[-window:] for name in ('open', 'high', 'low', 'close', 'volume')}
+    return {name: float(values[-1]) for name, values in compute_indicators(columns, names).items()}
+
+
+async def run_jobs(pool: ComputePool, stream: MarketStream, submits: int, results: list, timeout: float = 60.0):
+    for _ in range(submits):
+        pool.submit(stream)
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not results or any(slot.running for slot in pool._slots.values()):
+        assert asyncio.get_running_loop().time() < deadline, 'compute job timed out'
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize('mode', ['thread', 'process'])
+def test_job_returns_the_newest_bar_indicators(mode):
+    stream, results = make_stream(), []
+    pool = ComputePool(mode, ['BB_UPPER_20', 'EMA_200'], window_bars=256, workers=1,
+                       on_result=lambda s, result: results.append(result))
+    try:
+        asyncio.run(run_jobs(pool, stream, 1, results))
+    finally:
+        pool.close()
+    assert len(results) == 1
+    assert results[0]['timestamp'] == START + 60 * 299
+    expected = expected_latest(stream, ['BB_UPPER_20', 'EMA_200'], 256)
+    assert results[0]['indicators'] == pytest.approx(expected)
+
+
+def test_submits_while_running_coalesce_into_one_follow_up():
+    stream, results = make_stream(), []
+    pool = ComputePool('thread', ['SMA_20'], window_bars=128, workers=1,
+                       on_result=lambda s, result: results.append(result))
+    try:
+        asyncio.run(run_jobs(pool, stream, 5, results))
+    finally:
+        pool.close()
+    assert len(results) == 2
+
+
+def test_configuration_errors_fail_fast():
+    with pytest.raises(ValueError):
+        ComputePool('gpu', ['SMA_20'], 128)
+    with pytest.raises(KeyError):
+        ComputePool('thread', ['SMA_0'], 128)
+    assert not ComputePool('off', ['SMA_20'], 128).enabled
@@ -0,0 +1,101 @@
+# your_trading_dashboard/tests/test_downsample.py
+
+import numpy as np
+import pytest
+
+from downsample import Downsampler, choose_zoom_level, lttb
+from history import query_history
+from market_data import MarketStream
+from resampler import resample_arrays
+from ring_buffer import OHLCV_COLUMNS
+
+START = 1_700_000_040 // 60 * 60
+
+
+def reference_lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> list:
+    """
+    Straightforward LTTB as published (Steinarsson 2013), one bucket at a time.
+    """
+    n = len(x)
+    every = (n - 2) / (threshold - 2)
+    selected, a = [0], 0
+    for i in range(threshold - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_start, next_end = end, min(int((i + 2) * every) + 1, n)
+        if i == threshold - 3:
+            next_start, next_end = n - 1, n
+        avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        areas = [abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a])) for j in range(start, end)]
+        a = start + int(np.argmax(areas))
+        selected.append(a)
+    selected.append(n - 1)
+    return selected
+
+
+def make_stream(count: int, seed: int = 7) -> MarketStream:
+    stream = MarketStream('EUR/GBP', '1min', count + 1000)
+    closes = 1.0 + np.cumsum(np.random.default_rng(seed).normal(0, 1e-3, count))
+    stream.ohlcv_history.extend(START + 60 * np.arange(count), closes, closes + 0.002, closes - 0.002, closes,
+                                np.ones(count))
+    stream.touch(bars_changed=True)
+    return stream
+
+
+def full_level(stream: MarketStream, seconds: int) -> tuple:
+    page = query_history(stream, limit=10 ** 9)
+    return resample_arrays(page.timestamps, *(page.columns[name] for name in OHLCV_COLUMNS), seconds)[:6]
+
+
+def assert_level_matches(downsampler: Downsampler, stream: MarketStream, seconds: int):
+    for cached, expected in zip(downsampler._level(stream, seconds), full_level(stream, seconds)):
+        np.testing.assert_array_equal(cached, expected)
+
+
+@pytest.mark.parametrize('n, threshold', [(1000, 100), (997, 37), (50, 3), (10, 9)])
+def test_lttb_matches_reference(n, threshold):
+    rng = np.random.default_rng(n)
+    x = np.arange(n, dtype=np.float64) * 60
+    y = np.cumsum(rng.normal(0, 1, n))
+    assert lttb(x, y, threshold).tolist() == reference_lttb(x, y, threshold)
+
+
+def test_lttb_keeps_everything_below_the_threshold():
+    assert lttb(np.arange(5), np.arange(5), 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_zoom_level_fits_the_requested_points():
+    day = 86400
+    assert choose_zoom_level(START, START + day, 2000, 60) == 60
+    assert choose_zoom_level(START, START + day, 300, 60) == 300
+    seconds = choose_zoom_level(START, START + 400 * 7 * day, 100, 60)
+    assert (START + 400 * 7 * day) // seconds - START // seconds + 1 <= 100
+
+
+def test_level_is_extended_after_new_bars():
+    stream = make_stream(10_007)
+    downsampler = Downsampler()
+    assert_level_matches(downsampler, stream, 900)
+    for i in range(10_007, 10_040):
+        stream.upsert_bar({'timestamp': START + 60 * i, 'open': 1.0, 'high': 1.5, 'low': 0.5, 'close': 1.0})
+        assert_level_matches(downsampler, stream, 900)
+
+
+def test_level_follows_corrected_and_late_bars():
+    stream = make_stream(5000)
+    late = START + 60 * 2500
+    stream.upsert_bar({'timestamp': late + 30, 'open': 1.0, 'high': 3.0, 'low': 0.1, 'close': 1.0})
+    downsampler = Downsampler()
+    assert_level_matches(downsampler, stream, 3600)
+    stream.upsert_bar({'timestamp': START + 60 * 1200, 'open': 1.0, 'high': 4.0, 'low': 0.2, 'close': 1.0})
+    assert_level_matches(downsampler, stream, 3600)
+    stream.upsert_bar({'timestamp': late + 45, 'open': 1.0, 'high': 5.0, 'low': 0.3, 'close': 1.0})
+    assert_level_matches(downsampler, stream, 3600)
+
+
+def test_ohlc_keeps_extremes_of_each_candle():
+    stream = make_stream(2000)
+    stream.upsert_bar({'timestamp': START + 60 * 1000, 'open': 1.0, 'high': 9.0, 'low': 0.5, 'close': 1.0})
+    result = Downsampler().ohlc(stream, None, None, 100)
+    assert result['bucket_seconds'] == 1800
+    assert len(result['bars']) <= 100
+    assert max(bar['high'] for bar in result['bars']) == 9.0
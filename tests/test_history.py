@@ -0,0 +1,68 @@
+# your_trading_dashboard/tests/test_history.py
+
+import json
+
+import numpy as np
+
+from bar_store import BarStore
+from history import iter_history_json, query_history
+from market_data import MarketStream
+
+START = 1_700_000_040
+
+
+def make_bar(timestamp: int, close: float) -> dict:
+    return {'timestamp': timestamp, 'open': close, 'high': close, 'low': close, 'close': close, 'volume': 0.0}
+
+
+def stored_stream(tmp_path, stored: int = 250, buffered: int = 5) -> MarketStream:
+    """
+    A stream whose store holds more bars than its buffer, plus newer bars only in the buffer.
+    """
+    stream = MarketStream('EUR/GBP', '1min', 100, store=BarStore(str(tmp_path), 'EUR/GBP', '1min'))
+    for i in range(stored):
+        stream.upsert_bar(make_bar(START + 60 * i, float(i)))
+    for i in range(stored, stored + buffered):
+        stream.ohlcv_history.append_bar(make_bar(START + 60 * i, float(i)))
+    return stream
+
+
+def test_cursor_pages_cover_store_and_buffer_once(tmp_path):
+    stream = stored_stream(tmp_path)
+    timestamps = []
+    cursor = None
+    while True:
+        page = query_history(stream, limit=37, cursor=cursor)
+        assert len(page) <= 37
+        timestamps.extend(page.timestamps.tolist())
+        np.testing.assert_array_equal(page.columns['close'], (page.timestamps - START) / 60)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert timestamps == [START + 60 * i for i in range(255)]
+
+
+def test_range_bounds_are_inclusive(tmp_path):
+    stream = stored_stream(tmp_path)
+    page = query_history(stream, START + 60 * 240, START + 60 * 252, limit=1000)
+    assert page.timestamps.tolist() == [START + 60 * i for i in range(240, 253)]
+    assert page.next_cursor is None
+
+
+def test_exact_limit_has_no_next_page(tmp_path):
+    stream = stored_stream(tmp_path, stored=40, buffered=0)
+    page = query_history(stream, limit=40)
+    assert len(page) == 40 and page.next_cursor is None
+
+
+def test_json_body_matches_page(tmp_path):
+    stream = stored_stream(tmp_path)
+    page = query_history(stream, START + 60 * 248, limit=4)
+    page.indicators = {'RSI': np.array([np.nan, 1.0, 2.0, 3.0])}
+    body = json.loads(b''.join(iter_history_json(page, chunk_bars=3)))
+
+    assert body['count'] == 4
+    assert body['next_cursor'] == str(START + 60 * 252)
+    assert [bar['close'] for bar in body['bars']] == [248.0, 249.0, 250.0, 251.0]
+    assert [bar['RSI'] for bar in body['bars']] == [None, 1.0, 2.0, 3.0]
+    assert body['bars'][0]['timestamp'] == str(np.datetime64(START + 60 * 248, 's'))
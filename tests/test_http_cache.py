@@ -0,0 +1,58 @@
+# your_trading_dashboard/tests/test_http_cache.py
+
+import gzip
+
+from starlette.requests import Request
+
+from http_cache import ResponseCache
+
+
+def make_request(**headers) -> Request:
+    raw = [(name.replace('_', '-').lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({'type': 'http', 'method': 'GET', 'path': '/', 'headers': raw})
+
+
+def cached_entry(cache: ResponseCache, version, body: str = 'x' * 2000, renders: list = None):
+    def render():
+        if renders is not None:
+            renders.append(version)
+        return body
+    return cache.get('key', version, 1_700_000_000.0, 'application/json', render)
+
+
+def test_body_is_rendered_once_per_version():
+    cache, renders = ResponseCache(), []
+    first = cached_entry(cache, (1, 2), renders=renders)
+    assert cached_entry(cache, (1, 2), renders=renders) is first
+    second = cached_entry(cache, (1, 3), renders=renders)
+    assert renders == [(1, 2), (1, 3)]
+    assert first.etag != second.etag and first.etag.endswith('-1-2"')
+
+
+def test_matching_etag_or_date_answers_304():
+    cache = ResponseCache()
+    entry = cached_entry(cache, 7)
+    assert cache.respond(make_request(if_none_match=entry.etag), entry).status_code == 304
+    assert cache.respond(make_request(if_none_match='W/' + entry.etag), entry).status_code == 304
+    assert cache.respond(make_request(if_none_match='"other"'), entry).status_code == 200
+    assert cache.respond(make_request(if_modified_since=entry.last_modified), entry).status_code == 304
+    assert cache.respond(make_request(if_modified_since='Mon, 01 Jan 2001 00:00:00 GMT'), entry).status_code == 200
+
+
+def test_gzip_variant_has_its_own_etag():
+    cache = ResponseCache(gzip_min_size=1024)
+    entry = cached_entry(cache, 1)
+    response = cache.respond(make_request(accept_encoding='br, gzip'), entry)
+    assert response.headers['content-encoding'] == 'gzip'
+    assert gzip.decompress(response.body) == entry.body
+    assert response.headers['etag'] == entry.etag[:-1] + '-gzip"'
+    assert cache.respond(make_request(accept_encoding='gzip', if_none_match=response.headers['etag']),
+                         entry).status_code == 304
+
+
+def test_small_bodies_and_refused_gzip_are_sent_plain():
+    cache = ResponseCache(gzip_min_size=1024)
+    small = cached_entry(cache, 1, body='{}')
+    assert 'content-encoding' not in cache.respond(make_request(accept_encoding='gzip'), small).headers
+    entry = cached_entry(cache, 2)
+    assert 'content-encoding' not in cache.respond(make_request(accept_encoding='gzip;q=0'), entry).headers
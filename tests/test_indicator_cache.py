@@ -0,0 +1,105 @@
+# your_trading_dashboard/tests/test_indicator_cache.py
+
+import numpy as np
+import pytest
+
+from indicator_cache import EXTEND_CONTEXT_BARS, IndicatorCache
+from indicators import compute_indicators
+from market_data import MarketStream
+from metrics import INDICATOR_CACHE_REQUESTS
+
+START = 1_700_000_040 // 60 * 60
+
+
+def make_stream(count: int, seed: int = 11, symbol: str = 'EUR/GBP'):
+    """
+    A stream holding the first `count` of `count + 100` random-walk bars, and all of those bars.
+    """
+    stream = MarketStream(symbol, '1min', count + 100)
+    closes = 1.0 + np.cumsum(np.random.default_rng(seed).normal(0, 1e-3, count + 100))
+    bars = [{'timestamp': START + 60 * i, 'open': c, 'high': c + 0.002, 'low': c - 0.002, 'close': c, 'volume': 1.0}
+            for i, c in enumerate(closes)]
+    for bar in bars[:count]:
+        stream.upsert_bar(bar)
+    return stream, bars
+
+
+def requests_during(action) -> dict:
+    before = dict(INDICATOR_CACHE_REQUESTS.values)
+    action()
+    return {key[0]: value - before.get(key, 0) for key, value in INDICATOR_CACHE_REQUESTS.values.items()
+            if value != before.get(key, 0)}
+
+
+def reference(stream: MarketStream, names: list) -> dict:
+    buffer = stream.ohlcv_history
+    columns = {name: buffer.column(name) for name in ('open', 'high', 'low', 'close', 'volume')}
+    return compute_indicators(columns, names)
+
+
+def assert_matches_full_recompute(cache: IndicatorCache, stream: MarketStream, names: list):
+    timestamps, values = cache.get(stream, names)
+    np.testing.assert_array_equal(timestamps, stream.ohlcv_history.timestamps)
+    expected = reference(stream, names)
+    for name in names:
+        np.testing.assert_allclose(values[name], expected[name], rtol=1e-9, equal_nan=True)
+
+
+def test_new_bars_extend_cached_entries():
+    stream, bars = make_stream(3000)
+    cache = IndicatorCache(64 << 20)
+    names = ['RSI', 'SMA_20']
+    assert requests_during(lambda: cache.get(stream, names)) == {'miss': 2}
+    assert requests_during(lambda: cache.get(stream, names)) == {'hit': 2}
+
+    for bar in bars[3000:3010]:
+        stream.upsert_bar(bar)
+    assert requests_during(lambda: cache.get(stream, names)) == {'extend': 2}
+    assert_matches_full_recompute(cache, stream, names)
+
+
+def test_only_unconverged_entries_are_recomputed():
+    stream, bars = make_stream(2 * EXTEND_CONTEXT_BARS + 500)
+    cache = IndicatorCache(64 << 20)
+    names = ['RSI', 'EMA_1000']
+    cache.get(stream, names)
+
+    for bar in bars[-100:-95]:
+        stream.upsert_bar(bar)
+    # EMA_1000 needs far more than the context window to converge; RSI does not.
+    assert requests_during(lambda: cache.get(stream, names)) == {'extend': 1, 'miss': 1}
+    assert_matches_full_recompute(cache, stream, names)
+
+
+def test_corrected_bar_truncates_and_extends():
+    stream, bars = make_stream(3000)
+    cache = IndicatorCache(64 << 20)
+    names = ['RSI', 'MACD']
+    cache.get(stream, names)
+
+    corrected = dict(bars[2990], close=bars[2990]['close'] + 0.05)
+    stream.upsert_bar(corrected)
+    assert requests_during(lambda: cache.get(stream, names)) == {'extend': 2}
+    assert_matches_full_recompute(cache, stream, names)
+
+
+def test_values_at_returns_nan_for_unknown_timestamps():
+    stream, _ = make_stream(200)
+    cache = IndicatorCache(64 << 20)
+    timestamps = np.array([START + 60 * 150, START + 30, START + 60 * 199])
+    values = cache.values_at(stream, ['SMA_20'], timestamps)['SMA_20']
+    expected = reference(stream, ['SMA_20'])['SMA_20']
+    assert values[0] == pytest.approx(expected[150])
+    assert np.isnan(values[1])
+    assert values[2] == pytest.approx(expected[199])
+
+
+def test_memory_budget_evicts_least_recently_used_streams():
+    first, _ = make_stream(2000, seed=1)
+    second, _ = make_stream(2000, seed=2, symbol='EUR/USD')
+    cache = IndicatorCache(200_000)
+    cache.get(first, ['SMA_20'])
+    cache.get(second, ['SMA_20'])
+    assert cache.nbytes <= cache.max_bytes
+    assert requests_during(lambda: cache.get(second, ['SMA_20'])) == {'hit': 1}
+    assert requests_during(lambda: cache.get(first, ['SMA_20'])) == {'miss': 1}
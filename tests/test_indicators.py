@@ -0,0 +1,58 @@
+# your_trading_dashboard/tests/test_indicators.py
+
+import numpy as np
+import pytest
+import talib as ta
+
+from indicators import (FAMILY_MEMBER_CACHE_SIZE, TALIB_MAX_PERIOD, _family_member, available_indicators, build_plan,
+                        compute_indicators, resolve)
+
+
+def columns(count: int = 500, seed: int = 5) -> dict:
+    close = 1.0 + np.cumsum(np.random.default_rng(seed).normal(0, 1e-3, count))
+    return {'open': close, 'high': close + 0.002, 'low': close - 0.002, 'close': close, 'volume': np.ones(count)}
+
+
+def test_aliases_and_families_resolve_to_talib_parameters():
+    assert resolve('RSI') == resolve('RSI_14')
+    assert resolve('SMA_200').params == (('timeperiod', 200),)
+    assert 'SMA_<n>' in available_indicators() and 'RSI' in available_indicators()
+
+
+@pytest.mark.parametrize('name', ['RSI_1', 'STDDEV_1', 'BB_UPPER_1', 'SMA_0', f'SMA_{TALIB_MAX_PERIOD + 1}',
+                                  'SMA_999999999', 'NOPE_5', 'SMA'])
+def test_names_talib_would_reject_are_unknown(name):
+    with pytest.raises(KeyError):
+        build_plan([name])
+
+
+@pytest.mark.parametrize('name', ['RSI_2', 'SMA_1', 'ATR_1', f'EMA_{TALIB_MAX_PERIOD}', 'BB_LOWER_2', 'NATR_3'])
+def test_bounds_are_inclusive(name):
+    compute_indicators(columns(50), [name])
+
+
+def test_family_members_are_memoized_within_a_bound():
+    _family_member.cache_clear()
+    for period in range(1, FAMILY_MEMBER_CACHE_SIZE + 500):
+        resolve(f'SMA_{period}')
+    assert _family_member.cache_info().currsize == FAMILY_MEMBER_CACHE_SIZE
+
+
+def test_shared_inputs_are_planned_once_before_their_consumers():
+    plan = [spec.name for spec in build_plan(['BB_UPPER_20', 'BB_LOWER_20', 'MACD_HIST', 'EMA_12'])]
+    assert len(plan) == len(set(plan))
+    assert plan.index('SMA_20') < plan.index('BB_UPPER_20')
+    assert plan.index('MACD') < plan.index('MACD_SIGNAL') < plan.index('MACD_HIST')
+
+
+def test_values_match_talib():
+    data = columns()
+    values = compute_indicators(data, ['RSI', 'BB_UPPER_20', 'MACD_HIST', 'NATR_14'])
+    upper, _, _ = ta.BBANDS(data['close'], timeperiod=20, nbdevup=2.0, nbdevdn=2.0)
+    _, _, hist = ta.MACD(data['close'])
+    np.testing.assert_allclose(values['RSI'], ta.RSI(data['close'], timeperiod=14), equal_nan=True)
+    np.testing.assert_allclose(values['BB_UPPER_20'], upper, rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(values['NATR_14'], ta.NATR(data['high'], data['low'], data['close'], 14),
+                               rtol=1e-9, equal_nan=True)
+    # MACD is composed from EMA_12/EMA_26, seeded differently from ta.MACD; the difference decays in warm-up.
+    np.testing.assert_allclose(values['MACD_HIST'][-200:], hist[-200:], rtol=1e-6, atol=1e-12)
@@ -0,0 +1,122 @@
+# your_trading_dashboard/tests/test_market_stream.py
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from bar_store import BarStore
+from market_data import CHECKPOINT_EVERY_BARS, MarketStream
+
+START = 1_700_000_040
+
+
+def make_bar(timestamp: int, close: float) -> dict:
+    return {'timestamp': timestamp, 'open': close, 'high': close + 0.002, 'low': close - 0.002, 'close': close, 'volume': 1.0}
+
+
+def bar_series(count: int, seed: int = 3) -> list:
+    closes = 1.0 + np.cumsum(np.random.default_rng(seed).normal(0, 1e-3, count))
+    return [make_bar(START + 60 * i, float(close)) for i, close in enumerate(closes)]
+
+
+def in_order(bars: list, capacity: int = 1000) -> MarketStream:
+    """
+    Reference stream fed the final bars oldest first, with no late or corrected bars.
+    """
+    stream = MarketStream('EUR/GBP', '1min', capacity)
+    for bar in sorted(bars, key=lambda bar: bar['timestamp']):
+        stream.upsert_bar(bar)
+    return stream
+
+
+def assert_same_state(stream: MarketStream, reference: MarketStream):
+    np.testing.assert_array_equal(stream.ohlcv_history.timestamps, reference.ohlcv_history.timestamps)
+    np.testing.assert_array_equal(stream.ohlcv_history.column('close'), reference.ohlcv_history.column('close'))
+    assert stream.latest_indicators == pytest.approx(reference.latest_indicators, rel=1e-12)
+
+
+def test_late_bar_is_inserted_and_indicators_replayed():
+    bars = bar_series(400)
+    late = bars.pop(150)
+    stream = in_order(bars)
+
+    assert stream.upsert_bar(late) == 'insert'
+    assert_same_state(stream, in_order(bars + [late]))
+
+
+def test_corrected_older_bar_replays_from_checkpoint():
+    bars = bar_series(400)
+    stream = in_order(bars)
+    corrected = make_bar(bars[5 * CHECKPOINT_EVERY_BARS + 3]['timestamp'], 1.5)
+
+    assert stream.upsert_bar(corrected) == 'replace'
+    bars[5 * CHECKPOINT_EVERY_BARS + 3] = corrected
+    assert_same_state(stream, in_order(bars))
+
+
+def test_corrected_newest_bar_rewinds_one_bar():
+    bars = bar_series(200)
+    stream = in_order(bars)
+    corrected = make_bar(bars[-1]['timestamp'], bars[-1]['close'] + 0.01)
+
+    assert stream.upsert_bar(corrected) == 'replace'
+    assert_same_state(stream, in_order(bars[:-1] + [corrected]))
+
+
+def test_unchanged_and_stale_bars_change_nothing():
+    bars = bar_series(120)
+    stream = in_order(bars, capacity=100)
+    version = stream.bar_version
+
+    assert stream.upsert_bar(dict(bars[-1])) == 'duplicate'
+    assert stream.upsert_bar(make_bar(bars[0]['timestamp'], 9.9)) == 'stale'
+    assert stream.bar_version == version
+
+
+def test_many_random_late_and_corrected_bars():
+    rng = np.random.default_rng(11)
+    bars = bar_series(500)
+    stream = MarketStream('EUR/GBP', '1min', 1000)
+    final = {}
+    for bar in bars:
+        stream.upsert_bar(bar)
+        final[bar['timestamp']] = bar
+        if rng.random() < 0.2:
+            timestamp = int(rng.choice(list(final)))
+            corrected = make_bar(timestamp, float(rng.normal(1.0, 0.01)))
+            stream.upsert_bar(corrected)
+            final[timestamp] = corrected
+    assert_same_state(stream, in_order(list(final.values())))
+
+
+def test_rewritten_since_reports_earliest_edit():
+    bars = bar_series(100)
+    stream = in_order(bars)
+    version = stream.bar_version
+
+    stream.upsert_bar(make_bar(bars[-1]['timestamp'] + 60, 1.0))
+    assert stream.rewritten_since(version) is None
+    stream.upsert_bar(make_bar(bars[50]['timestamp'], 1.2))
+    stream.upsert_bar(make_bar(bars[70]['timestamp'], 1.2))
+    assert stream.rewritten_since(version) == bars[50]['timestamp']
+
+
+def test_store_follows_upserts(tmp_path):
+    bars = bar_series(300)
+    late = bars.pop(100)
+    stream = MarketStream('EUR/GBP', '1min', 1000, store=BarStore(str(tmp_path), 'EUR/GBP', '1min'))
+    for bar in bars:
+        stream.upsert_bar(bar)
+    stream.upsert_bar(late)
+    stream.upsert_bar(make_bar(bars[10]['timestamp'], 2.0))
+
+    reopened = BarStore(str(tmp_path), 'EUR/GBP', '1min', read_only=True)
+    stored = reopened.read()
+    np.testing.assert_array_equal(stored['timestamp'], stream.ohlcv_history.timestamps)
+    np.testing.assert_array_equal(stored['close'], stream.ohlcv_history.column('close'))
+
+    restarted = MarketStream('EUR/GBP', '1min', 1000, store=reopened)
+    assert restarted.load_from_store() == len(bars) + 1
+    asyncio.run(restarted.seed_indicator_engine())
+    assert_same_state(restarted, stream)
@@ -0,0 +1,121 @@
+# your_trading_dashboard/tests/test_protocol.py
+
+import asyncio
+import time
+
+from feeds import FeedSource
+from market_data import MarketDataStreamer, MarketStream
+from protocol import SNAPSHOT_BARS, build_snapshot, build_update, update_covers
+
+START = 1_700_000_040 // 120 * 120
+
+
+class SilentFeed(FeedSource):
+    """
+    Offline feed that never emits; the tests call the streamer's handler directly.
+    """
+    offline = True
+
+    async def connect(self, on_event) -> bool:
+        return True
+
+    async def disconnect(self):
+        pass
+
+
+def make_bar(timestamp: int, close: float = 1.0) -> dict:
+    return {'timestamp': timestamp, 'open': close, 'high': close + 0.01, 'low': close - 0.01, 'close': close, 'volume': 0.0}
+
+
+def filled_stream(count: int = 100) -> MarketStream:
+    stream = MarketStream('EUR/GBP', '1min', 500)
+    for i in range(count):
+        stream.upsert_bar(make_bar(START + 60 * i, 1.0 + i * 1e-3))
+    return stream
+
+
+def published(stream: MarketStream):
+    return stream.bar_version, stream.ohlcv_history.last_timestamp
+
+
+def test_snapshot_and_update_shapes():
+    stream = filled_stream()
+    snapshot = build_snapshot(stream, 7)
+    assert snapshot['type'] == 'snapshot' and snapshot['seq'] == 7
+    assert len(snapshot['ohlcv']) == SNAPSHOT_BARS
+    assert snapshot['timestamp'] == snapshot['ohlcv'][-1]['timestamp']
+
+    stream.upsert_bar(make_bar(START + 60 * 100, 2.0))
+    update = build_update(stream, 8)
+    assert update['type'] == 'update' and update['seq'] == 8
+    assert update['bar']['close'] == 2.0
+    assert update['indicators'] == stream.latest_indicators
+
+
+def test_one_new_or_corrected_newest_bar_fits_an_update():
+    stream = filled_stream()
+    state = published(stream)
+    stream.upsert_bar(make_bar(START + 60 * 100))
+    assert update_covers(stream, *state)
+
+    state = published(stream)
+    stream.upsert_bar(make_bar(START + 60 * 100, 1.5))
+    assert update_covers(stream, *state)
+
+
+def test_changes_an_update_cannot_carry_need_a_snapshot():
+    stream = filled_stream()
+    state = published(stream)
+    stream.upsert_bar(make_bar(START + 60 * 100))
+    stream.upsert_bar(make_bar(START + 60 * 101))
+    assert not update_covers(stream, *state)
+
+    state = published(stream)
+    stream.upsert_bar(make_bar(START + 60 * 50, 1.5))
+    assert not update_covers(stream, *state)
+
+    state = published(stream)
+    stream.upsert_bar(make_bar(START + 60 * 101, 1.5))
+    stream.upsert_bar(make_bar(START + 60 * 102))
+    assert not update_covers(stream, *state)
+
+
+def test_base_bar_completing_two_derived_bars_needs_a_snapshot():
+    streamer = MarketDataStreamer(['EUR/GBP'], ['1min'], 'test', 500, feed=SilentFeed(), derived_intervals=['2min'])
+    derived = streamer.get_stream('EUR/GBP', '2min')
+
+    async def feed(timestamp: int):
+        bar = make_bar(timestamp)
+        await streamer._on_event(dict(bar, event='ohlc', symbol='EUR/GBP', interval='1min'))
+
+    async def run():
+        for i in range(10):
+            await feed(START + 60 * i)
+        await feed(START + 60 * 10)  # opens a 2min bucket...
+        state = published(derived)
+        await feed(START + 60 * 13)  # ...that closes together with the next one
+        return state
+
+    state = asyncio.run(run())
+    assert len(derived.ohlcv_history) == 7
+    assert not update_covers(derived, *state)
+
+
+def test_notifications_carry_the_event_receive_time():
+    streamer = MarketDataStreamer(['EUR/GBP'], ['1min'], 'test', 500, feed=SilentFeed(), derived_intervals=['2min'])
+    updates = streamer.subscribe()
+
+    async def run():
+        before = time.perf_counter()
+        await streamer._on_event(dict(make_bar(START), event='ohlc', symbol='EUR/GBP', interval='1min'))
+        after = time.perf_counter()
+        notifications = []
+        while not updates.empty():
+            notifications.append(updates.get_nowait())
+        return before, after, notifications
+
+    before, after, notifications = asyncio.run(run())
+    assert {n.kind for n in notifications} >= {'bar', 'partial'}
+    assert len({n.received_at for n in notifications}) == 1
+    assert before <= notifications[0].received_at <= after
+    assert streamer._event_received_at is None
@@ -0,0 +1,80 @@
+# your_trading_dashboard/tests/test_resampler.py
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from market_data import MarketDataStreamer
+from resampler import BarResampler, resample_arrays
+from test_protocol import SilentFeed
+
+START = 1_700_000_100 // 300 * 300
+
+
+def make_bar(timestamp: int, close: float, high: float = None) -> dict:
+    return {'timestamp': timestamp, 'open': close, 'high': close + 0.01 if high is None else high,
+            'low': close - 0.01, 'close': close, 'volume': 1.0}
+
+
+def ohlc_event(bar: dict) -> dict:
+    return dict(bar, event='ohlc', symbol='EUR/GBP', interval='1min')
+
+
+def streamer_with_store(tmp_path) -> MarketDataStreamer:
+    return MarketDataStreamer(['EUR/GBP'], ['1min'], 'test', 500, store_dir=str(tmp_path), feed=SilentFeed(),
+                              derived_intervals=['5min'])
+
+
+def test_incremental_bars_match_vectorized_resample():
+    closes = 1.0 + np.cumsum(np.random.default_rng(2).normal(0, 1e-3, 53))
+    bars = [make_bar(START + 60 * i, float(close)) for i, close in enumerate(closes)]
+    resampler = BarResampler('1min', '5min')
+    completed = [bar for base in bars for bar in resampler.update(base)]
+
+    columns = [np.array([bar[name] for bar in bars]) for name in ('timestamp', 'open', 'high', 'low', 'close', 'volume')]
+    expected = resample_arrays(*columns, 300)
+    assert [bar['timestamp'] for bar in completed] == expected[0][:-1].tolist()
+    assert [bar['high'] for bar in completed] == pytest.approx(expected[2][:-1].tolist())
+    assert resampler.partial['timestamp'] == int(expected[0][-1])  # 3 of 5 bars in the last bucket
+
+
+def test_target_must_be_a_multiple_of_the_base():
+    with pytest.raises(ValueError):
+        BarResampler('2min', '5min')
+
+
+def test_corrected_base_bar_rewrites_the_stored_derived_bar(tmp_path):
+    streamer = streamer_with_store(tmp_path)
+    derived = streamer.get_stream('EUR/GBP', '5min')
+
+    async def run():
+        for i in range(12):
+            await streamer._on_event(ohlc_event(make_bar(START + 60 * i, 1.0 + i * 1e-3)))
+        await streamer._on_event(ohlc_event(make_bar(START + 60 * 2, 1.002, high=2.1)))
+
+    asyncio.run(run())
+    history = derived.ohlcv_history
+    assert history.timestamps.tolist() == [START, START + 300]
+    assert history.column('high')[0] == 2.1
+    stored = derived.store.read()
+    assert stored['high'][0] == 2.1 and len(stored) == 2
+
+
+def test_late_base_bar_reaches_completed_and_partial_derived_bars(tmp_path):
+    streamer = streamer_with_store(tmp_path)
+    derived = streamer.get_stream('EUR/GBP', '5min')
+    minutes = [i for i in range(13) if i not in (3, 11)]
+
+    async def run():
+        for i in minutes:
+            await streamer._on_event(ohlc_event(make_bar(START + 60 * i, 1.0 + i * 1e-3)))
+        await streamer._on_event(ohlc_event(make_bar(START + 60 * 3, 0.5)))
+        await streamer._on_event(ohlc_event(make_bar(START + 60 * 11, 0.4)))
+
+    asyncio.run(run())
+    assert derived.ohlcv_history.column('low')[0] == pytest.approx(0.49)
+    assert derived.store.read()['low'][0] == pytest.approx(0.49)
+    assert derived.partial_bar['timestamp'] == START + 600
+    assert derived.partial_bar['low'] == pytest.approx(0.39)
+    assert derived.partial_bar['close'] == pytest.approx(1.012)
@@ -0,0 +1,42 @@
+# your_trading_dashboard/tests/test_serialization.py
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from serialization import DEFAULT_ENCODING, available_encodings, encode, negotiate
+
+
+def test_json_is_compact_text_and_converts_numpy_scalars():
+    frame = encode({'close': np.float64(1.25), 'count': np.int64(3), 'at': pd.Timestamp('2024-01-02T03:04:05')})
+    assert isinstance(frame, str)
+    assert ' ' not in frame
+    assert json.loads(frame) == {'close': 1.25, 'count': 3, 'at': '2024-01-02T03:04:05'}
+
+
+def test_msgpack_round_trips_as_bytes():
+    msgpack = pytest.importorskip('msgpack')
+    payload = {'type': 'update', 'bar': {'close': np.float64(1.5)}, 'indicators': {'RSI': None}}
+    frame = encode(payload, 'msgpack')
+    assert isinstance(frame, bytes)
+    assert msgpack.unpackb(frame, raw=False) == {'type': 'update', 'bar': {'close': 1.5}, 'indicators': {'RSI': None}}
+
+
+@pytest.mark.parametrize('requested, accept, expected', [
+    (None, None, DEFAULT_ENCODING),
+    ('JSON', None, 'json'),
+    ('application/json', None, 'json'),
+    ('xml', None, None),
+    (None, 'text/html, application/json;q=0.9', 'json'),
+    (None, 'text/html', DEFAULT_ENCODING),
+])
+def test_negotiate(requested, accept, expected):
+    assert negotiate(requested, accept) == expected
+
+
+def test_negotiate_msgpack_when_installed():
+    expected = 'msgpack' if 'msgpack' in available_encodings() else None
+    assert negotiate('application/x-msgpack') == expected
+    assert negotiate(None, 'application/msgpack, application/json') == (expected or 'json')
@@ -0,0 +1,66 @@
+# your_trading_dashboard/tests/test_streaming_indicators.py
+
+import numpy as np
+import talib as ta
+
+from streaming_indicators import IndicatorEngine
+
+
+def random_bars(count: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    closes = 0.85 + np.cumsum(rng.normal(0, 1e-3, count))
+    highs = closes + np.abs(rng.normal(0, 5e-4, count))
+    lows = closes - np.abs(rng.normal(0, 5e-4, count))
+    return highs, lows, closes
+
+
+def as_series(rows, name):
+    return np.array([np.nan if row[name] is None else row[name] for row in rows])
+
+
+def test_engine_matches_talib():
+    highs, lows, closes = random_bars(600)
+    engine = IndicatorEngine()
+    rows = [engine.update({'high': h, 'low': l, 'close': c}) for h, l, c in zip(highs, lows, closes)]
+
+    expected = {
+        'RSI': ta.RSI(closes, timeperiod=14),
+        'SMA_20': ta.SMA(closes, timeperiod=20),
+        'SMA_50': ta.SMA(closes, timeperiod=50),
+        'EMA_20': ta.EMA(closes, timeperiod=20),
+        'EMA_50': ta.EMA(closes, timeperiod=50),
+        'MOMENTUM_ROC_10': ta.ROC(closes, timeperiod=10),
+        'ATR': ta.ATR(highs, lows, closes, timeperiod=14),
+    }
+    for name, reference in expected.items():
+        got = as_series(rows, name)
+        warm_up = np.isnan(reference)
+        np.testing.assert_array_equal(np.isnan(got), warm_up, err_msg=name)
+        np.testing.assert_allclose(got[~warm_up], reference[~warm_up], rtol=1e-9, err_msg=name)
+    assert engine.ready
+
+
+def test_peek_matches_update_without_changing_state():
+    highs, lows, closes = random_bars(100)
+    engine = IndicatorEngine()
+    for h, l, c in zip(highs[:-1], lows[:-1], closes[:-1]):
+        engine.update({'high': h, 'low': l, 'close': c})
+    bar = {'high': highs[-1], 'low': lows[-1], 'close': closes[-1]}
+
+    before = engine.snapshot()
+    peeked = engine.peek(bar)
+    assert engine.snapshot() == before
+    assert peeked == engine.update(bar)
+
+
+def test_bars_with_missing_prices_are_skipped():
+    highs, lows, closes = random_bars(80)
+    engine = IndicatorEngine()
+    reference = IndicatorEngine()
+    for i, (h, l, c) in enumerate(zip(highs, lows, closes)):
+        if i == 40:
+            engine.update({'high': h, 'low': l, 'close': float('nan')})
+            engine.update({'high': h, 'low': l})
+        engine.update({'high': h, 'low': l, 'close': c})
+        reference.update({'high': h, 'low': l, 'close': c})
+    assert engine.latest == reference.latest
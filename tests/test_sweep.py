@@ -0,0 +1,50 @@
+# your_trading_dashboard/tests/test_sweep.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import run_backtest, rsi_reversal_signals
+from bar_store import BarStore
+from indicators import calculate_technical_indicators
+from sweep import build_grid, load_history, run_sweep
+
+START = 1_700_000_040 // 60 * 60
+
+
+def history(count: int = 3000, seed: int = 4) -> dict:
+    close = 1.0 + np.cumsum(np.random.default_rng(seed).normal(0, 1e-3, count))
+    return {'timestamp': START + 60 * np.arange(count), 'high': close + 0.001, 'low': close - 0.001, 'close': close}
+
+
+def test_grid_skips_inverted_thresholds():
+    grid = build_grid(rsi_periods=(14,), rsi_lowers=(30, 70), rsi_uppers=(50, 70), ema_pairs=((0, 0),),
+                      expiries=('2min',))
+    assert grid == [(14, 30, 50, 0, 0, '2min'), (14, 30, 70, 0, 0, '2min')]
+
+
+def test_sweep_matches_the_single_backtest():
+    data = history()
+    grid = build_grid(rsi_periods=(9, 14), rsi_lowers=(30,), rsi_uppers=(70,), ema_pairs=((0, 0), (20, 50)),
+                      expiries=('2min', '5min'))
+    results = run_sweep(data, grid, workers=2, min_trades=0)
+    assert len(results) == len(grid)
+    assert results['expectancy'].is_monotonic_decreasing
+
+    index = pd.to_datetime(data['timestamp'], unit='s')
+    bars = pd.DataFrame({'open': data['close'], 'high': data['high'], 'low': data['low'], 'close': data['close'],
+                         'volume': 0.0}, index=index)
+    indicators = calculate_technical_indicators(bars, ['RSI', 'EMA_20', 'EMA_50'])
+    expected = run_backtest(bars, indicators, expiry='5min', rule=lambda df: rsi_reversal_signals(df, 30, 70))
+    row = results[(results['rsi_period'] == 14) & (results['ema_fast'] == 0) & (results['expiry'] == '5min')].iloc[0]
+    assert (row['trades'], row['wins'], row['losses']) == (expected.trades, expected.wins, expected.losses)
+    assert row['total_return'] == pytest.approx(expected.total_return)
+
+
+def test_history_is_read_from_the_bar_store_without_writing(tmp_path):
+    data = history(50)
+    store = BarStore(str(tmp_path), 'EUR/GBP', '1min')
+    store.extend(data['timestamp'], data['close'], data['high'], data['low'], data['close'], np.zeros(50))
+    loaded = load_history(str(tmp_path), 'EUR/GBP', '1min')
+    np.testing.assert_array_equal(loaded['timestamp'], data['timestamp'])
+    np.testing.assert_array_equal(loaded['close'], data['close'])
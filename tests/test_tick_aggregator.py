@@ -0,0 +1,72 @@
+# your_trading_dashboard/tests/test_tick_aggregator.py
+
+import asyncio
+
+import pytest
+
+from market_data import MarketDataStreamer
+from metrics import TICK_BARS_RECONCILED
+from tick_aggregator import TickAggregator
+from test_protocol import SilentFeed
+
+START = 1_700_000_040 // 60 * 60
+
+
+def upstream_bar(timestamp: int, open_: float, high: float, low: float, close: float) -> dict:
+    return {'timestamp': timestamp, 'open': open_, 'high': high, 'low': low, 'close': close, 'volume': 0.0}
+
+
+def test_ticks_build_the_in_progress_bar():
+    aggregator = TickAggregator('1min')
+    for offset, price in [(1, 1.0), (10, 1.3), (20, 0.9), (59, 1.1)]:
+        partial = aggregator.update(price, START + offset)
+    assert partial == {'timestamp': START, 'open': 1.0, 'high': 1.3, 'low': 0.9, 'close': 1.1, 'volume': 0.0, 'ticks': 4}
+
+
+def test_next_bar_tick_before_upstream_close_still_reconciles():
+    aggregator = TickAggregator('1min')
+    aggregator.update(1.0, START + 1)
+    aggregator.update(1.2, START + 30)
+    aggregator.update(1.1, START + 60)  # first tick of T+1 arrives before the upstream bar for T
+    assert aggregator.partial['timestamp'] == START + 60
+
+    differences = aggregator.reconcile(upstream_bar(START, 1.0, 1.2, 1.0, 1.25))
+    assert differences == pytest.approx({'open': 0.0, 'high': 0.0, 'low': 0.0, 'close': -0.05})
+    assert aggregator.partial['timestamp'] == START + 60  # the T+1 bar keeps building
+    assert aggregator.completed == {}
+
+
+def test_upstream_bar_in_the_same_bucket_reconciles_the_partial():
+    aggregator = TickAggregator('1min')
+    aggregator.update(1.0, START + 1)
+    differences = aggregator.reconcile(upstream_bar(START, 1.0, 1.0, 1.0, 1.0))
+    assert differences == dict.fromkeys(('open', 'high', 'low', 'close'), 0.0)
+    assert aggregator.partial is None
+    assert aggregator.update(1.5, START + 59) is None  # late tick for a closed bar
+
+
+def test_completed_bars_expire_after_the_window():
+    aggregator = TickAggregator('1min', window=2)
+    for minute in range(5):
+        aggregator.update(1.0, START + 60 * minute)
+    assert sorted(aggregator.completed) == [START + 120, START + 180]
+    assert aggregator.reconcile(upstream_bar(START, 1.0, 1.0, 1.0, 1.0)) is None
+
+
+def test_streamer_counts_reconciled_bars_in_normal_ordering():
+    streamer = MarketDataStreamer(['EUR/GBP'], ['1min'], 'test', 500, feed=SilentFeed())
+    before = dict(TICK_BARS_RECONCILED.values)
+
+    async def run():
+        for minute in range(3):
+            bucket = START + 60 * minute
+            for offset, price in [(0, 1.0), (20, 1.2), (40, 0.9)]:
+                await streamer._on_event({'event': 'price', 'symbol': 'EUR/GBP', 'price': price, 'timestamp': bucket + offset})
+            await streamer._on_event({'event': 'price', 'symbol': 'EUR/GBP', 'price': 1.0, 'timestamp': bucket + 60})
+            close = 0.9 if minute != 1 else 0.95
+            await streamer._on_event(dict(upstream_bar(bucket, 1.0, 1.2, 0.9, close),
+                                          event='ohlc', symbol='EUR/GBP', interval='1min'))
+
+    asyncio.run(run())
+    counted = {key: value - before.get(key, 0) for key, value in TICK_BARS_RECONCILED.values.items()}
+    assert counted == {('match',): 2, ('diverged',): 1}
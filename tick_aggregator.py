@@ -0,0 +1,88 @@
+# your_trading_dashboard/tick_aggregator.py
+
+import logging
+from typing import Dict, Optional
+
+from config import TICK_RECONCILE_WINDOW
+from timeframes import interval_seconds
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class TickAggregator:
+    """
+    Builds the in-progress bar of one interval from price ticks, so the dashboard can move
+    between upstream bar closes. The upstream 'ohlc' bar stays authoritative: reconcile()
+    compares it with the locally built bar and discards the local one. The first tick of the
+    next bar usually arrives before the upstream close, so a finished local bar waits in
+    `completed` for `window` bars of tick time.
+    """
+    def __init__(self, interval: str, window: int = TICK_RECONCILE_WINDOW):
+        self.interval = interval
+        self.seconds = interval_seconds(interval)
+        self.window = window
+        self.partial: Optional[Dict] = None
+        # Finished local bars by timestamp, awaiting their upstream bar.
+        self.completed: Dict[int, Dict] = {}
+        # Ticks before this time belong to bars the upstream has already closed.
+        self._closed_until: Optional[int] = None
+
+    def update(self, price: float, timestamp: int) -> Optional[Dict]:
+        """
+        Folds one tick into the current bar and returns it, or None for a tick from an already-closed bar.
+        A tick from a later bar starts a new one (the previous bar waits for its upstream close).
+        """
+        if self._closed_until is not None and timestamp < self._closed_until:
+            return None
+        bucket = timestamp - timestamp % self.seconds
+
+        partial = self.partial
+        if partial is None or bucket > partial['timestamp']:
+            if partial is not None:
+                self._retire(partial, bucket)
+            self.partial = {
+                'timestamp': bucket,
+                'open': price,
+                'high': price,
+                'low': price,
+                'close': price,
+                'volume': 0.0,
+                'ticks': 1,
+            }
+            return self.partial
+        if bucket < partial['timestamp']:
+            return None  # out-of-order tick for a bar we already moved past
+
+        if price > partial['high']:
+            partial['high'] = price
+        elif price < partial['low']:
+            partial['low'] = price
+        partial['close'] = price
+        partial['ticks'] += 1
+        return partial
+
+    def _retire(self, partial: Dict, bucket: int):
+        self.completed[partial['timestamp']] = partial
+        expired = bucket - self.window * self.seconds
+        for timestamp in [t for t in self.completed if t < expired]:
+            del self.completed[timestamp]
+
+    def reconcile(self, bar: Dict) -> Optional[Dict[str, float]]:
+        """
+        Called with each upstream bar. Returns the local-minus-upstream OHLC differences when a
+        locally built bar for the same timestamp existed (None otherwise), and drops that bar.
+        """
+        timestamp = int(bar['timestamp'])
+        self._closed_until = max(self._closed_until or 0, timestamp + self.seconds)
+
+        partial = self.partial
+        if partial is not None and partial['timestamp'] < timestamp:
+            self._retire(partial, timestamp)  # its own upstream bar may still follow
+            self.partial = partial = None
+        if partial is not None and partial['timestamp'] == timestamp:
+            self.partial = None
+        else:
+            partial = self.completed.pop(timestamp, None)
+        if partial is None:
+            return None
+        return {field: partial[field] - float(bar[field]) for field in ('open', 'high', 'low', 'close')}
@@ -0,0 +1,22 @@
+# your_trading_dashboard/timeframes.py
+
+import re
+
+_UNIT_SECONDS = {
+    'min': 60,
+    'h': 3600,
+    'day': 86400,
+    'week': 7 * 86400,
+}
+
+_INTERVAL_RE = re.compile(r'^(\d+)(min|h|day|week)$')
+
+
+def interval_seconds(interval: str) -> int:
+    """
+    Length of a Twelvedata interval string ("1min", "15min", "1h", "1day", ...) in seconds.
+    """
+    match = _INTERVAL_RE.match(interval)
+    if not match:
+        raise ValueError(f"Unsupported interval: {interval!r}")
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2)]